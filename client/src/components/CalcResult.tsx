@@ -88,6 +88,32 @@ export default function CalcResultPanel({
                 {result.weight.toFixed(1)} g
               </span>
             </div>
+            {result.shell_weight > 0 && (
+              <div className="flex items-center justify-between py-1 pl-3">
+                <span className="text-xs text-gray-500">{t("calc.shellWeight")}</span>
+                <span className="text-xs font-mono text-gray-600">
+                  {result.shell_weight.toFixed(1)} g
+                </span>
+              </div>
+            )}
+            <div className="flex items-center justify-between py-1.5">
+              <span className="text-sm text-gray-600">{t("calc.printTime")}</span>
+              <span className="text-sm font-mono text-gray-800">
+                {result.print_time_h.toFixed(2)} h
+              </span>
+            </div>
+            {params?.is_batch && result.plates && result.plates.length > 0 && (
+              <div className="flex items-center justify-between py-1.5">
+                <span className="text-sm text-gray-600">{t("calc.plates")}</span>
+                <span className="text-sm font-mono text-gray-800">
+                  {t("calc.platesValue", {
+                    count: result.plate_count,
+                    perPlate: result.plates[0].parts.length,
+                    hours: result.batch_print_time_h.toFixed(1),
+                  })}
+                </span>
+              </div>
+            )}
           </div>
 
           {/* Cost breakdown */}
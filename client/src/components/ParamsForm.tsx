@@ -48,7 +48,12 @@ const SECTIONS: { titleKey: string; fields: FieldConfig[] }[] = [
     titleKey: "params.sectionPrint",
     fields: [
       { key: "infill", labelKey: "params.infill", type: "number", step: 5, min: 0, max: 100, unit: "%" },
+      { key: "auto_support", labelKey: "params.autoSupport", type: "toggle" },
       { key: "support_percent", labelKey: "params.support", type: "number", step: 5, min: 0, max: 100, unit: "%" },
+      { key: "wall_count", labelKey: "params.wallCount", type: "number", step: 1, min: 0 },
+      { key: "wall_thickness", labelKey: "params.wallThickness", type: "number", step: 0.05, min: 0, unit: "mm" },
+      { key: "skin_layers", labelKey: "params.skinLayers", type: "number", step: 1, min: 0 },
+      { key: "auto_print_time", labelKey: "params.autoPrintTime", type: "toggle" },
       { key: "print_time_h", labelKey: "params.printTime", type: "number", step: 0.5, min: 0, unit: "h" },
       { key: "post_process_time_h", labelKey: "params.postProcessing", type: "number", step: 0.25, min: 0, unit: "h" },
       { key: "modeling_time_h", labelKey: "params.modelingTime", type: "number", step: 0.25, min: 0, unit: "h" },
@@ -58,6 +63,9 @@ const SECTIONS: { titleKey: string; fields: FieldConfig[] }[] = [
     titleKey: "params.sectionEconomics",
     fields: [
       { key: "quantity", labelKey: "params.quantity", type: "number", step: 1, min: 1 },
+      { key: "is_batch", labelKey: "params.isBatch", type: "toggle" },
+      { key: "bed_x", labelKey: "params.bedX", type: "number", step: 10, min: 1, unit: "mm" },
+      { key: "bed_y", labelKey: "params.bedY", type: "number", step: 10, min: 1, unit: "mm" },
       { key: "markup", labelKey: "params.markup", type: "number", step: 0.1, min: 1, unit: "×" },
       { key: "reject_rate", labelKey: "params.rejectRate", type: "number", step: 0.01, min: 0, max: 1, unit: "%" },
       { key: "tax_rate", labelKey: "params.taxRate", type: "number", step: 0.01, min: 0, max: 1, unit: "%" },
@@ -177,6 +185,21 @@ export default function ParamsForm({
                 );
               }
 
+              if (field.type === "toggle") {
+                return (
+                  <div key={field.key} className="flex items-center justify-between gap-2">
+                    <label htmlFor={field.key} className="text-sm text-gray-600 flex-shrink-0">{t(field.labelKey)}</label>
+                    <input
+                      id={field.key}
+                      type="checkbox"
+                      checked={value as boolean}
+                      onChange={(e) => handleChange(field.key, e.target.checked)}
+                      className="h-4 w-4 rounded border-gray-300 text-primary-600 focus:ring-primary-500"
+                    />
+                  </div>
+                );
+              }
+
               return (
                 <div key={field.key} className="flex items-center justify-between gap-2">
                   <label className="text-sm text-gray-600 flex-shrink-0">{t(field.labelKey)}</label>
@@ -5,6 +5,84 @@ import { OrbitControls, Center } from "@react-three/drei";
 import * as THREE from "three";
 import type { Model3D } from "@/types";
 
+/**
+ * Server-generated preview (PRV1): u16 positions quantized over the bbox,
+ * i8 normals, u16/u32 indices. Kept quantized on the GPU — the mesh
+ * transform maps the normalized [0, 1] positions back onto the bbox.
+ */
+function parsePreview(buffer: ArrayBuffer) {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== "PRV1") throw new Error("Invalid preview file");
+
+  const vertexCount = view.getUint32(4, true);
+  const faceCount = view.getUint32(8, true);
+  const u16Indices = (view.getUint32(12, true) & 1) === 1;
+  const min = [0, 1, 2].map((i) => view.getFloat32(16 + i * 4, true));
+  const max = [0, 1, 2].map((i) => view.getFloat32(28 + i * 4, true));
+
+  const align4 = (n: number) => (n + 3) & ~3;
+  let offset = 40;
+  const positions = new Uint16Array(buffer, offset, vertexCount * 3);
+  offset = align4(offset + vertexCount * 6);
+  const normals = new Int8Array(buffer, offset, vertexCount * 3);
+  offset = align4(offset + vertexCount * 3);
+  const indices = u16Indices
+    ? new Uint16Array(buffer, offset, faceCount * 3)
+    : new Uint32Array(buffer, offset, faceCount * 3);
+
+  const geometry = new THREE.BufferGeometry();
+  geometry.setAttribute("position", new THREE.BufferAttribute(positions, 3, true));
+  geometry.setAttribute("normal", new THREE.BufferAttribute(normals, 3, true));
+  geometry.setIndex(new THREE.BufferAttribute(indices, 1));
+
+  const scale = new THREE.Vector3(
+    Math.max(max[0] - min[0], 1e-6),
+    Math.max(max[1] - min[1], 1e-6),
+    Math.max(max[2] - min[2], 1e-6)
+  );
+  return { geometry, position: new THREE.Vector3(min[0], min[1], min[2]), scale };
+}
+
+function PreviewModel({ url }: { url: string }) {
+  const [preview, setPreview] = useState<ReturnType<typeof parsePreview> | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+
+    const load = async () => {
+      const token = localStorage.getItem("access_token");
+      const res = await fetch(url, {
+        headers: token ? { Authorization: `Bearer ${token}` } : {},
+      });
+      const parsed = parsePreview(await res.arrayBuffer());
+      if (!cancelled) {
+        setPreview(parsed);
+      }
+    };
+
+    load().catch(console.error);
+    return () => {
+      cancelled = true;
+    };
+  }, [url]);
+
+  if (!preview) return null;
+
+  return (
+    <Center>
+      <mesh geometry={preview.geometry} position={preview.position} scale={preview.scale}>
+        <meshStandardMaterial
+          color="#6b9fff"
+          metalness={0.3}
+          roughness={0.5}
+          flatShading={false}
+        />
+      </mesh>
+    </Center>
+  );
+}
+
 function StlModel({ url }: { url: string }) {
   const [geometry, setGeometry] = useState<THREE.BufferGeometry | null>(null);
 
@@ -98,9 +176,10 @@ function ObjModel({ url }: { url: string }) {
 interface Viewer3DProps {
   model: Model3D | null;
   projectId: string;
+  awaitingPreview?: boolean;
 }
 
-export default function Viewer3D({ model, projectId }: Viewer3DProps) {
+export default function Viewer3D({ model, projectId, awaitingPreview }: Viewer3DProps) {
   const { t } = useTranslation();
   const controlsRef = useRef<any>(null);
 
@@ -135,14 +214,32 @@ export default function Viewer3D({ model, projectId }: Viewer3DProps) {
   }
 
   // Processing / error states
-  if (model.status === "queued" || model.status === "processing") {
+  const waitingForPreview = model.status === "done" && !model.preview_ready && awaitingPreview;
+  if (model.status === "queued" || model.status === "processing" || waitingForPreview) {
     return (
       <div className="h-full flex items-center justify-center bg-gray-50 rounded-lg border border-gray-200">
         <div className="text-center">
           <div className="animate-spin rounded-full h-10 w-10 border-2 border-primary-600 border-t-transparent mx-auto" />
           <p className="mt-3 text-sm text-gray-500">
-            {model.status === "queued" ? t("viewer.queued") : t("viewer.analyzing")}
+            {waitingForPreview
+              ? t("viewer.preparingPreview")
+              : model.status === "queued"
+                ? t("viewer.queued")
+                : t("viewer.analyzing")}
           </p>
+          {model.status === "processing" && model.progress && (
+            <div className="mt-3 w-48 mx-auto">
+              <div className="h-1.5 bg-gray-200 rounded-full overflow-hidden">
+                <div
+                  className="h-full bg-primary-600 transition-all"
+                  style={{ width: `${model.progress.percent}%` }}
+                />
+              </div>
+              <p className="mt-1 text-xs text-gray-400">
+                {t(`viewer.stage.${model.progress.stage}`)} · {Math.round(model.progress.percent)}%
+              </p>
+            </div>
+          )}
         </div>
       </div>
     );
@@ -163,7 +260,10 @@ export default function Viewer3D({ model, projectId }: Viewer3DProps) {
   }
 
   const fileUrl = `/api/projects/${projectId}/model/file`;
-  const format = model.format?.toLowerCase();
+  // Versioned by content hash so the immutable cache headers stay correct across re-uploads
+  const previewUrl = `/api/projects/${projectId}/model/preview?v=${model.file_hash ?? model.id}`;
+  // Text uploads are served as their canonical binary STL once the worker has written it
+  const format = model.canonical_ready ? "stl" : model.format?.toLowerCase();
 
   return (
     <div className="h-full relative rounded-lg border border-gray-200 overflow-hidden bg-gradient-to-b from-gray-100 to-gray-200">
@@ -175,8 +275,9 @@ export default function Viewer3D({ model, projectId }: Viewer3DProps) {
         <directionalLight position={[10, 10, 10]} intensity={0.8} />
         <directionalLight position={[-10, -10, -5]} intensity={0.3} />
         <Suspense fallback={null}>
-          {format === "stl" && <StlModel url={fileUrl} />}
-          {format === "obj" && <ObjModel url={fileUrl} />}
+          {model.preview_ready && <PreviewModel url={previewUrl} />}
+          {!model.preview_ready && format === "stl" && <StlModel url={fileUrl} />}
+          {!model.preview_ready && format === "obj" && <ObjModel url={fileUrl} />}
         </Suspense>
         <OrbitControls ref={controlsRef} makeDefault />
         <gridHelper args={[100, 10, "#ccc", "#eee"]} />
@@ -202,10 +303,41 @@ export default function Viewer3D({ model, projectId }: Viewer3DProps) {
           </div>
           <div>
             <span className="font-medium">{t("viewer.volume")}:</span> {model.volume?.toFixed(1)} cm³
+            {(model.mesh_quality === "approximate" || model.mesh_quality === "unverified") && (
+              <span className="ml-1 text-amber-600" title={t(`viewer.meshQuality.${model.mesh_quality}`)}>
+                ({t("viewer.approximate")})
+              </span>
+            )}
           </div>
+          {model.support_volume != null && (
+            <div>
+              <span className="font-medium">{t("viewer.supportVolume")}:</span> {model.support_volume.toFixed(1)} cm³
+            </div>
+          )}
           <div>
             <span className="font-medium">{t("viewer.polygons")}:</span> {model.polygons?.toLocaleString()}
           </div>
+          {model.oriented_height != null && (
+            <div title={t("viewer.orientationHint")}>
+              <span className="font-medium">{t("viewer.orientation")}:</span>{" "}
+              {model.orientation_rx?.toFixed(0)}° / {model.orientation_ry?.toFixed(0)}° / {model.orientation_rz?.toFixed(0)}°,{" "}
+              {model.oriented_height.toFixed(1)} mm
+            </div>
+          )}
+          {model.bodies.length > 0 && (
+            <details>
+              <summary className="cursor-pointer">
+                <span className="font-medium">{t("viewer.bodies")}:</span> {model.body_count}
+              </summary>
+              <ul className="mt-1 max-h-32 overflow-y-auto space-y-0.5">
+                {model.bodies.map((body) => (
+                  <li key={body.index} className="font-mono">
+                    {body.name ?? `#${body.index + 1}`}: {body.volume?.toFixed(1)} cm³, {body.polygons?.toLocaleString()}
+                  </li>
+                ))}
+              </ul>
+            </details>
+          )}
         </div>
       )}
     </div>
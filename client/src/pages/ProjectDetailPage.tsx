@@ -20,11 +20,12 @@ export default function ProjectDetailPage() {
     project,
     isLoading,
     isCalculating,
+    awaitingPreview,
     fetchProject,
     updateProject,
     uploadModel,
     deleteModel,
-    pollModelStatus,
+    watchModelStatus,
     fetchParams,
     updateParams,
     runCalculation,
@@ -39,14 +40,14 @@ export default function ProjectDetailPage() {
     return () => reset();
   }, [id]);
 
-  // Poll model when status is pending
+  // Watch model status while it is pending
   useEffect(() => {
     if (
       id &&
       project?.model &&
       (project.model.status === "queued" || project.model.status === "processing")
     ) {
-      pollModelStatus(id).catch(() => {});
+      watchModelStatus(id).catch(() => {});
     }
   }, [id, project?.model?.status]);
 
@@ -73,10 +74,10 @@ export default function ProjectDetailPage() {
     async (file: File, onProgress: (pct: number) => void) => {
       if (!id) return;
       await uploadModel(id, file, onProgress);
-      // Start polling after upload
-      pollModelStatus(id).catch(() => {});
+      // Watch status after upload
+      watchModelStatus(id).catch(() => {});
     },
-    [id, uploadModel, pollModelStatus]
+    [id, uploadModel, watchModelStatus]
   );
 
   const handleDeleteModel = useCallback(async () => {
@@ -176,7 +177,11 @@ export default function ProjectDetailPage() {
                 onDelete={handleDeleteModel}
               />
               <div className="flex-1 min-h-[400px]">
-                <Viewer3D model={project.model} projectId={project.id} />
+                <Viewer3D
+                  model={project.model}
+                  projectId={project.id}
+                  awaitingPreview={awaitingPreview}
+                />
               </div>
             </div>
 
@@ -21,6 +21,37 @@ function StatusBadge({ status }: { status: string | null }) {
     </span>
   );
 }
+function Thumbnail({ url }: { url: string }) {
+  const [src, setSrc] = useState<string | null>(null);
+
+  useEffect(() => {
+    let objectUrl: string | null = null;
+    let cancelled = false;
+
+    // Fetch with auth header; the response is immutable, so the browser cache serves repeats
+    const token = localStorage.getItem("access_token");
+    fetch(url, { headers: token ? { Authorization: `Bearer ${token}` } : {} })
+      .then((res) => (res.ok ? res.blob() : null))
+      .then((blob) => {
+        if (blob && !cancelled) {
+          objectUrl = URL.createObjectURL(blob);
+          setSrc(objectUrl);
+        }
+      })
+      .catch(console.error);
+
+    return () => {
+      cancelled = true;
+      if (objectUrl) URL.revokeObjectURL(objectUrl);
+    };
+  }, [url]);
+
+  return (
+    <div className="w-16 h-16 flex-shrink-0 rounded-lg bg-gray-50 overflow-hidden">
+      {src && <img src={src} alt="" className="w-full h-full object-contain" />}
+    </div>
+  );
+}
 
 function ProjectCard({
   project,
@@ -44,7 +75,8 @@ function ProjectCard({
       onClick={onClick}
       className="bg-white rounded-xl border border-gray-200 p-5 hover:border-primary-300 hover:shadow-md transition cursor-pointer group"
     >
-      <div className="flex items-start justify-between">
+      <div className="flex items-start justify-between gap-3">
+        {project.thumbnail_url && <Thumbnail url={project.thumbnail_url} />}
         <div className="flex-1 min-w-0">
           <h3 className="text-base font-semibold text-gray-900 truncate group-hover:text-primary-600 transition-colors">
             {project.name}
@@ -1,12 +1,72 @@
 import { create } from "zustand";
 import api from "@/api/client";
-import type { ProjectDetail, CalcParams, CalcResult } from "@/types";
+import type { ProjectDetail, CalcParams, CalcResult, Model3D, UploadSession } from "@/types";
+
+// After an upload, keep polling briefly for the worker's preview mesh
+const PREVIEW_MAX_POLLS = 20;
+// Same grace period for the status stream
+const PREVIEW_WAIT_MS = PREVIEW_MAX_POLLS * 1500;
+
+// Open status stream, closed on reset (one per page)
+let statusSource: EventSource | null = null;
+
+// Files at least this big go through a resumable upload session, in chunks
+// (within the server's MAX_UPLOAD_CHUNK_MB); a failed chunk is retried from
+// the offset the server reports
+const RESUMABLE_MIN_BYTES = 8 * 1024 * 1024;
+const RESUMABLE_CHUNK_BYTES = 8 * 1024 * 1024;
+const RESUMABLE_MAX_RETRIES = 5;
+
+async function sha256Base64(data: ArrayBuffer): Promise<string | null> {
+  // crypto.subtle only exists in secure contexts (HTTPS, localhost)
+  if (!window.crypto?.subtle) return null;
+  const digest = new Uint8Array(await window.crypto.subtle.digest("SHA-256", data));
+  return btoa(String.fromCharCode(...digest));
+}
+
+async function uploadResumable(
+  id: string,
+  file: File,
+  onProgress?: (pct: number) => void
+): Promise<Model3D> {
+  const base = `/projects/${id}/model/uploads`;
+  const { data: created } = await api.post<UploadSession>(base, {
+    filename: file.name,
+    size: file.size,
+  });
+  let offset = 0;
+  let failures = 0;
+  while (offset < file.size) {
+    const chunk = await file.slice(offset, offset + RESUMABLE_CHUNK_BYTES).arrayBuffer();
+    const checksum = await sha256Base64(chunk);
+    try {
+      const { data } = await api.put<UploadSession>(`${base}/${created.id}`, chunk, {
+        headers: {
+          "Content-Type": "application/offset+octet-stream",
+          "Upload-Offset": String(offset),
+          ...(checksum ? { "Upload-Checksum": `sha256 ${checksum}` } : {}),
+        },
+      });
+      offset = data.offset;
+      failures = 0;
+    } catch (err) {
+      if (++failures > RESUMABLE_MAX_RETRIES) throw err;
+      await new Promise((resolve) => setTimeout(resolve, 1000 * 2 ** (failures - 1)));
+      // Resume from what the server actually kept
+      offset = (await api.get<UploadSession>(`${base}/${created.id}`)).data.offset;
+    }
+    onProgress?.(Math.round((offset * 100) / file.size));
+  }
+  const { data: model } = await api.post<Model3D>(`${base}/${created.id}/finalize`);
+  return model;
+}
 
 interface ProjectDetailState {
   project: ProjectDetail | null;
   isLoading: boolean;
   isSavingParams: boolean;
   isCalculating: boolean;
+  awaitingPreview: boolean;
 
   fetchProject: (id: string) => Promise<void>;
   updateProject: (
@@ -20,6 +80,7 @@ interface ProjectDetailState {
   ) => Promise<void>;
   deleteModel: (id: string) => Promise<void>;
   pollModelStatus: (id: string) => Promise<void>;
+  watchModelStatus: (id: string) => Promise<void>;
   fetchParams: (id: string) => Promise<CalcParams>;
   updateParams: (id: string, data: Partial<CalcParams>) => Promise<void>;
   runCalculation: (id: string) => Promise<CalcResult>;
@@ -31,6 +92,7 @@ export const useProjectDetailStore = create<ProjectDetailState>((set, get) => ({
   isLoading: false,
   isSavingParams: false,
   isCalculating: false,
+  awaitingPreview: false,
 
   fetchProject: async (id) => {
     set({ isLoading: true });
@@ -49,19 +111,28 @@ export const useProjectDetailStore = create<ProjectDetailState>((set, get) => ({
   },
 
   uploadModel: async (id, file, onProgress) => {
-    const formData = new FormData();
-    formData.append("file", file);
-    const res = await api.post(`/projects/${id}/model`, formData, {
-      headers: { "Content-Type": "multipart/form-data" },
-      onUploadProgress: (e) => {
-        if (onProgress && e.total) {
-          onProgress(Math.round((e.loaded * 100) / e.total));
-        }
-      },
-    });
+    let model: Model3D;
+    if (file.size >= RESUMABLE_MIN_BYTES) {
+      model = await uploadResumable(id, file, onProgress);
+    } else {
+      const formData = new FormData();
+      formData.append("file", file);
+      const res = await api.post(`/projects/${id}/model`, formData, {
+        headers: { "Content-Type": "multipart/form-data" },
+        onUploadProgress: (e) => {
+          if (onProgress && e.total) {
+            onProgress(Math.round((e.loaded * 100) / e.total));
+          }
+        },
+      });
+      model = res.data;
+    }
+    // A stream still open for the replaced model would never hear about the new one
+    statusSource?.close();
+    statusSource = null;
     const proj = get().project;
     if (proj) {
-      set({ project: { ...proj, model: res.data } });
+      set({ project: { ...proj, model }, awaitingPreview: !model.preview_ready });
     }
   },
 
@@ -74,6 +145,7 @@ export const useProjectDetailStore = create<ProjectDetailState>((set, get) => ({
   },
 
   pollModelStatus: async (id) => {
+    let previewPolls = 0;
     const poll = async (): Promise<void> => {
       const res = await api.get(`/projects/${id}/model/status`);
       const model = res.data;
@@ -81,14 +153,75 @@ export const useProjectDetailStore = create<ProjectDetailState>((set, get) => ({
       if (proj) {
         set({ project: { ...proj, model } });
       }
-      if (model.status === "queued" || model.status === "processing") {
+      const pending = model.status === "queued" || model.status === "processing";
+      const previewPending =
+        model.status === "done" &&
+        !model.preview_ready &&
+        get().awaitingPreview &&
+        previewPolls++ < PREVIEW_MAX_POLLS;
+      if (pending || previewPending) {
         await new Promise((r) => setTimeout(r, 1500));
         return poll();
       }
+      set({ awaitingPreview: false });
     };
     await poll();
   },
 
+  // Status pushed over Server-Sent Events; falls back to polling if the stream fails
+  watchModelStatus: async (id) => {
+    if (statusSource) return;
+    const token = localStorage.getItem("access_token");
+    if (typeof EventSource === "undefined" || !token) {
+      return get().pollModelStatus(id);
+    }
+
+    const finished = await new Promise<boolean>((resolve) => {
+      const source = new EventSource(
+        `/api/projects/${id}/model/events?token=${encodeURIComponent(token)}`
+      );
+      statusSource = source;
+      let previewTimer: ReturnType<typeof setTimeout> | null = null;
+      const close = (ok: boolean) => {
+        if (previewTimer) clearTimeout(previewTimer);
+        source.close();
+        if (statusSource === source) statusSource = null;
+        resolve(ok);
+      };
+
+      source.addEventListener("status", (e) => {
+        const model = JSON.parse((e as MessageEvent).data);
+        const proj = get().project;
+        if (proj) {
+          set({ project: { ...proj, model } });
+        }
+        const done = model.status === "done";
+        if (model.status === "error" || (done && (model.preview_ready || !get().awaitingPreview))) {
+          close(true);
+        } else if (done && !previewTimer) {
+          previewTimer = setTimeout(() => close(true), PREVIEW_WAIT_MS);
+        }
+      });
+      source.addEventListener("progress", (e) => {
+        const proj = get().project;
+        if (proj?.model) {
+          const progress = JSON.parse((e as MessageEvent).data);
+          set({ project: { ...proj, model: { ...proj.model, status: "processing", progress } } });
+        }
+      });
+      // Sent once the model is done or failed, whether or not its preview arrived
+      source.addEventListener("end", () => close(true));
+      // Expired token, network error or the server's stream limit
+      source.onerror = () => close(false);
+    });
+
+    if (finished) {
+      set({ awaitingPreview: false });
+    } else if (get().project) {
+      await get().pollModelStatus(id);
+    }
+  },
+
   fetchParams: async (id) => {
     const res = await api.get(`/projects/${id}/params`);
     const proj = get().project;
@@ -126,11 +259,14 @@ export const useProjectDetailStore = create<ProjectDetailState>((set, get) => ({
   },
 
   reset: () => {
+    statusSource?.close();
+    statusSource = null;
     set({
       project: null,
       isLoading: false,
       isSavingParams: false,
       isCalculating: false,
+      awaitingPreview: false,
     });
   },
 }));
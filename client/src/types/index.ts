@@ -11,6 +11,17 @@ export interface TokenResponse {
   user: User;
 }
 
+export interface ModelBody {
+  index: number;
+  name: string | null;
+  dim_x: number | null;
+  dim_y: number | null;
+  dim_z: number | null;
+  volume: number | null;
+  polygons: number | null;
+  mesh_quality: Model3D["mesh_quality"];
+}
+
 export interface Model3D {
   id: string;
   filename: string;
@@ -21,11 +32,47 @@ export interface Model3D {
   dim_y: number | null;
   dim_z: number | null;
   volume: number | null;
+  surface_area: number | null;
+  skin_area: number | null;
+  wall_area: number | null;
   polygons: number | null;
+  print_time_fdm_h: number | null;
+  print_time_sla_h: number | null;
+  print_time_metal_h: number | null;
+  support_volume: number | null;
+  mesh_quality: "ok" | "repaired" | "approximate" | "unverified" | null;
+  body_count: number | null;
+  orientation_rx: number | null;
+  orientation_ry: number | null;
+  orientation_rz: number | null;
+  oriented_height: number | null;
+  oriented_support_area: number | null;
+  oriented_footprint: number | null;
+  bodies: ModelBody[];
   error_message: string | null;
+  file_hash: string | null;
+  preview_ready: boolean;
+  thumbnail_ready: boolean;
+  canonical_ready: boolean;
+  progress?: ModelProgress | null;
   created_at: string;
 }
 
+// Resumable upload session (POST /projects/:id/model/uploads)
+export interface UploadSession {
+  id: string;
+  original_name: string;
+  format: string;
+  size: number;
+  offset: number;
+  expires_at: string;
+}
+
+export interface ModelProgress {
+  stage: "load" | "bounds" | "volume" | "print_time" | "support" | "orientation";
+  percent: number;
+}
+
 export interface CalcParams {
   id: string;
   technology: string;
@@ -34,11 +81,18 @@ export interface CalcParams {
   waste_factor: number;
   infill: number;
   support_percent: number;
+  auto_support: boolean;
+  wall_count: number;
+  wall_thickness: number;
+  skin_layers: number;
   print_time_h: number;
+  auto_print_time: boolean;
   post_process_time_h: number;
   modeling_time_h: number;
   quantity: number;
   is_batch: boolean;
+  bed_x: number;
+  bed_y: number;
   markup: number;
   reject_rate: number;
   tax_rate: number;
@@ -49,9 +103,25 @@ export interface CalcParams {
   language: string;
 }
 
+export interface PlatePlacement {
+  x: number;
+  y: number;
+  rotated: boolean;
+}
+
+export interface PlateLayout {
+  index: number;
+  parts: PlatePlacement[];
+}
+
 export interface CalcResult {
   id: string;
   weight: number;
+  shell_weight: number;
+  print_time_h: number;
+  batch_print_time_h: number;
+  plate_count: number;
+  plates: PlateLayout[] | null;
   material_cost: number;
   energy_cost: number;
   depreciation: number;
@@ -86,6 +156,7 @@ export interface ProjectListItem {
   updated_at: string;
   has_model: boolean;
   model_status: string | null;
+  thumbnail_url: string | null;
 }
 
 export interface ProjectDetail {
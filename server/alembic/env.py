@@ -16,6 +16,10 @@ from app.models.model3d import Model  # noqa: F401
 from app.models.calc_params import CalcParams  # noqa: F401
 from app.models.calc_result import CalcResult  # noqa: F401
 from app.models.ai_text import AiText  # noqa: F401
+from app.models.geometry_cache import GeometryCache  # noqa: F401
+from app.models.model_body import ModelBody  # noqa: F401
+from app.models.upload_batch import UploadBatch  # noqa: F401
+from app.models.upload_session import UploadSession  # noqa: F401
 
 config = context.config
 
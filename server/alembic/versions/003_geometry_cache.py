@@ -0,0 +1,37 @@
+"""add geometry cache and model file hash
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("models", sa.Column("file_hash", sa.String(64), nullable=True))
+    op.create_index("ix_models_file_hash", "models", ["file_hash"])
+
+    op.create_table(
+        "geometry_cache",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("dim_x", sa.Float, nullable=True),
+        sa.Column("dim_y", sa.Float, nullable=True),
+        sa.Column("dim_z", sa.Float, nullable=True),
+        sa.Column("volume", sa.Float, nullable=True),
+        sa.Column("polygons", sa.Integer, nullable=True),
+        sa.Column("analysis_time_s", sa.Float, server_default="0.0"),
+        sa.Column("hits", sa.Integer, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("geometry_cache")
+    op.drop_index("ix_models_file_hash", table_name="models")
+    op.drop_column("models", "file_hash")
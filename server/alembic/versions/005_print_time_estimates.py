@@ -0,0 +1,39 @@
+"""add slicer print-time estimates
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+ESTIMATE_COLUMNS = ("print_time_fdm_h", "print_time_sla_h", "print_time_metal_h")
+
+
+def upgrade() -> None:
+    for table in ("models", "geometry_cache"):
+        for column in ESTIMATE_COLUMNS:
+            op.add_column(table, sa.Column(column, sa.Float(), nullable=True))
+
+    op.add_column(
+        "calc_params",
+        sa.Column("auto_print_time", sa.Boolean(), nullable=False, server_default="true"),
+    )
+    op.add_column(
+        "calc_results",
+        sa.Column("print_time_h", sa.Float(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("calc_results", "print_time_h")
+    op.drop_column("calc_params", "auto_print_time")
+
+    for table in ("geometry_cache", "models"):
+        for column in ESTIMATE_COLUMNS:
+            op.drop_column(table, column)
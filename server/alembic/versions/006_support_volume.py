@@ -0,0 +1,28 @@
+"""add overhang support volume
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("models", sa.Column("support_volume", sa.Float(), nullable=True))
+    op.add_column("geometry_cache", sa.Column("support_volume", sa.Float(), nullable=True))
+    op.add_column(
+        "calc_params",
+        sa.Column("auto_support", sa.Boolean(), nullable=False, server_default="true"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("calc_params", "auto_support")
+    op.drop_column("geometry_cache", "support_volume")
+    op.drop_column("models", "support_volume")
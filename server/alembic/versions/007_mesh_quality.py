@@ -0,0 +1,23 @@
+"""add mesh quality flag
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("models", sa.Column("mesh_quality", sa.String(20), nullable=True))
+    op.add_column("geometry_cache", sa.Column("mesh_quality", sa.String(20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("geometry_cache", "mesh_quality")
+    op.drop_column("models", "mesh_quality")
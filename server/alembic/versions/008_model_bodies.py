@@ -0,0 +1,47 @@
+"""add per-body analysis of multi-object scenes
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "model_bodies",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "model_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("models.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("index", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(255), nullable=True),
+        sa.Column("dim_x", sa.Float(), nullable=True),
+        sa.Column("dim_y", sa.Float(), nullable=True),
+        sa.Column("dim_z", sa.Float(), nullable=True),
+        sa.Column("volume", sa.Float(), nullable=True),
+        sa.Column("polygons", sa.Integer(), nullable=True),
+        sa.Column("mesh_quality", sa.String(20), nullable=True),
+    )
+    op.create_index("ix_model_bodies_model_id", "model_bodies", ["model_id"])
+
+    op.add_column("models", sa.Column("body_count", sa.Integer(), nullable=True))
+    op.add_column("geometry_cache", sa.Column("body_count", sa.Integer(), nullable=True))
+    op.add_column("geometry_cache", sa.Column("bodies", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("geometry_cache", "bodies")
+    op.drop_column("geometry_cache", "body_count")
+    op.drop_column("models", "body_count")
+
+    op.drop_index("ix_model_bodies_model_id", table_name="model_bodies")
+    op.drop_table("model_bodies")
@@ -0,0 +1,30 @@
+"""add suggested build orientation
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+ORIENTATION_COLUMNS = (
+    "orientation_rx", "orientation_ry", "orientation_rz",
+    "oriented_height", "oriented_support_area", "oriented_footprint",
+)
+
+
+def upgrade() -> None:
+    for table in ("models", "geometry_cache"):
+        for column in ORIENTATION_COLUMNS:
+            op.add_column(table, sa.Column(column, sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ("geometry_cache", "models"):
+        for column in ORIENTATION_COLUMNS:
+            op.drop_column(table, column)
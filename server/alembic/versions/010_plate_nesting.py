@@ -0,0 +1,32 @@
+"""add bed size and build-plate nesting results
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("calc_params", sa.Column("bed_x", sa.Float(), nullable=False, server_default="220"))
+    op.add_column("calc_params", sa.Column("bed_y", sa.Float(), nullable=False, server_default="220"))
+    op.add_column(
+        "calc_results",
+        sa.Column("batch_print_time_h", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.add_column("calc_results", sa.Column("plate_count", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column("calc_results", sa.Column("plates", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("calc_results", "plates")
+    op.drop_column("calc_results", "plate_count")
+    op.drop_column("calc_results", "batch_print_time_h")
+    op.drop_column("calc_params", "bed_y")
+    op.drop_column("calc_params", "bed_x")
@@ -0,0 +1,51 @@
+"""add bulk archive upload batches
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_batches",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="processing"),
+        sa.Column("file_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("task_id", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_upload_batches_user_id", "upload_batches", ["user_id"])
+
+    op.add_column(
+        "projects",
+        sa.Column(
+            "batch_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("upload_batches.id", ondelete="SET NULL"), nullable=True,
+        ),
+    )
+    op.create_index("ix_projects_batch_id", "projects", ["batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projects_batch_id", table_name="projects")
+    op.drop_column("projects", "batch_id")
+
+    op.drop_index("ix_upload_batches_user_id", table_name="upload_batches")
+    op.drop_table("upload_batches")
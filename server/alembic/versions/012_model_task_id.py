@@ -0,0 +1,21 @@
+"""add Celery task id to models
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("models", sa.Column("task_id", sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("models", "task_id")
@@ -0,0 +1,23 @@
+"""add shape descriptors for similarity search
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "015"
+down_revision = "014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("models", sa.Column("shape_descriptor", sa.LargeBinary(), nullable=True))
+    op.add_column("geometry_cache", sa.Column("shape_descriptor", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("geometry_cache", "shape_descriptor")
+    op.drop_column("models", "shape_descriptor")
@@ -0,0 +1,33 @@
+"""add surface/skin area and shell parameters for the mass model
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "016"
+down_revision = "015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("models", "geometry_cache"):
+        op.add_column(table, sa.Column("surface_area", sa.Float(), nullable=True))
+        op.add_column(table, sa.Column("skin_area", sa.Float(), nullable=True))
+    op.add_column("calc_params", sa.Column("wall_count", sa.Integer(), nullable=False, server_default="2"))
+    op.add_column("calc_params", sa.Column("wall_thickness", sa.Float(), nullable=False, server_default="0.4"))
+    op.add_column("calc_params", sa.Column("skin_layers", sa.Integer(), nullable=False, server_default="4"))
+    op.add_column("calc_results", sa.Column("shell_weight", sa.Float(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("calc_results", "shell_weight")
+    op.drop_column("calc_params", "skin_layers")
+    op.drop_column("calc_params", "wall_thickness")
+    op.drop_column("calc_params", "wall_count")
+    for table in ("geometry_cache", "models"):
+        op.drop_column(table, "skin_area")
+        op.drop_column(table, "surface_area")
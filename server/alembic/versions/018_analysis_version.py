@@ -0,0 +1,24 @@
+"""add analysis version to the geometry cache
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "018"
+down_revision = "017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows predate versioning: version 0 never matches, so they are recomputed
+    op.add_column(
+        "geometry_cache", sa.Column("analysis_version", sa.Integer(), nullable=False, server_default="0")
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("geometry_cache", "analysis_version")
@@ -0,0 +1,23 @@
+"""add wall area for the shell estimate
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "019"
+down_revision = "018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("models", "geometry_cache"):
+        op.add_column(table, sa.Column("wall_area", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ("geometry_cache", "models"):
+        op.drop_column(table, "wall_area")
@@ -22,7 +22,25 @@ class Settings(BaseSettings):
 
     # File uploads
     UPLOAD_DIR: str = "/uploads"
-    MAX_UPLOAD_SIZE_MB: int = 100
+    MAX_UPLOAD_SIZE_MB: int = 100  # per model file, also per archive member
+    MAX_ARCHIVE_FILES: int = 500
+    MAX_ARCHIVE_SIZE_MB: int = 500  # bulk ZIP upload as sent
+    MAX_ARCHIVE_INFLATED_MB: int = 2000  # all extracted members together
+    # Resumable uploads: largest PUT chunk, idle lifetime of a session, garbage-collection period
+    MAX_UPLOAD_CHUNK_MB: int = 16
+    UPLOAD_SESSION_TTL_HOURS: int = 24
+    UPLOAD_SESSION_GC_INTERVAL_S: int = 600
+    UPLOAD_CHUNK_TIMEOUT_S: int = 600  # longest one PUT may stream (and hold the session's lock)
+
+    # Worker queue routing: estimated faces (or, when unknown, upload size) sending a job to "large"
+    LARGE_MESH_FACES: int = 300_000
+    LARGE_UPLOAD_MB: int = 20
+
+    # Layer height the worker slices at (shared .env); one skin layer in the shell estimate
+    SLICE_LAYER_HEIGHT_MM: float = 0.2
+
+    # Users whose similarity index each server process keeps in memory (least recently used dropped)
+    SIMILARITY_MAX_USERS: int = 256
 
     # OpenAI
     OPENAI_API_KEY: str = ""
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -55,11 +55,8 @@ def decode_token(token: str, expected_type: str = "access") -> uuid.UUID:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    user_id = decode_token(credentials.credentials, expected_type="access")
+async def _user_from_token(token: str, db: AsyncSession) -> User:
+    user_id = decode_token(token, expected_type="access")
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
@@ -68,3 +65,17 @@ async def get_current_user(
             detail="User not found",
         )
     return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    return await _user_from_token(credentials.credentials, db)
+
+
+async def get_current_user_from_query(
+    token: str = Query(..., description="Access token (EventSource can't send headers)"),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    return await _user_from_token(token, db)
@@ -1,10 +1,12 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.routers import auth, projects, models, calc, ai
+from app.routers import auth, projects, models, calc, ai, stats, batches
+from app.services.uploads import collect_garbage_periodically
 
 settings = get_settings()
 
@@ -12,8 +14,10 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    upload_gc = asyncio.create_task(collect_garbage_periodically())
     yield
     # Shutdown
+    upload_gc.cancel()
 
 
 app = FastAPI(
@@ -36,6 +40,8 @@ app.include_router(projects.router)
 app.include_router(models.router)
 app.include_router(calc.router)
 app.include_router(ai.router)
+app.include_router(stats.router)
+app.include_router(batches.router)
 
 
 @app.get("/api/health")
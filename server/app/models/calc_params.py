@@ -29,13 +29,20 @@ class CalcParams(Base):
     # Print parameters
     infill: Mapped[float] = mapped_column(Float, default=20.0)  # %
     support_percent: Mapped[float] = mapped_column(Float, default=10.0)  # %
+    auto_support: Mapped[bool] = mapped_column(Boolean, default=True)  # use the model's support volume
+    wall_count: Mapped[int] = mapped_column(Integer, default=2)  # perimeters
+    wall_thickness: Mapped[float] = mapped_column(Float, default=0.4)  # mm per perimeter
+    skin_layers: Mapped[int] = mapped_column(Integer, default=4)  # solid layers on top and bottom surfaces
     print_time_h: Mapped[float] = mapped_column(Float, default=1.0)
+    auto_print_time: Mapped[bool] = mapped_column(Boolean, default=True)  # use the slicer estimate
     post_process_time_h: Mapped[float] = mapped_column(Float, default=0.5)
     modeling_time_h: Mapped[float] = mapped_column(Float, default=0.0)
 
     # Economics
     quantity: Mapped[int] = mapped_column(Integer, default=1)
-    is_batch: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_batch: Mapped[bool] = mapped_column(Boolean, default=False)  # nest copies onto shared plates
+    bed_x: Mapped[float] = mapped_column(Float, default=220.0)  # printer bed, mm
+    bed_y: Mapped[float] = mapped_column(Float, default=220.0)  # printer bed, mm
     markup: Mapped[float] = mapped_column(Float, default=1.5)  # multiplier
     reject_rate: Mapped[float] = mapped_column(Float, default=0.05)  # 5%
     tax_rate: Mapped[float] = mapped_column(Float, default=0.20)  # 20%
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Float, DateTime, ForeignKey, func
+from sqlalchemy import Float, Integer, DateTime, ForeignKey, JSON, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,6 +20,11 @@ class CalcResult(Base):
     )
 
     weight: Mapped[float] = mapped_column(Float, default=0.0)
+    shell_weight: Mapped[float] = mapped_column(Float, default=0.0)  # walls + skins, part of weight
+    print_time_h: Mapped[float] = mapped_column(Float, default=0.0)  # hours actually priced per unit
+    batch_print_time_h: Mapped[float] = mapped_column(Float, default=0.0)  # machine hours for the whole quantity
+    plate_count: Mapped[int] = mapped_column(Integer, default=1)
+    plates: Mapped[list | None] = mapped_column(JSON, nullable=True)  # nested layouts, one entry per plate
     material_cost: Mapped[float] = mapped_column(Float, default=0.0)
     energy_cost: Mapped[float] = mapped_column(Float, default=0.0)
     depreciation: Mapped[float] = mapped_column(Float, default=0.0)
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import String, Float, Integer, DateTime, JSON, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class GeometryCache(Base):
+    """Analysis results keyed by the SHA-256 of the uploaded file."""
+
+    __tablename__ = "geometry_cache"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    analysis_version: Mapped[int] = mapped_column(Integer, default=0)  # worker ANALYSIS_VERSION that wrote it
+    dim_x: Mapped[float | None] = mapped_column(Float, nullable=True)
+    dim_y: Mapped[float | None] = mapped_column(Float, nullable=True)
+    dim_z: Mapped[float | None] = mapped_column(Float, nullable=True)
+    volume: Mapped[float | None] = mapped_column(Float, nullable=True)
+    surface_area: Mapped[float | None] = mapped_column(Float, nullable=True)
+    skin_area: Mapped[float | None] = mapped_column(Float, nullable=True)
+    wall_area: Mapped[float | None] = mapped_column(Float, nullable=True)
+    polygons: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    print_time_fdm_h: Mapped[float | None] = mapped_column(Float, nullable=True)
+    print_time_sla_h: Mapped[float | None] = mapped_column(Float, nullable=True)
+    print_time_metal_h: Mapped[float | None] = mapped_column(Float, nullable=True)
+    support_volume: Mapped[float | None] = mapped_column(Float, nullable=True)
+    mesh_quality: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    body_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    orientation_rx: Mapped[float | None] = mapped_column(Float, nullable=True)
+    orientation_ry: Mapped[float | None] = mapped_column(Float, nullable=True)
+    orientation_rz: Mapped[float | None] = mapped_column(Float, nullable=True)
+    oriented_height: Mapped[float | None] = mapped_column(Float, nullable=True)
+    oriented_support_area: Mapped[float | None] = mapped_column(Float, nullable=True)
+    oriented_footprint: Mapped[float | None] = mapped_column(Float, nullable=True)
+    bodies: Mapped[list | None] = mapped_column(JSON, nullable=True)  # ModelBody rows for multi-body scenes
+    shape_descriptor: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    analysis_time_s: Mapped[float] = mapped_column(Float, default=0.0)  # worker time per run
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<GeometryCache {self.sha256[:12]} hits={self.hits}>"
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Float, Integer, DateTime, ForeignKey, func
+from sqlalchemy import String, Float, Integer, Boolean, DateTime, ForeignKey, LargeBinary, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,20 +24,55 @@ class Model(Base):
     status: Mapped[str] = mapped_column(
         String(20), nullable=False, default="queued"
     )  # queued, processing, done, error
+    task_id: Mapped[str | None] = mapped_column(String(255), nullable=True)  # Celery process_model task
+    file_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )  # SHA-256 of the uploaded file, key into geometry_cache
     dim_x: Mapped[float | None] = mapped_column(Float, nullable=True)
     dim_y: Mapped[float | None] = mapped_column(Float, nullable=True)
     dim_z: Mapped[float | None] = mapped_column(Float, nullable=True)
     volume: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Mesh units², like volume in mesh units³; skin = XY projection of near-horizontal faces
+    surface_area: Mapped[float | None] = mapped_column(Float, nullable=True)
+    skin_area: Mapped[float | None] = mapped_column(Float, nullable=True)
+    wall_area: Mapped[float | None] = mapped_column(Float, nullable=True)
     polygons: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Slicer estimates per technology, hours
+    print_time_fdm_h: Mapped[float | None] = mapped_column(Float, nullable=True)
+    print_time_sla_h: Mapped[float | None] = mapped_column(Float, nullable=True)
+    print_time_metal_h: Mapped[float | None] = mapped_column(Float, nullable=True)
+    support_volume: Mapped[float | None] = mapped_column(Float, nullable=True)  # overhang supports, same units as volume
+    mesh_quality: Mapped[str | None] = mapped_column(
+        String(20), nullable=True
+    )  # ok, repaired, approximate, unverified
+    body_count: Mapped[int | None] = mapped_column(Integer, nullable=True)  # bodies in the scene
+    # Suggested build orientation (three.js "XYZ" Euler, degrees) and its metrics
+    orientation_rx: Mapped[float | None] = mapped_column(Float, nullable=True)
+    orientation_ry: Mapped[float | None] = mapped_column(Float, nullable=True)
+    orientation_rz: Mapped[float | None] = mapped_column(Float, nullable=True)
+    oriented_height: Mapped[float | None] = mapped_column(Float, nullable=True)  # mm
+    oriented_support_area: Mapped[float | None] = mapped_column(Float, nullable=True)  # mm², projected
+    oriented_footprint: Mapped[float | None] = mapped_column(Float, nullable=True)  # mm², plate bbox
     error_message: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    preview_ready: Mapped[bool] = mapped_column(Boolean, default=False)  # derived/<hash>/preview.bin
+    thumbnail_ready: Mapped[bool] = mapped_column(Boolean, default=False)  # derived/<hash>/thumbnail.png
+    canonical_ready: Mapped[bool] = mapped_column(Boolean, default=False)  # derived/<hash>/canonical.stl
+    # float32 D2 + moments descriptor for near-duplicate search (services/similarity.py)
+    shape_descriptor: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
 
     project: Mapped["Project"] = relationship("Project", back_populates="model")
+    # Only multi-body scenes have rows; always loaded with the model
+    bodies: Mapped[list["ModelBody"]] = relationship(
+        "ModelBody", back_populates="model", order_by="ModelBody.index",
+        cascade="all, delete-orphan", passive_deletes=True, lazy="selectin",
+    )
 
     def __repr__(self) -> str:
         return f"<Model {self.original_name} [{self.status}]>"
 
 
 from app.models.project import Project  # noqa: E402, F401
+from app.models.model_body import ModelBody  # noqa: E402, F401
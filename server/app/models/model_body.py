@@ -0,0 +1,37 @@
+import uuid
+
+from sqlalchemy import String, Float, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class ModelBody(Base):
+    """One body of a multi-object 3MF/OBJ scene, analyzed on its own."""
+
+    __tablename__ = "model_bodies"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    model_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("models.id", ondelete="CASCADE"),
+        nullable=False, index=True
+    )
+    index: Mapped[int] = mapped_column(Integer, nullable=False)  # order in the scene
+    name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    dim_x: Mapped[float | None] = mapped_column(Float, nullable=True)
+    dim_y: Mapped[float | None] = mapped_column(Float, nullable=True)
+    dim_z: Mapped[float | None] = mapped_column(Float, nullable=True)
+    volume: Mapped[float | None] = mapped_column(Float, nullable=True)
+    polygons: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    mesh_quality: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+    model: Mapped["Model"] = relationship("Model", back_populates="bodies")
+
+    def __repr__(self) -> str:
+        return f"<ModelBody {self.index} {self.name}>"
+
+
+from app.models.model3d import Model  # noqa: E402, F401
@@ -22,6 +22,9 @@ class Project(Base):
     client: Mapped[str | None] = mapped_column(String(255), nullable=True)
     contact: Mapped[str | None] = mapped_column(String(255), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    batch_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("upload_batches.id", ondelete="SET NULL"), nullable=True, index=True
+    )  # bulk archive this project came from
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -30,6 +33,7 @@ class Project(Base):
     )
 
     user: Mapped["User"] = relationship("User", back_populates="projects")
+    batch: Mapped["UploadBatch | None"] = relationship("UploadBatch", back_populates="projects")
     model: Mapped["Model | None"] = relationship(
         "Model", back_populates="project", uselist=False, cascade="all, delete-orphan"
     )
@@ -52,3 +56,4 @@ from app.models.model3d import Model  # noqa: E402, F401
 from app.models.calc_params import CalcParams  # noqa: E402, F401
 from app.models.calc_result import CalcResult  # noqa: E402, F401
 from app.models.ai_text import AiText  # noqa: E402, F401
+from app.models.upload_batch import UploadBatch  # noqa: E402, F401
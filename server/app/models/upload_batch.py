@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, Integer, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class UploadBatch(Base):
+    """A bulk archive upload: one project per model file, analyzed as one Celery chord."""
+
+    __tablename__ = "upload_batches"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String(255), nullable=False)  # archive filename
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="processing"
+    )  # processing, done
+    file_count: Mapped[int] = mapped_column(Integer, default=0)
+    skipped_count: Mapped[int] = mapped_column(Integer, default=0)  # unsupported archive members
+    failed_count: Mapped[int] = mapped_column(Integer, default=0)  # set by the chord callback
+    task_id: Mapped[str | None] = mapped_column(String(255), nullable=True)  # chord callback task
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    projects: Mapped[list["Project"]] = relationship(
+        "Project", back_populates="batch", order_by="Project.name"
+    )
+
+    def __repr__(self) -> str:
+        return f"<UploadBatch {self.name} ({self.status})>"
+
+
+from app.models.project import Project  # noqa: E402, F401
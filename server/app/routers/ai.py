@@ -18,7 +18,7 @@ from app.models.ai_text import AiText
 from app.schemas.project import AiTextResponse
 from app.schemas.ai import AiGenerateRequest, AiGenerateResponse
 from app.services.ai_service import generate_ai_texts
-from app.services.calculation import CalcInput, calculate
+from app.services.calculation import build_input, calculate
 
 logger = logging.getLogger(__name__)
 
@@ -74,24 +74,7 @@ async def ai_generate(
 
     # Run calculation if no result yet
     if project.calc_result is None:
-        calc_input = CalcInput(
-            volume=project.model.volume or 0,
-            material_density=params.material_density,
-            material_price=params.material_price,
-            waste_factor=params.waste_factor,
-            infill=params.infill,
-            support_percent=params.support_percent,
-            print_time_h=params.print_time_h,
-            post_process_time_h=params.post_process_time_h,
-            modeling_time_h=params.modeling_time_h,
-            quantity=params.quantity,
-            markup=params.markup,
-            reject_rate=params.reject_rate,
-            tax_rate=params.tax_rate,
-            depreciation_rate=params.depreciation_rate,
-            energy_rate=params.energy_rate,
-            hourly_rate=params.hourly_rate,
-        )
+        calc_input = build_input(params, project.model)
         calc_out = calculate(calc_input)
         calc_result_obj = CalcResult(project_id=project.id)
         db.add(calc_result_obj)
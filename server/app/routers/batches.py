@@ -0,0 +1,233 @@
+"""Bulk archive upload: one project per model file, analysis fanned out as a Celery chord."""
+
+import os
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.dependencies.database import get_db
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.models.project import Project
+from app.models.model3d import Model as Model3D
+from app.models.calc_params import CalcParams
+from app.models.upload_batch import UploadBatch
+from app.schemas.batch import (
+    BatchProjectItem, BatchQuoteLine, BatchQuoteResponse, UploadBatchResponse,
+)
+from app.routers.models import ALLOWED_EXTENSIONS
+from app.services import analysis_cache, similarity, uploads
+from app.services.archive import ArchiveError, extract_models
+from app.services.calculation import build_input, calculate
+from app.services.derived_files import canonical_path, preview_path, thumbnail_path
+from app.tasks import choose_queue, enqueue_batch, enqueue_preview
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/batches", tags=["batches"])
+
+
+# ---- helpers ----
+
+async def _get_batch_for_user(batch_id: uuid.UUID, user: User, db: AsyncSession) -> UploadBatch:
+    result = await db.execute(
+        select(UploadBatch)
+        .options(
+            selectinload(UploadBatch.projects).selectinload(Project.model),
+            selectinload(UploadBatch.projects).selectinload(Project.calc_params),
+        )
+        .where(UploadBatch.id == batch_id, UploadBatch.user_id == user.id)
+    )
+    batch = result.scalar_one_or_none()
+    if not batch:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return batch
+
+
+def _batch_response(batch: UploadBatch) -> UploadBatchResponse:
+    return UploadBatchResponse(
+        id=batch.id,
+        name=batch.name,
+        status=batch.status,
+        file_count=batch.file_count,
+        skipped_count=batch.skipped_count,
+        failed_count=batch.failed_count,
+        created_at=batch.created_at,
+        finished_at=batch.finished_at,
+        projects=[
+            BatchProjectItem(id=p.id, name=p.name, model_status=p.model.status if p.model else None)
+            for p in batch.projects
+        ],
+    )
+
+
+def _checked_zip_name(filename: str | None) -> None:
+    if not filename or not filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Upload a .zip archive")
+
+
+# ---- endpoints ----
+
+@router.post("", response_model=UploadBatchResponse, status_code=status.HTTP_201_CREATED)
+async def upload_archive(
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload a ZIP of STL/OBJ/3MF files, as the `file` field of a multipart form; each becomes its own project."""
+    # Staged from the request stream under MAX_ARCHIVE_SIZE_MB, like a model upload
+    try:
+        staged = await uploads.stage_upload(
+            request, settings.MAX_ARCHIVE_SIZE_MB * 1024 * 1024, check_filename=_checked_zip_name
+        )
+    except uploads.UploadTooLarge:
+        raise HTTPException(status_code=400, detail=f"Archive too large. Max: {settings.MAX_ARCHIVE_SIZE_MB}MB")
+    except uploads.InvalidUpload as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    # zipfile is blocking; the staged archive is read member by member off the event loop
+    try:
+        members, skipped = await run_in_threadpool(
+            extract_models,
+            staged.path,
+            settings.UPLOAD_DIR,
+            ALLOWED_EXTENSIONS,
+            settings.MAX_ARCHIVE_FILES,
+            settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024,
+            settings.MAX_ARCHIVE_INFLATED_MB * 1024 * 1024,
+        )
+    except ArchiveError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        await uploads.discard(staged.path)
+
+    batch = UploadBatch(
+        user_id=user.id,
+        name=staged.filename[:255],
+        file_count=len(members),
+        skipped_count=skipped,
+        failed_count=0,
+    )
+    db.add(batch)
+    await db.flush()
+
+    jobs, previews = [], []
+    for member in members:
+        project = Project(id=member.project_id, user_id=user.id, name=member.name, batch_id=batch.id)
+        model = Model3D(
+            project=project,
+            filename=os.path.basename(member.file_path),
+            original_name=member.original_name,
+            format=member.ext,
+            status="queued",
+            file_hash=member.file_hash,
+        )
+        db.add_all([project, model, CalcParams(project=project)])
+
+        cached = await analysis_cache.lookup(db, member.file_hash)
+        if cached:
+            analysis_cache.apply_entry(model, cached)
+            model.preview_ready = os.path.exists(preview_path(member.file_hash))
+            model.thumbnail_ready = os.path.exists(thumbnail_path(member.file_hash))
+            model.canonical_ready = os.path.exists(canonical_path(member.file_hash))
+            await analysis_cache.record_hit(db, cached)
+            if not (model.preview_ready and model.thumbnail_ready):
+                previews.append((model, member))
+        else:
+            await analysis_cache.record_miss()
+            jobs.append((model, member))
+
+    await db.flush()
+    if len(jobs) < len(members):
+        # Cache hits arrive with their shape descriptors already in place
+        queued = {member.project_id for _, member in jobs}
+        await similarity.add(user.id, [member.project_id for member in members if member.project_id not in queued])
+    if previews:
+        # Cache hits without their preview or thumbnail; rows must be visible to the worker first
+        await db.commit()
+        for model, member in previews:
+            enqueue_preview(str(model.id), member.file_path, choose_queue(model.polygons, member.size))
+
+    if jobs:
+        # Rows must be visible to the workers (and the chord callback) before the tasks start
+        await db.commit()
+        batch.task_id, task_ids = enqueue_batch(
+            str(batch.id),
+            [
+                (str(model.id), member.file_path, choose_queue(member.estimated_faces, member.size))
+                for model, member in jobs
+            ],
+        )
+        for (model, _), task_id in zip(jobs, task_ids):
+            model.task_id = task_id
+    else:
+        # Every file was a cache hit
+        batch.status = "done"
+        batch.finished_at = func.now()
+    await db.flush()
+
+    return await get_batch(batch.id, user, db)
+
+
+@router.get("/{batch_id}", response_model=UploadBatchResponse)
+async def get_batch(
+    batch_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Batch progress with the processing status of every project."""
+    batch = await _get_batch_for_user(batch_id, user, db)
+    return _batch_response(batch)
+
+
+@router.get("/{batch_id}/quote", response_model=BatchQuoteResponse)
+async def get_batch_quote(
+    batch_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Combined quote: every processed project priced with its own params, plus totals."""
+    batch = await _get_batch_for_user(batch_id, user, db)
+
+    lines = []
+    pending = failed = 0
+    total_weight = total_print_time_h = total_price = 0.0
+    for project in batch.projects:
+        model, params = project.model, project.calc_params
+        line = BatchQuoteLine(
+            project_id=project.id,
+            name=project.name,
+            model_status=model.status if model else None,
+            quantity=params.quantity if params else 1,
+        )
+        if model is None or model.status == "error" or (model.status == "done" and not model.volume):
+            failed += 1
+        elif model.status != "done" or params is None:
+            pending += 1
+        else:
+            out = calculate(build_input(params, model))
+            line.weight = out.weight
+            line.print_time_h = out.print_time_h
+            line.price_per_unit = out.price_per_unit
+            line.total_price = out.total_price
+            total_weight += out.weight * params.quantity
+            total_print_time_h += out.batch_print_time_h
+            total_price += out.total_price
+        lines.append(line)
+
+    return BatchQuoteResponse(
+        batch_id=batch.id,
+        status=batch.status,
+        priced=len(lines) - pending - failed,
+        pending=pending,
+        failed=failed,
+        total_weight=round(total_weight, 2),
+        total_print_time_h=round(total_print_time_h, 4),
+        total_price=round(total_price, 4),
+        lines=lines,
+    )
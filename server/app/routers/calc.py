@@ -15,7 +15,7 @@ from app.models.calc_params import CalcParams
 from app.models.calc_result import CalcResult
 from app.schemas.project import CalcParamsResponse, CalcResultResponse
 from app.schemas.calc_params import CalcParamsUpdate
-from app.services.calculation import CalcInput, calculate
+from app.services.calculation import build_input, calculate
 
 router = APIRouter(prefix="/api/projects/{project_id}", tags=["calculation"])
 
@@ -124,24 +124,7 @@ async def run_calculation(
         params = project.calc_params
 
     # Build calc input
-    calc_input = CalcInput(
-        volume=project.model.volume,
-        material_density=params.material_density,
-        material_price=params.material_price,
-        waste_factor=params.waste_factor,
-        infill=params.infill,
-        support_percent=params.support_percent,
-        print_time_h=params.print_time_h,
-        post_process_time_h=params.post_process_time_h,
-        modeling_time_h=params.modeling_time_h,
-        quantity=params.quantity,
-        markup=params.markup,
-        reject_rate=params.reject_rate,
-        tax_rate=params.tax_rate,
-        depreciation_rate=params.depreciation_rate,
-        energy_rate=params.energy_rate,
-        hourly_rate=params.hourly_rate,
-    )
+    calc_input = build_input(params, project.model)
 
     result = calculate(calc_input)
 
@@ -1,20 +1,29 @@
+import base64
+import binascii
 import os
 import uuid
 import shutil
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.dependencies.database import get_db
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_user, get_current_user_from_query
 from app.models.user import User
 from app.models.project import Project
 from app.models.model3d import Model as Model3D
-from app.schemas.project import ModelResponse
-from app.tasks import enqueue_process_model
+from app.models.upload_session import UploadSession
+from app.schemas.project import ModelResponse, UploadSessionCreate, UploadSessionResponse
+from app.services import analysis_cache, mesh_sniff, similarity, uploads
+from app.services.derived_files import canonical_path, preview_path, thumbnail_path
+from app.services.status_events import model_response, model_status_events
+from app.tasks import cancel_processing, choose_queue, enqueue_preview, enqueue_process_model
 
 settings = get_settings()
 
@@ -28,6 +37,26 @@ def _get_extension(filename: str) -> str:
     return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
 
 
+def _checked_extension(filename: str | None) -> str:
+    """Extension of a supported model file; 400 otherwise."""
+    if not filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+    ext = _get_extension(filename)
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format: .{ext}. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
+        )
+    return ext
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"File too large. Max: {settings.MAX_UPLOAD_SIZE_MB}MB",
+    )
+
+
 async def _verify_project_ownership(
     project_id: uuid.UUID,
     user: User,
@@ -46,31 +75,46 @@ async def _verify_project_ownership(
 @router.post("", response_model=ModelResponse, status_code=status.HTTP_201_CREATED)
 async def upload_model(
     project_id: uuid.UUID,
-    file: UploadFile = File(...),
+    request: Request,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Upload a 3D model file (STL/OBJ/3MF) to a project."""
+    """Upload a 3D model file (STL/OBJ/3MF) to a project, as the `file` field of a multipart form."""
     await _verify_project_ownership(project_id, user, db)
 
-    # Validate file extension
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No filename provided")
-    ext = _get_extension(file.filename)
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported format: .{ext}. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
+    # Parse the body as it arrives into a staging file, hashing as we go (the
+    # hash keys the analysis cache); the extension is checked before any data
+    try:
+        staged = await uploads.stage_upload(
+            request, settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024, check_filename=_checked_extension
         )
-
-    # Check file size
-    content = await file.read()
-    max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
-    if len(content) > max_bytes:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Max: {settings.MAX_UPLOAD_SIZE_MB}MB",
+    except uploads.UploadTooLarge:
+        raise _too_large()
+    except uploads.InvalidUpload as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        return await _store_model(
+            project_id, user, db, staged, staged.filename, _get_extension(staged.filename)
         )
+    finally:
+        await uploads.discard(staged.path)
+
+
+async def _store_model(
+    project_id: uuid.UUID,
+    user: User,
+    db: AsyncSession,
+    staged: uploads.StagedUpload,
+    original_name: str,
+    ext: str,
+) -> Model3D:
+    """Replace the project's model with a complete staged upload and queue it (or apply a cache hit)."""
+    file_hash = staged.file_hash
+
+    # Use a deterministic filename to avoid collisions
+    upload_dir = os.path.join(settings.UPLOAD_DIR, str(project_id))
+    saved_filename = f"model.{ext}"
+    file_path = os.path.join(upload_dir, saved_filename)
 
     # Delete existing model if re-uploading
     existing = await db.execute(
@@ -78,49 +122,264 @@ async def upload_model(
     )
     old_model = existing.scalar_one_or_none()
     if old_model:
+        # Its job would only burn a worker slot and then write to a deleted row
+        await cancel_processing(old_model)
         # Remove old file
-        old_dir = os.path.join(settings.UPLOAD_DIR, str(project_id))
-        if os.path.exists(old_dir):
-            shutil.rmtree(old_dir)
+        if os.path.exists(upload_dir):
+            await run_in_threadpool(shutil.rmtree, upload_dir)
         await db.delete(old_model)
         await db.flush()
 
-    # Save file to disk
-    upload_dir = os.path.join(settings.UPLOAD_DIR, str(project_id))
-    os.makedirs(upload_dir, exist_ok=True)
-
-    # Use a deterministic filename to avoid collisions
-    saved_filename = f"model.{ext}"
-    file_path = os.path.join(upload_dir, saved_filename)
-
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Atomic rename into the project directory; the file is never seen half-written
+    await uploads.move_into_place(staged, file_path)
 
     # Create DB record
     model = Model3D(
         project_id=project_id,
         filename=saved_filename,
-        original_name=file.filename,
+        original_name=original_name,
         format=ext,
         status="queued",
+        file_hash=file_hash,
     )
+
+    # Identical file analyzed before — skip the worker round trip
+    cached = await analysis_cache.lookup(db, file_hash)
+    if cached:
+        analysis_cache.apply_entry(model, cached)
+        model.preview_ready = os.path.exists(preview_path(file_hash))
+        model.thumbnail_ready = os.path.exists(thumbnail_path(file_hash))
+        model.canonical_ready = os.path.exists(canonical_path(file_hash))
+
     db.add(model)
     await db.flush()
     await db.refresh(model)
 
-    # Enqueue Celery task
-    enqueue_process_model(str(model.id), file_path)
+    if cached:
+        await analysis_cache.record_hit(db, cached)
+        if not (model.preview_ready and model.thumbnail_ready):
+            # Its preview task publishes the terminal preview event; the row must be visible first
+            await db.commit()
+            enqueue_preview(str(model.id), file_path, choose_queue(model.polygons, staged.size))
+    else:
+        await analysis_cache.record_miss()
+        # Enqueue Celery task; heavy meshes go to their own queue so they can't block small quotes
+        estimated_faces = await run_in_threadpool(mesh_sniff.estimate_file_faces, file_path, ext)
+        queue = choose_queue(estimated_faces, staged.size)
+        # Row and task ID are committed before publishing: the worker must find the row, and a
+        # re-upload or delete racing this request must find the task ID to revoke
+        model.task_id = str(uuid.uuid4())
+        await db.commit()
+        enqueue_process_model(str(model.id), file_path, queue, task_id=model.task_id)
+
+    # The replaced model (or the cached descriptor) changes this user's similarity index
+    if old_model:
+        await similarity.invalidate(user.id)
+    elif cached:
+        await similarity.add(user.id, [project_id])
+    return model
+
+
+# ---- resumable uploads ----
+# For large files on flaky connections, next to the one-shot POST above:
+# create a session, PUT the bytes in chunks (each at the session's offset,
+# optionally checksummed), ask for the offset after a failure, finalize.
+
+def _session_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+
+
+def _chunk_checksum(header: str | None) -> bytes | None:
+    """SHA-256 digest from an `Upload-Checksum: sha256 <base64>` header (tus checksum extension)."""
+    if header is None:
+        return None
+    algorithm, _, value = header.partition(" ")
+    if algorithm.lower() != "sha256":
+        raise HTTPException(status_code=400, detail="Upload-Checksum must be 'sha256 <base64 digest>'")
+    try:
+        digest = base64.b64decode(value.strip(), validate=True)
+    except binascii.Error:
+        digest = b""
+    if len(digest) != 32:
+        raise HTTPException(status_code=400, detail="Upload-Checksum must be 'sha256 <base64 digest>'")
+    return digest
+
+
+async def _get_upload_session(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    user: User,
+    db: AsyncSession,
+) -> UploadSession:
+    """The user's live session; writers read it under uploads.session_lock (see _locked_session)."""
+    session = (await db.execute(
+        select(UploadSession).where(
+            UploadSession.id == upload_id,
+            UploadSession.project_id == project_id,
+            UploadSession.user_id == user.id,
+        )
+    )).scalar_one_or_none()
+    if not session or session.expires_at <= datetime.now(timezone.utc):
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    return session
+
+
+@asynccontextmanager
+async def _locked_session(project_id: uuid.UUID, upload_id: uuid.UUID, user: User, db: AsyncSession):
+    """
+    The session, read under its Redis lock so two requests can't write the
+    same upload. Changes must be committed inside the block: the next
+    holder reads the row as soon as the lock is released.
+    """
+    try:
+        async with uploads.session_lock(upload_id):
+            yield await _get_upload_session(project_id, upload_id, user, db)
+    except uploads.SessionBusy:
+        raise HTTPException(status_code=409, detail="Another request is writing this upload")
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    project_id: uuid.UUID,
+    data: UploadSessionCreate,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start a resumable upload of `size` bytes."""
+    await _verify_project_ownership(project_id, user, db)
+    ext = _checked_extension(data.filename)
+    if data.size <= 0:
+        raise HTTPException(status_code=400, detail="Empty file")
+    if data.size > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+        raise _too_large()
+
+    session = UploadSession(
+        user_id=user.id,
+        project_id=project_id,
+        original_name=data.filename[:255],
+        format=ext,
+        size=data.size,
+        offset=0,
+        sha256=data.sha256.lower() if data.sha256 else None,
+        expires_at=_session_expiry(),
+    )
+    db.add(session)
+    await db.flush()
+    await uploads.create_session_file(session.id)
+    return session
+
 
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload_session(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """The session's offset: bytes received and verified so far, where the next chunk starts."""
+    return await _get_upload_session(project_id, upload_id, user, db)
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    upload_checksum: str | None = Header(None, alias="Upload-Checksum"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Write the request body (at most MAX_UPLOAD_CHUNK_MB) at Upload-Offset,
+    which must be the session's offset. With Upload-Checksum the chunk's
+    SHA-256 is verified before the offset moves. A rejected or interrupted
+    chunk is dropped; send it again from the offset.
+    """
+    checksum = _chunk_checksum(upload_checksum)
+    async with _locked_session(project_id, upload_id, user, db) as session:
+        if upload_offset != session.offset:
+            raise HTTPException(status_code=409, detail=f"Offset mismatch: the upload is at {session.offset}")
+        # Hand the pooled connection back while the client streams; the lock keeps the offset ours
+        await db.commit()
+
+        max_bytes = min(settings.MAX_UPLOAD_CHUNK_MB * 1024 * 1024, session.size - session.offset)
+        try:
+            written = await uploads.write_chunk(
+                uploads.session_path(session.id), session.offset, request.stream(), max_bytes, checksum
+            )
+        except uploads.UploadTooLarge:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Chunk too large: max {settings.MAX_UPLOAD_CHUNK_MB}MB, and not past the declared size",
+            )
+        except uploads.ChecksumMismatch:
+            raise HTTPException(status_code=400, detail="Chunk checksum mismatch")
+        except TimeoutError:
+            raise HTTPException(
+                status_code=408, detail=f"Chunk not received within {settings.UPLOAD_CHUNK_TIMEOUT_S}s"
+            )
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Upload session not found or expired")
+
+        session.offset += written
+        session.expires_at = _session_expiry()
+        await db.commit()
+    return session
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=ModelResponse, status_code=status.HTTP_201_CREATED)
+async def finalize_upload(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Complete a resumable upload; from here on it is processed like POST /model."""
+    async with _locked_session(project_id, upload_id, user, db) as session:
+        if session.offset != session.size:
+            raise HTTPException(
+                status_code=409, detail=f"Upload incomplete: {session.offset} of {session.size} bytes"
+            )
+        await db.commit()  # no connection held while hashing
+
+        path = uploads.session_path(session.id)
+        try:
+            file_hash = await run_in_threadpool(uploads.file_sha256, path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Upload session not found or expired")
+        if session.sha256 and file_hash != session.sha256:
+            raise HTTPException(status_code=400, detail="File checksum mismatch; abort and upload again")
+
+        staged = uploads.StagedUpload(path=path, size=session.size, file_hash=file_hash)
+        original_name, ext = session.original_name, session.format
+        await db.delete(session)
+        model = await _store_model(project_id, user, db, staged, original_name, ext)
+        await db.commit()
     return model
 
 
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(
+    project_id: uuid.UUID,
+    upload_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Abandon a resumable upload and free its disk space."""
+    async with _locked_session(project_id, upload_id, user, db) as session:
+        await uploads.discard(uploads.session_path(session.id))
+        await db.delete(session)
+        await db.commit()
+
+
 @router.get("/status", response_model=ModelResponse)
 async def get_model_status(
     project_id: uuid.UUID,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get the current status and analysis data of the project's 3D model."""
+    """Get the current status and analysis data of the project's 3D model, with stage progress while processing."""
     await _verify_project_ownership(project_id, user, db)
 
     result = await db.execute(
@@ -130,7 +389,35 @@ async def get_model_status(
     if not model:
         raise HTTPException(status_code=404, detail="No model uploaded for this project")
 
-    return model
+    return await model_response(model)
+
+
+@router.get("/events")
+async def stream_model_status(
+    project_id: uuid.UUID,
+    user: User = Depends(get_current_user_from_query),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Server-Sent Events: the model's status (a ModelResponse) now and after
+    every change the worker makes, until it is done with its preview or failed.
+    Authenticated once per connection via ?token=, since EventSource can't
+    send an Authorization header.
+    """
+    await _verify_project_ownership(project_id, user, db)
+
+    result = await db.execute(
+        select(Model3D.id).where(Model3D.project_id == project_id)
+    )
+    model_id = result.scalar_one_or_none()
+    if not model_id:
+        raise HTTPException(status_code=404, detail="No model uploaded for this project")
+
+    return StreamingResponse(
+        model_status_events(model_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/file")
@@ -139,7 +426,7 @@ async def get_model_file(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Serve the raw 3D model file for the viewer."""
+    """Serve the 3D model file for the viewer: the canonical binary STL of a text upload, else the upload itself."""
     await _verify_project_ownership(project_id, user, db)
 
     result = await db.execute(
@@ -149,6 +436,14 @@ async def get_model_file(
     if not model:
         raise HTTPException(status_code=404, detail="No model uploaded for this project")
 
+    if model.canonical_ready and model.file_hash and os.path.exists(canonical_path(model.file_hash)):
+        stem = model.original_name.rsplit(".", 1)[0]
+        return FileResponse(
+            path=canonical_path(model.file_hash),
+            filename=f"{stem}.stl",
+            media_type="application/sla",
+        )
+
     file_path = os.path.join(settings.UPLOAD_DIR, str(project_id), model.filename)
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Model file not found on disk")
@@ -167,6 +462,66 @@ async def get_model_file(
     )
 
 
+@router.get("/preview")
+async def get_model_preview(
+    project_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Serve the decimated preview mesh (PRV1 binary) generated by the worker."""
+    await _verify_project_ownership(project_id, user, db)
+
+    result = await db.execute(
+        select(Model3D).where(Model3D.project_id == project_id)
+    )
+    model = result.scalar_one_or_none()
+    if not model:
+        raise HTTPException(status_code=404, detail="No model uploaded for this project")
+
+    if not model.preview_ready or not model.file_hash:
+        raise HTTPException(status_code=404, detail="Preview not generated yet")
+    file_path = preview_path(model.file_hash)
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="Preview file not found on disk")
+
+    # Content-addressed by file hash — clients version the URL with ?v=<file_hash>
+    return FileResponse(
+        path=file_path,
+        media_type="application/octet-stream",
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
+
+
+@router.get("/thumbnail")
+async def get_model_thumbnail(
+    project_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Serve the PNG thumbnail rendered by the worker."""
+    await _verify_project_ownership(project_id, user, db)
+
+    result = await db.execute(
+        select(Model3D).where(Model3D.project_id == project_id)
+    )
+    model = result.scalar_one_or_none()
+    if not model:
+        raise HTTPException(status_code=404, detail="No model uploaded for this project")
+
+    if not model.thumbnail_ready or not model.file_hash:
+        raise HTTPException(status_code=404, detail="Thumbnail not generated yet")
+    file_path = thumbnail_path(model.file_hash)
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="Thumbnail file not found on disk")
+
+    # Content-addressed like the preview; ProjectListItem.thumbnail_url carries ?v=<file_hash>
+    return FileResponse(
+        path=file_path,
+        media_type="image/png",
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
+
+
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_model(
     project_id: uuid.UUID,
@@ -183,9 +538,12 @@ async def delete_model(
     if not model:
         raise HTTPException(status_code=404, detail="No model uploaded for this project")
 
+    await cancel_processing(model)
+
     # Remove file from disk
     upload_dir = os.path.join(settings.UPLOAD_DIR, str(project_id))
     if os.path.exists(upload_dir):
         shutil.rmtree(upload_dir)
 
     await db.delete(model)
+    await similarity.invalidate(user.id)
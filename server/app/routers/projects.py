@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -9,16 +9,27 @@ from app.dependencies.database import get_db
 from app.dependencies.auth import get_current_user
 from app.models.user import User
 from app.models.project import Project
+from app.models.model3d import Model as Model3D
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
     ProjectListItem,
     ProjectDetail,
+    SimilarProject,
 )
+from app.services import similarity
+from app.tasks import cancel_processing
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
 
+def _thumbnail_url(project: Project) -> str | None:
+    model = project.model
+    if model and model.thumbnail_ready and model.file_hash:
+        return f"/api/projects/{project.id}/model/thumbnail?v={model.file_hash}"
+    return None
+
+
 @router.get("", response_model=list[ProjectListItem])
 async def list_projects(
     user: User = Depends(get_current_user),
@@ -45,6 +56,7 @@ async def list_projects(
                 updated_at=p.updated_at,
                 has_model=p.model is not None,
                 model_status=p.model.status if p.model else None,
+                thumbnail_url=_thumbnail_url(p),
             )
         )
     return items
@@ -103,6 +115,60 @@ async def get_project(
     return project
 
 
+@router.get("/{project_id}/similar", response_model=list[SimilarProject])
+async def get_similar_projects(
+    project_id: uuid.UUID,
+    limit: int = Query(5, ge=1, le=50),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """The user's past projects whose models are closest in shape, with their last calculation."""
+    result = await db.execute(
+        select(Project)
+        .options(selectinload(Project.model))
+        .where(Project.id == project_id, Project.user_id == user.id)
+    )
+    project = result.scalar_one_or_none()
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    query = similarity.decode(project.model.shape_descriptor) if project.model else None
+    if query is None:
+        raise HTTPException(status_code=400, detail="Model has not been analyzed yet")
+
+    index = await similarity.get_index(db, user.id)
+    matches = similarity.nearest(index, query, limit, exclude=project.id)
+
+    result = await db.execute(
+        select(Project)
+        .options(selectinload(Project.model), selectinload(Project.calc_result))
+        .where(Project.id.in_([match_id for match_id, _ in matches]), Project.user_id == user.id)
+    )
+    projects = {p.id: p for p in result.scalars().all()}
+
+    items = []
+    for match_id, distance in matches:
+        p = projects.get(match_id)
+        if p is None or p.model is None:
+            continue  # deleted since the index was loaded
+        items.append(
+            SimilarProject(
+                id=p.id,
+                name=p.name,
+                client=p.client,
+                created_at=p.created_at,
+                distance=round(distance, 6),
+                format=p.model.format,
+                dim_x=p.model.dim_x,
+                dim_y=p.model.dim_y,
+                dim_z=p.model.dim_z,
+                volume=p.model.volume,
+                thumbnail_url=_thumbnail_url(p),
+                calc_result=p.calc_result,
+            )
+        )
+    return items
+
+
 @router.patch("/{project_id}", response_model=ProjectDetail)
 async def update_project(
     project_id: uuid.UUID,
@@ -157,4 +223,9 @@ async def delete_project(
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
+    model = await db.scalar(select(Model3D).where(Model3D.project_id == project.id))
+    if model:
+        await cancel_processing(model)
+
     await db.delete(project)
+    await similarity.invalidate(user.id)
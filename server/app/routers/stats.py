@@ -0,0 +1,25 @@
+"""Operational stats endpoints."""
+
+from fastapi import APIRouter, Depends
+
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.services import analysis_cache, ingest_stats
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+@router.get("/analysis-cache")
+async def get_analysis_cache_stats(
+    user: User = Depends(get_current_user),
+):
+    """Hit/miss counters of the content-addressed analysis cache."""
+    return await analysis_cache.get_stats()
+
+
+@router.get("/ingest")
+async def get_ingest_stats(
+    user: User = Depends(get_current_user),
+):
+    """Uploads normalized to canonical binary STL and the bytes saved, per source format."""
+    return await ingest_stats.get_stats()
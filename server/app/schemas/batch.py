@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class BatchProjectItem(BaseModel):
+    id: uuid.UUID
+    name: str
+    model_status: str | None = None
+
+
+class UploadBatchResponse(BaseModel):
+    id: uuid.UUID
+    name: str
+    status: str
+    file_count: int
+    skipped_count: int
+    failed_count: int
+    created_at: datetime
+    finished_at: datetime | None = None
+    projects: list[BatchProjectItem] = []
+
+
+class BatchQuoteLine(BaseModel):
+    project_id: uuid.UUID
+    name: str
+    model_status: str | None = None
+    quantity: int
+    weight: float | None = None
+    print_time_h: float | None = None
+    price_per_unit: float | None = None
+    total_price: float | None = None
+
+
+class BatchQuoteResponse(BaseModel):
+    batch_id: uuid.UUID
+    status: str
+    priced: int  # lines with a processed model
+    pending: int
+    failed: int
+    total_weight: float  # g, all quantities
+    total_print_time_h: float
+    total_price: float
+    lines: list[BatchQuoteLine]
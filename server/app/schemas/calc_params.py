@@ -8,11 +8,18 @@ class CalcParamsUpdate(BaseModel):
     waste_factor: float | None = None
     infill: float | None = None
     support_percent: float | None = None
+    auto_support: bool | None = None
+    wall_count: int | None = None
+    wall_thickness: float | None = None
+    skin_layers: int | None = None
     print_time_h: float | None = None
+    auto_print_time: bool | None = None
     post_process_time_h: float | None = None
     modeling_time_h: float | None = None
     quantity: int | None = None
     is_batch: bool | None = None
+    bed_x: float | None = None
+    bed_y: float | None = None
     markup: float | None = None
     reject_rate: float | None = None
     tax_rate: float | None = None
@@ -4,6 +4,24 @@ from pydantic import BaseModel
 
 
 # --- Model3D ---
+class ModelBodyResponse(BaseModel):
+    index: int
+    name: str | None = None
+    dim_x: float | None = None
+    dim_y: float | None = None
+    dim_z: float | None = None
+    volume: float | None = None
+    polygons: int | None = None
+    mesh_quality: str | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class ModelProgress(BaseModel):
+    stage: str  # load, bounds, volume, print_time, support, orientation
+    percent: float
+
+
 class ModelResponse(BaseModel):
     id: uuid.UUID
     filename: str
@@ -14,13 +32,51 @@ class ModelResponse(BaseModel):
     dim_y: float | None = None
     dim_z: float | None = None
     volume: float | None = None
+    surface_area: float | None = None
+    skin_area: float | None = None
+    wall_area: float | None = None
     polygons: int | None = None
+    print_time_fdm_h: float | None = None
+    print_time_sla_h: float | None = None
+    print_time_metal_h: float | None = None
+    support_volume: float | None = None
+    mesh_quality: str | None = None
+    body_count: int | None = None
+    orientation_rx: float | None = None
+    orientation_ry: float | None = None
+    orientation_rz: float | None = None
+    oriented_height: float | None = None
+    oriented_support_area: float | None = None
+    oriented_footprint: float | None = None
+    bodies: list[ModelBodyResponse] = []
     error_message: str | None = None
+    file_hash: str | None = None
+    preview_ready: bool = False
+    thumbnail_ready: bool = False
+    canonical_ready: bool = False  # GET /file serves the binary STL normalized from a text upload
+    progress: ModelProgress | None = None  # while processing; from Redis, not the DB
     created_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int  # bytes
+    sha256: str | None = None  # hex digest of the whole file, checked at finalize
+
+
+class UploadSessionResponse(BaseModel):
+    id: uuid.UUID
+    original_name: str
+    format: str
+    size: int
+    offset: int  # resume from here
+    expires_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 # --- CalcParams ---
 class CalcParamsResponse(BaseModel):
     id: uuid.UUID
@@ -30,11 +86,18 @@ class CalcParamsResponse(BaseModel):
     waste_factor: float
     infill: float
     support_percent: float
+    auto_support: bool = True
+    wall_count: int = 2
+    wall_thickness: float = 0.4
+    skin_layers: int = 4
     print_time_h: float
+    auto_print_time: bool = True
     post_process_time_h: float
     modeling_time_h: float
     quantity: int
     is_batch: bool
+    bed_x: float = 220.0
+    bed_y: float = 220.0
     markup: float
     reject_rate: float
     tax_rate: float
@@ -48,9 +111,25 @@ class CalcParamsResponse(BaseModel):
 
 
 # --- CalcResult ---
+class PlacementResponse(BaseModel):
+    x: float
+    y: float
+    rotated: bool
+
+
+class PlateResponse(BaseModel):
+    index: int
+    parts: list[PlacementResponse]
+
+
 class CalcResultResponse(BaseModel):
     id: uuid.UUID
     weight: float
+    shell_weight: float = 0.0
+    print_time_h: float = 0.0
+    batch_print_time_h: float = 0.0
+    plate_count: int = 1
+    plates: list[PlateResponse] | None = None
     material_cost: float
     energy_cost: float
     depreciation: float
@@ -107,10 +186,27 @@ class ProjectListItem(BaseModel):
     updated_at: datetime
     has_model: bool = False
     model_status: str | None = None
+    thumbnail_url: str | None = None  # immutable, versioned by file hash
 
     model_config = {"from_attributes": True}
 
 
+class SimilarProject(BaseModel):
+    """A past project whose model is close in shape (scale and rotation invariant)."""
+    id: uuid.UUID
+    name: str
+    client: str | None
+    created_at: datetime
+    distance: float  # between shape descriptors; 0 = same shape
+    format: str
+    dim_x: float | None = None
+    dim_y: float | None = None
+    dim_z: float | None = None
+    volume: float | None = None
+    thumbnail_url: str | None = None
+    calc_result: CalcResultResponse | None = None
+
+
 class ProjectDetail(BaseModel):
     id: uuid.UUID
     name: str
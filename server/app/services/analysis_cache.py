@@ -0,0 +1,84 @@
+"""
+Content-addressed analysis cache.
+
+The worker stores every successful analysis in `geometry_cache` under the
+SHA-256 of the uploaded file; uploads whose hash is already known are
+marked done immediately instead of being queued. Hit/miss counters and
+the worker time saved live in Redis so they are shared across server
+processes.
+
+Entries carry the worker's ANALYSIS_VERSION; rows written by an older
+analysis are treated as misses, and the worker overwrites them when it
+stores the fresh result.
+"""
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies.redis import redis_client
+from app.models.geometry_cache import GeometryCache
+from app.models.model3d import Model as Model3D
+from app.models.model_body import ModelBody
+
+# Must match ANALYSIS_VERSION in worker/tasks/process_model.py
+ANALYSIS_VERSION = 2
+
+HITS_KEY = "analysis_cache:hits"
+MISSES_KEY = "analysis_cache:misses"
+SAVED_SECONDS_KEY = "analysis_cache:saved_seconds"
+
+# Columns copied from a cache entry onto a new Model row
+CACHED_FIELDS = (
+    "dim_x", "dim_y", "dim_z", "volume", "surface_area", "skin_area", "wall_area", "polygons",
+    "print_time_fdm_h", "print_time_sla_h", "print_time_metal_h",
+    "support_volume", "mesh_quality", "body_count",
+    "orientation_rx", "orientation_ry", "orientation_rz",
+    "oriented_height", "oriented_support_area", "oriented_footprint",
+    "shape_descriptor",
+)
+
+
+async def lookup(db: AsyncSession, sha256: str) -> GeometryCache | None:
+    result = await db.execute(
+        select(GeometryCache).where(
+            GeometryCache.sha256 == sha256,
+            GeometryCache.analysis_version == ANALYSIS_VERSION,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+def apply_entry(model: Model3D, entry: GeometryCache) -> None:
+    """Fill a Model row from a cache entry and mark it done."""
+    for field in CACHED_FIELDS:
+        setattr(model, field, getattr(entry, field))
+    model.bodies = [ModelBody(**body) for body in entry.bodies or []]
+    model.status = "done"
+    model.error_message = None
+
+
+async def record_hit(db: AsyncSession, entry: GeometryCache) -> None:
+    await db.execute(
+        update(GeometryCache)
+        .where(GeometryCache.sha256 == entry.sha256)
+        .values(hits=GeometryCache.hits + 1)
+    )
+    await redis_client.incr(HITS_KEY)
+    await redis_client.incrbyfloat(SAVED_SECONDS_KEY, entry.analysis_time_s or 0.0)
+
+
+async def record_miss() -> None:
+    await redis_client.incr(MISSES_KEY)
+
+
+async def get_stats() -> dict:
+    hits, misses, saved = await redis_client.mget(HITS_KEY, MISSES_KEY, SAVED_SECONDS_KEY)
+    hits = int(hits or 0)
+    misses = int(misses or 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+        "worker_seconds_saved": round(float(saved or 0.0), 3),
+    }
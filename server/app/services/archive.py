@@ -0,0 +1,121 @@
+"""
+Streaming extraction of bulk ZIP uploads.
+
+Members are read straight from the staged upload through zipfile's
+streaming reader and written to disk chunk by chunk, hashed on the way, so
+neither the archive nor any model is ever held in memory whole. Sizes, per
+member and in total, are enforced on the bytes actually inflated, not on
+the sizes the archive claims.
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+import zipfile
+from dataclasses import dataclass
+
+from app.services import mesh_sniff
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveError(ValueError):
+    """The archive can't be imported; the message is safe to show to the user."""
+
+
+@dataclass
+class ArchiveMember:
+    project_id: uuid.UUID
+    name: str          # member filename without directories or extension
+    original_name: str
+    ext: str
+    file_path: str
+    file_hash: str
+    size: int
+    estimated_faces: int | None
+
+
+def _model_members(archive: zipfile.ZipFile, allowed_extensions: set[str]):
+    """(supported, skipped count) — ignores directories and macOS/hidden metadata files."""
+    supported, skipped = [], 0
+    for info in archive.infolist():
+        base = os.path.basename(info.filename)
+        if info.is_dir() or not base or base.startswith(".") or info.filename.startswith("__MACOSX/"):
+            continue
+        ext = base.rsplit(".", 1)[-1].lower() if "." in base else ""
+        if ext in allowed_extensions:
+            supported.append((info, base, ext))
+        else:
+            skipped += 1
+    return supported, skipped
+
+
+def extract_models(fileobj, upload_dir: str, allowed_extensions: set[str],
+                   max_files: int, max_bytes: int, max_total_bytes: int) -> tuple[list[ArchiveMember], int]:
+    """
+    Write every supported model in the archive (a path or binary file object)
+    to <upload_dir>/<new project id>/model.<ext>; each member may inflate to
+    max_bytes, all of them together to max_total_bytes.
+
+    Returns the extracted members and the number of skipped (unsupported)
+    files. On error nothing is left on disk.
+    """
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise ArchiveError("Not a valid ZIP archive")
+
+    members: list[ArchiveMember] = []
+    total = 0
+    try:
+        with archive:
+            supported, skipped = _model_members(archive, allowed_extensions)
+            if not supported:
+                raise ArchiveError(f"No model files in the archive. Allowed: {', '.join(sorted(allowed_extensions))}")
+            if len(supported) > max_files:
+                raise ArchiveError(f"Too many model files: {len(supported)}. Max: {max_files}")
+
+            for info, base, ext in supported:
+                if info.file_size > max_bytes:
+                    raise ArchiveError(f"{info.filename} is too large")
+                if total + info.file_size > max_total_bytes:
+                    raise ArchiveError("Archive contents too large")
+                project_id = uuid.uuid4()
+                project_dir = os.path.join(upload_dir, str(project_id))
+                os.makedirs(project_dir)
+                file_path = os.path.join(project_dir, f"model.{ext}")
+                # Registered before writing so a failure below cleans it up too
+                member = ArchiveMember(
+                    project_id=project_id,
+                    name=base.rsplit(".", 1)[0][:255],
+                    original_name=base[:255],
+                    ext=ext,
+                    file_path=file_path,
+                    file_hash="",
+                    size=0,
+                    estimated_faces=None,
+                )
+                members.append(member)
+
+                hasher = hashlib.sha256()
+                with archive.open(info) as src, open(file_path, "wb") as dst:
+                    while chunk := src.read(CHUNK_SIZE):
+                        member.size += len(chunk)
+                        total += len(chunk)
+                        if member.size > max_bytes:
+                            raise ArchiveError(f"{info.filename} is too large")
+                        if total > max_total_bytes:
+                            raise ArchiveError("Archive contents too large")
+                        hasher.update(chunk)
+                        dst.write(chunk)
+                member.file_hash = hasher.hexdigest()
+                member.estimated_faces = mesh_sniff.estimate_file_faces(file_path, ext)
+    except (ArchiveError, zipfile.BadZipFile, OSError) as exc:
+        for member in members:
+            shutil.rmtree(os.path.dirname(member.file_path), ignore_errors=True)
+        if isinstance(exc, zipfile.BadZipFile):
+            raise ArchiveError(f"Corrupt ZIP archive: {exc}")
+        raise
+
+    return members, skipped
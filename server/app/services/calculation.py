@@ -2,21 +2,41 @@
 
 from pydantic import BaseModel
 
+from app.config import get_settings
+from app.services.nesting import Plate, nest
+
+settings = get_settings()
+
 
 class CalcInput(BaseModel):
     # From model analysis
     volume: float  # cm³
+    support_volume: float | None = None  # overhang support region, same units as volume
+    # XY-projected near-horizontal (skin) area and true area of the remaining (wall) faces, mesh
+    # units² — matching the volume's units³. None (models analyzed before wall area was measured)
+    # prices the whole volume at infill.
+    skin_area: float | None = None
+    wall_area: float | None = None
+    part_x: float | None = None  # mm, XY footprint used for plate nesting
+    part_y: float | None = None
 
     # From calc_params
+    technology: str = "FDM"
     material_density: float  # g/cm³
     material_price: float  # per kg
     waste_factor: float  # multiplier (e.g. 1.1 for 10% waste)
     infill: float  # % (0-100)
-    support_percent: float  # % (0-100)
+    support_percent: float  # % (0-100); fill of support_volume when known, else % of volume
+    wall_count: int = 2  # solid perimeters around every layer
+    wall_thickness: float = 0.4  # mm per perimeter
+    skin_layers: int = 4  # solid layers under top and over bottom surfaces
     print_time_h: float
     post_process_time_h: float
     modeling_time_h: float
     quantity: int
+    is_batch: bool = False  # nest copies onto shared build plates
+    bed_x: float = 220.0  # mm
+    bed_y: float = 220.0  # mm
     markup: float  # multiplier (e.g. 1.5 for 50% markup)
     reject_rate: float  # fraction (e.g. 0.05 for 5%)
     tax_rate: float  # fraction (e.g. 0.20 for 20%)
@@ -27,6 +47,11 @@ class CalcInput(BaseModel):
 
 class CalcOutput(BaseModel):
     weight: float
+    shell_weight: float = 0.0  # walls + skins, included in weight
+    print_time_h: float
+    batch_print_time_h: float = 0.0
+    plate_count: int = 1
+    plates: list[Plate] = []
     material_cost: float
     energy_cost: float
     depreciation: float
@@ -39,26 +64,136 @@ class CalcOutput(BaseModel):
     total_price: float
 
 
+# CalcParams.technology -> Model column holding the slicer estimate
+PRINT_TIME_FIELDS = {
+    "FDM": "print_time_fdm_h",
+    "SLA": "print_time_sla_h",
+    "Metal": "print_time_metal_h",
+}
+
+
+# Gap between nested parts on a plate, mm
+PLATE_SPACING_MM = 5.0
+
+# Share of one part's print time that a plate pays once rather than per copy:
+# SLA exposes and peels whole layers, metal recoats once per layer, FDM only
+# saves the layer change.
+PLATE_SHARED_TIME = {
+    "FDM": 0.05,
+    "SLA": 1.0,
+    "Metal": 0.5,
+}
+
+
+def resolve_print_time(params, model) -> float:
+    """Print time to price: the model's slicer estimate when enabled and available, else the manual value."""
+    if params.auto_print_time and model is not None:
+        field = PRINT_TIME_FIELDS.get(params.technology)
+        estimate = getattr(model, field, None) if field else None
+        if estimate is not None and estimate > 0:
+            return estimate
+    return params.print_time_h
+
+
+def resolve_support_volume(params, model) -> float | None:
+    """The model's measured support volume when enabled, else None (flat support_percent of volume)."""
+    if params.auto_support and model is not None:
+        return model.support_volume
+    return None
+
+
+def build_input(params, model) -> CalcInput:
+    """CalcInput from a project's CalcParams and processed Model rows."""
+    return CalcInput(
+        volume=model.volume or 0,
+        skin_area=model.skin_area,
+        wall_area=model.wall_area,
+        part_x=model.dim_x,
+        part_y=model.dim_y,
+        technology=params.technology,
+        material_density=params.material_density,
+        material_price=params.material_price,
+        waste_factor=params.waste_factor,
+        infill=params.infill,
+        support_percent=params.support_percent,
+        wall_count=params.wall_count,
+        wall_thickness=params.wall_thickness,
+        skin_layers=params.skin_layers,
+        support_volume=resolve_support_volume(params, model),
+        print_time_h=resolve_print_time(params, model),
+        post_process_time_h=params.post_process_time_h,
+        modeling_time_h=params.modeling_time_h,
+        quantity=params.quantity,
+        is_batch=params.is_batch,
+        bed_x=params.bed_x,
+        bed_y=params.bed_y,
+        markup=params.markup,
+        reject_rate=params.reject_rate,
+        tax_rate=params.tax_rate,
+        depreciation_rate=params.depreciation_rate,
+        energy_rate=params.energy_rate,
+        hourly_rate=params.hourly_rate,
+    )
+
+
+def shell_volume(inp: CalcInput) -> float:
+    """
+    Solid walls and skins of the part, same units as volume: perimeters
+    along the wall faces, skin layers of the slicing layer height over the
+    horizontal ones (projected area x vertical thickness), capped at the
+    part volume (small or thin parts print fully solid).
+    """
+    if inp.wall_area is None:
+        return 0.0
+    shell = (
+        inp.wall_area * inp.wall_count * inp.wall_thickness
+        + (inp.skin_area or 0.0) * inp.skin_layers * settings.SLICE_LAYER_HEIGHT_MM
+    )
+    return min(shell, inp.volume)
+
+
 def calculate(inp: CalcInput) -> CalcOutput:
     """Run the full price calculation and return a breakdown."""
 
-    # Effective volume = base volume * infill fraction + support volume
+    # Effective volume = solid shell + the rest at infill + support volume
     infill_frac = inp.infill / 100.0
     support_frac = inp.support_percent / 100.0
-    effective_volume = inp.volume * (infill_frac + support_frac)
+    shell = shell_volume(inp)
+    part_volume = shell + (inp.volume - shell) * infill_frac
+    if inp.support_volume is not None:
+        # Measured support region, printed at support_percent fill
+        effective_volume = part_volume + inp.support_volume * support_frac
+    else:
+        effective_volume = part_volume + inp.volume * support_frac
 
     # Weight in grams, then kg
     weight_g = effective_volume * inp.material_density
+    shell_weight_g = shell * inp.material_density
     weight_kg = weight_g / 1000.0
 
     # Material cost
     material_cost = weight_kg * inp.material_price * inp.waste_factor
 
+    # Batch nesting: copies share plates, so machine time is spread over the batch
+    print_time_h = inp.print_time_h
+    batch_print_time_h = inp.print_time_h * inp.quantity
+    plate_count = inp.quantity
+    plates = []
+    if inp.is_batch and inp.quantity > 1 and inp.part_x and inp.part_y:
+        nesting = nest(inp.part_x, inp.part_y, inp.quantity, inp.bed_x, inp.bed_y, PLATE_SPACING_MM)
+        shared = PLATE_SHARED_TIME.get(inp.technology, 0.0)
+        batch_print_time_h = sum(
+            inp.print_time_h * (shared + (1.0 - shared) * len(plate.parts)) for plate in nesting.plates
+        )
+        print_time_h = batch_print_time_h / inp.quantity
+        plate_count = nesting.plate_count
+        plates = nesting.plates
+
     # Energy cost
-    energy_cost = inp.print_time_h * inp.energy_rate
+    energy_cost = print_time_h * inp.energy_rate
 
     # Depreciation
-    depreciation = inp.print_time_h * inp.depreciation_rate
+    depreciation = print_time_h * inp.depreciation_rate
 
     # Prep cost (modeling + post-processing labor)
     prep_cost = (inp.modeling_time_h + inp.post_process_time_h) * inp.hourly_rate
@@ -86,6 +221,11 @@ def calculate(inp: CalcInput) -> CalcOutput:
 
     return CalcOutput(
         weight=round(weight_g, 2),
+        shell_weight=round(shell_weight_g, 2),
+        print_time_h=round(print_time_h, 4),
+        batch_print_time_h=round(batch_print_time_h, 4),
+        plate_count=plate_count,
+        plates=plates,
         material_cost=round(material_cost, 4),
         energy_cost=round(energy_cost, 4),
         depreciation=round(depreciation, 4),
@@ -0,0 +1,33 @@
+"""
+Shared-volume layout for files derived from an upload.
+
+Derived files are content-addressed by the SHA-256 of the uploaded file,
+so identical uploads (and analysis-cache hits) share them. Mirror of
+worker/tasks/storage.py.
+"""
+
+import os
+
+from app.config import get_settings
+
+settings = get_settings()
+
+PREVIEW_FILENAME = "preview.bin"
+THUMBNAIL_FILENAME = "thumbnail.png"
+CANONICAL_FILENAME = "canonical.stl"
+
+
+def derived_dir(file_hash: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, "derived", file_hash)
+
+
+def preview_path(file_hash: str) -> str:
+    return os.path.join(derived_dir(file_hash), PREVIEW_FILENAME)
+
+
+def thumbnail_path(file_hash: str) -> str:
+    return os.path.join(derived_dir(file_hash), THUMBNAIL_FILENAME)
+
+
+def canonical_path(file_hash: str) -> str:
+    return os.path.join(derived_dir(file_hash), CANONICAL_FILENAME)
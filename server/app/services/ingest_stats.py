@@ -0,0 +1,36 @@
+"""
+Ingest counters: uploads the worker normalized to canonical binary STL and
+the bytes that saved, per source format. Written by the worker
+(worker/tasks/ingest_stats.py) into Redis hashes shared by every process.
+"""
+
+from app.dependencies.redis import redis_client
+
+# Keep in step with worker/tasks/ingest_stats.py
+INGEST_STATS_KEY = "ingest:{format}"  # hash: files, original_bytes, canonical_bytes
+FORMATS = ("stl", "obj")  # text uploads with a canonical form
+
+
+def _summary(files: int, original: int, canonical: int) -> dict:
+    return {
+        "files": files,
+        "original_bytes": original,
+        "canonical_bytes": canonical,
+        "bytes_saved": original - canonical,
+        "ratio": round(original / canonical, 3) if canonical else 0.0,
+    }
+
+
+async def get_stats() -> dict:
+    pipe = redis_client.pipeline(transaction=False)
+    for fmt in FORMATS:
+        pipe.hgetall(INGEST_STATS_KEY.format(format=fmt))
+    rows = await pipe.execute()
+
+    formats = {}
+    totals = [0, 0, 0]
+    for fmt, fields in zip(FORMATS, rows):
+        counts = [int(fields.get(name, 0)) for name in ("files", "original_bytes", "canonical_bytes")]
+        formats[fmt] = _summary(*counts)
+        totals = [total + count for total, count in zip(totals, counts)]
+    return {"formats": formats, "total": _summary(*totals)}
@@ -0,0 +1,80 @@
+"""
+Cheap face-count estimate from an upload's header, used to route the
+processing job to the `small` or `large` worker queue.
+
+Only the first HEAD_BYTES of text formats are scanned; the count is
+extrapolated from the file size. Binary STL is exact (its header stores the
+triangle count), 3MF reads the uncompressed size of its model parts from the
+ZIP central directory without inflating anything.
+"""
+
+import os
+import struct
+import zipfile
+
+HEAD_BYTES = 256 * 1024
+
+# Rough uncompressed 3MF XML bytes per triangle, vertices included
+THREEMF_BYTES_PER_FACE = 110
+
+
+def _binary_stl_faces(head: bytes, size: int) -> int | None:
+    if size < 84 or len(head) < 84:
+        return None
+    (count,) = struct.unpack_from("<I", head, 80)
+    return count if 84 + 50 * count == size else None
+
+
+def _ascii_stl_faces(head: bytes, size: int) -> int:
+    facets = head.count(b"facet normal")
+    if not facets:
+        return 0
+    return int(facets * size / len(head))
+
+
+def _obj_faces(head: bytes, size: int) -> int:
+    if not head:
+        return 0
+    lines = head.count(b"\n") or 1
+    faces = head.count(b"\nf ")
+    vertices = head.count(b"\nv ")
+    total_lines = lines * size / len(head)
+    if faces:
+        return int(total_lines * faces / lines)
+    # Header is all vertices so far: a closed mesh has ~2 faces per vertex,
+    # i.e. ~2/3 of the element lines are faces
+    return int(total_lines * 2 / 3) if vertices else 0
+
+
+def _threemf_faces(archive_file) -> int | None:
+    try:
+        with zipfile.ZipFile(archive_file) as archive:
+            xml_bytes = sum(
+                info.file_size for info in archive.infolist() if info.filename.lower().endswith(".model")
+            )
+    except zipfile.BadZipFile:
+        return None
+    return xml_bytes // THREEMF_BYTES_PER_FACE
+
+
+def _estimate(head: bytes, size: int, ext: str, archive_file) -> int | None:
+    if ext == "stl":
+        faces = _binary_stl_faces(head, size)
+        if faces is None and head[:5].lower() == b"solid":
+            faces = _ascii_stl_faces(head, size)
+        return faces
+    if ext == "obj":
+        return _obj_faces(head, size)
+    if ext == "3mf":
+        return _threemf_faces(archive_file)
+    return None
+
+
+def estimate_file_faces(path: str, ext: str) -> int | None:
+    """
+    Estimated triangle count of an upload on disk, or None when the header
+    can't tell; reads only the head (and a 3MF's central directory).
+    """
+    with open(path, "rb") as f:
+        head = f.read(HEAD_BYTES)
+    return _estimate(head, os.path.getsize(path), ext, path)
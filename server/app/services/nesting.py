@@ -0,0 +1,96 @@
+"""Build-plate nesting of identical parts — pure, no DB dependency.
+
+Parts are nested by their XY bounding rectangle (plus spacing), optionally
+turned 90°. A plate is filled with a two-block guillotine pattern: a block of
+columns (or rows) in one orientation, the leftover strip filled in the other.
+Scanning every split point of both orientations along both axes is
+O(bed / part) and catches the mixed layouts a plain grid misses, so nesting
+hundreds of copies is a handful of integer operations plus emitting the
+placements.
+"""
+
+import math
+
+from pydantic import BaseModel
+
+
+class Placement(BaseModel):
+    x: float  # mm, lower-left corner of the part's bounding rectangle
+    y: float
+    rotated: bool  # turned 90° about Z
+
+
+class Plate(BaseModel):
+    index: int
+    parts: list[Placement]
+
+
+class NestingResult(BaseModel):
+    fits: bool  # False when a single part is larger than the bed
+    per_plate: int  # copies on a full plate
+    plate_count: int
+    plates: list[Plate]
+
+
+def _pattern(w: float, h: float, bed_x: float, bed_y: float, spacing: float):
+    """Best two-block pattern as a list of (x, y, rotated) cells."""
+    # Spacing is added to every part and once to the bed, so the gap applies between parts only
+    pw, ph = w + spacing, h + spacing
+    bx, by = bed_x + spacing, bed_y + spacing
+
+    def count(a_w, a_h, b_w, b_h, span, depth, i):
+        rest = span - i * a_w
+        return i * int(depth // a_h) + (int(rest // b_w) * int(depth // b_h) if rest > 0 else 0)
+
+    best = (0, None)
+    for along_x in (True, False):
+        span, depth = (bx, by) if along_x else (by, bx)
+        for rotated in (False, True):
+            # (size along span, size along depth); A fills the first block, B (turned) the strip
+            a = (pw, ph) if along_x else (ph, pw)
+            if rotated:
+                a = (a[1], a[0])
+            b = (a[1], a[0])
+            for i in range(int(span // a[0]) + 1):
+                n = count(a[0], a[1], b[0], b[1], span, depth, i)
+                if n > best[0]:
+                    best = (n, (along_x, rotated, i, a, b))
+    if best[1] is None:
+        return []
+
+    along_x, rotated, i, a, b = best[1]
+    span, depth = (bx, by) if along_x else (by, bx)
+    cells = []
+    for block, turned, offset, columns in (
+        (a, rotated, 0.0, i),
+        (b, not rotated, i * a[0], int((span - i * a[0]) // b[0])),
+    ):
+        for c in range(columns):
+            for r in range(int(depth // block[1])):
+                u, v = offset + c * block[0], r * block[1]
+                cells.append((u, v, turned) if along_x else (v, u, turned))
+    return cells
+
+
+def nest(part_x: float, part_y: float, quantity: int,
+         bed_x: float, bed_y: float, spacing: float = 0.0) -> NestingResult:
+    """Pack `quantity` copies of a part_x × part_y footprint onto the fewest bed_x × bed_y plates."""
+    quantity = max(quantity, 0)
+    cells = _pattern(part_x, part_y, bed_x, bed_y, spacing) if part_x > 0 and part_y > 0 else []
+    if not cells:
+        # Oversized (or unknown) footprint: one copy per plate, placed at the origin
+        return NestingResult(
+            fits=False,
+            per_plate=1,
+            plate_count=quantity,
+            plates=[Plate(index=k, parts=[Placement(x=0.0, y=0.0, rotated=False)]) for k in range(quantity)],
+        )
+
+    per_plate = len(cells)
+    plate_count = math.ceil(quantity / per_plate)
+    full = [Placement(x=round(x, 3), y=round(y, 3), rotated=r) for x, y, r in cells]
+    plates = []
+    for k in range(plate_count):
+        n = min(per_plate, quantity - k * per_plate)
+        plates.append(Plate(index=k, parts=full[:n]))
+    return NestingResult(fits=True, per_plate=per_plate, plate_count=plate_count, plates=plates)
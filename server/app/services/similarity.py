@@ -0,0 +1,171 @@
+"""
+Near-duplicate search over a user's models by shape descriptor.
+
+The worker stores a fixed-length float32 descriptor per analyzed model
+(worker/geometry/descriptor.py: D2 histogram + normalized moments, scale
+and rotation invariant). Each server process keeps one NumPy matrix of a
+user's descriptors and answers k-nearest-neighbor queries by brute force —
+one matrix-vector product and an argpartition, a few milliseconds at 100k
+models.
+
+New descriptors are appended in place: whoever stores one (the worker, or
+the server on a cache hit) pushes the project ID onto the user's "added"
+list in Redis, and the next lookup loads just those rows. Removals and
+replacements bump the user's version counter and clear the list instead,
+which makes every process rebuild the matrix from the database; so does
+the list reaching SIMILARITY_MAX_ADDED entries, which keeps it bounded.
+At most SIMILARITY_MAX_USERS indexes are kept per process, least recently
+used first out.
+"""
+
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.dependencies.redis import redis_client
+from app.models.model3d import Model as Model3D
+from app.models.project import Project
+
+settings = get_settings()
+
+# Keep in step with worker/tasks/events.py and worker/geometry/descriptor.py
+SIMILARITY_VERSION_KEY = "similarity_version:{user_id}"
+SIMILARITY_ADDED_KEY = "similarity_added:{user_id}"
+SIMILARITY_MAX_ADDED = 10_000
+DESCRIPTOR_SIZE = 35
+
+
+@dataclass
+class UserIndex:
+    version: int
+    added_seen: int  # entries of the "added" list already applied
+    project_ids: list[uuid.UUID]
+    descriptors: np.ndarray  # (n, DESCRIPTOR_SIZE) float32
+    norms: np.ndarray  # (n,) squared L2 norms
+    # Announced before their descriptor was visible (the writer hadn't committed yet)
+    pending: set[uuid.UUID] = field(default_factory=set)
+
+
+_indexes: OrderedDict[uuid.UUID, UserIndex] = OrderedDict()
+
+
+def decode(descriptor: bytes | None) -> np.ndarray | None:
+    if descriptor is None or len(descriptor) != DESCRIPTOR_SIZE * 4:
+        return None  # not analyzed yet, or written by another descriptor version
+    return np.frombuffer(descriptor, dtype=np.float32)
+
+
+async def invalidate(user_id: uuid.UUID) -> None:
+    """A descriptor was removed or replaced: every process rebuilds the user's index."""
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.incr(SIMILARITY_VERSION_KEY.format(user_id=user_id))
+        pipe.delete(SIMILARITY_ADDED_KEY.format(user_id=user_id))
+        await pipe.execute()
+
+
+async def add(user_id: uuid.UUID, project_ids: list[uuid.UUID]) -> None:
+    """These projects gained a descriptor: appended to the user's index on its next lookup."""
+    if not project_ids:
+        return
+    length = await redis_client.rpush(
+        SIMILARITY_ADDED_KEY.format(user_id=user_id), *(str(project_id) for project_id in project_ids)
+    )
+    if length >= SIMILARITY_MAX_ADDED:
+        await invalidate(user_id)
+
+
+async def _descriptor_rows(db: AsyncSession, user_id: uuid.UUID,
+                           project_ids: set[uuid.UUID] | None = None) -> list[tuple[uuid.UUID, bytes]]:
+    query = (
+        select(Model3D.project_id, Model3D.shape_descriptor)
+        .join(Project, Project.id == Model3D.project_id)
+        .where(Project.user_id == user_id, Model3D.shape_descriptor.is_not(None))
+    )
+    if project_ids is not None:
+        query = query.where(Model3D.project_id.in_(project_ids))
+    rows = (await db.execute(query)).all()
+    return [(project_id, descriptor) for project_id, descriptor in rows if len(descriptor) == DESCRIPTOR_SIZE * 4]
+
+
+def _matrix(rows: list[tuple[uuid.UUID, bytes]]) -> tuple[np.ndarray, np.ndarray]:
+    descriptors = np.frombuffer(
+        b"".join(descriptor for _, descriptor in rows), dtype=np.float32
+    ).reshape(-1, DESCRIPTOR_SIZE)
+    return descriptors, np.einsum("ij,ij->i", descriptors, descriptors)
+
+
+async def _load(db: AsyncSession, user_id: uuid.UUID, version: int, added_seen: int) -> UserIndex:
+    rows = await _descriptor_rows(db, user_id)
+    descriptors, norms = _matrix(rows)
+    return UserIndex(
+        version=version,
+        added_seen=added_seen,
+        project_ids=[project_id for project_id, _ in rows],
+        descriptors=descriptors,
+        norms=norms,
+    )
+
+
+async def _extend(db: AsyncSession, user_id: uuid.UUID, index: UserIndex, added_seen: int) -> None:
+    """Append the descriptors announced since the index was last brought up to date."""
+    if added_seen > index.added_seen:
+        added = await redis_client.lrange(
+            SIMILARITY_ADDED_KEY.format(user_id=user_id), index.added_seen, added_seen - 1
+        )
+        index.added_seen = added_seen
+        index.pending.update(uuid.UUID(project_id) for project_id in added)
+    index.pending.difference_update(index.project_ids)
+    if not index.pending:
+        return
+    rows = await _descriptor_rows(db, user_id, index.pending)
+    index.pending.difference_update(project_id for project_id, _ in rows)
+    if rows:
+        descriptors, norms = _matrix(rows)
+        index.project_ids.extend(project_id for project_id, _ in rows)
+        index.descriptors = np.concatenate([index.descriptors, descriptors])
+        index.norms = np.concatenate([index.norms, norms])
+
+
+async def get_index(db: AsyncSession, user_id: uuid.UUID) -> UserIndex:
+    """
+    The user's index: rebuilt when the version counter has moved since it
+    was loaded, extended with the descriptors added since otherwise.
+    """
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.get(SIMILARITY_VERSION_KEY.format(user_id=user_id))
+        pipe.llen(SIMILARITY_ADDED_KEY.format(user_id=user_id))
+        version, added_seen = await pipe.execute()
+    version = int(version or 0)
+
+    index = _indexes.get(user_id)
+    if index is None or index.version != version or added_seen < index.added_seen:
+        index = _indexes[user_id] = await _load(db, user_id, version, added_seen)
+    elif added_seen > index.added_seen or index.pending:
+        await _extend(db, user_id, index, added_seen)
+    _indexes.move_to_end(user_id)
+    while len(_indexes) > settings.SIMILARITY_MAX_USERS:
+        _indexes.popitem(last=False)
+    return index
+
+
+def nearest(index: UserIndex, query: np.ndarray, k: int,
+            exclude: uuid.UUID | None = None) -> list[tuple[uuid.UUID, float]]:
+    """(project_id, Euclidean distance) of the k closest descriptors, closest first."""
+    if not index.project_ids:
+        return []
+    query = query.astype(np.float32)
+    # |a - b|² = |a|² + |b|² - 2 a·b, one product over the whole matrix
+    distances = index.norms + float(query @ query) - 2.0 * (index.descriptors @ query)
+    take = min(k + 1, len(distances))  # one spare for the excluded project itself
+    candidates = np.argpartition(distances, take - 1)[:take]
+    candidates = candidates[np.argsort(distances[candidates])]
+    return [
+        (index.project_ids[i], float(np.sqrt(max(distances[i], 0.0))))
+        for i in candidates
+        if index.project_ids[i] != exclude
+    ][:k]
@@ -0,0 +1,110 @@
+"""
+Server-Sent Events stream of a model's processing status, and the
+worker's stage progress.
+
+The worker publishes on MODEL_STATUS_CHANNEL whenever it changes the Model
+row (processing, done, error, preview ready or failed). The stream
+subscribes first, then sends a snapshot of the row, then one fresh snapshot
+per message, so a change landing between the two is never missed. Each
+snapshot is one short-lived DB session; nothing is held open between
+events. Progress messages carry their own payload and are forwarded
+without a DB read.
+
+The stream ends once the model is done or failed, whatever the preview
+state. The one exception is a stream that sees the analysis finish: the
+preview task is queued right behind it, so the stream waits up to
+PREVIEW_WAIT_S for its terminal message (ready or failed). A final "end"
+event marks a stream that is over rather than cut off.
+"""
+
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncIterator
+
+from app.dependencies.redis import redis_client
+from app.models.base import async_session
+from app.models.model3d import Model as Model3D
+from app.schemas.project import ModelProgress, ModelResponse
+
+# Keep in step with worker/tasks/events.py
+MODEL_STATUS_CHANNEL = "model_status:{model_id}"
+PROGRESS_KEY = "model_progress:{model_id}"
+
+PENDING_STATUSES = ("queued", "processing")
+
+HEARTBEAT_S = 15  # comment line that keeps proxies from closing an idle stream
+STREAM_MAX_S = 900  # the browser reconnects (or falls back to polling) after this
+PREVIEW_WAIT_S = 30  # as long as the browser waits for a preview (PREVIEW_WAIT_MS)
+
+
+async def get_progress(model_id: uuid.UUID) -> ModelProgress | None:
+    """Stage and percent the worker last reported (throttled, kept in a Redis hash)."""
+    fields = await redis_client.hgetall(PROGRESS_KEY.format(model_id=model_id))
+    if not fields:
+        return None
+    return ModelProgress(stage=fields["stage"], percent=float(fields["percent"]))
+
+
+async def model_response(model: Model3D) -> ModelResponse:
+    """ModelResponse with the live progress of a pending model."""
+    response = ModelResponse.model_validate(model)
+    if model.status in PENDING_STATUSES:
+        response.progress = await get_progress(model.id)
+    return response
+
+
+async def _snapshot(model_id: uuid.UUID) -> dict | None:
+    async with async_session() as db:
+        model = await db.get(Model3D, model_id)
+        return (await model_response(model)).model_dump(mode="json") if model else None
+
+
+def _preview_settled(payload: dict) -> bool:
+    """A preview task's terminal message: the preview was written, or it failed."""
+    return bool(payload.get("preview_ready") or payload.get("preview_failed"))
+
+
+def _event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+async def model_status_events(model_id: uuid.UUID) -> AsyncIterator[str]:
+    pubsub = redis_client.pubsub()
+    await pubsub.subscribe(MODEL_STATUS_CHANNEL.format(model_id=model_id))
+    try:
+        model = await _snapshot(model_id)
+        if model is None:
+            return
+        yield _event("status", model)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STREAM_MAX_S
+        awaiting_preview = False
+        while (model["status"] in PENDING_STATUSES or awaiting_preview) and loop.time() < deadline:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=min(HEARTBEAT_S, max(deadline - loop.time(), 0.0))
+            )
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            payload = json.loads(message["data"])
+            if payload.get("type") == "progress":
+                yield _event("progress", {"stage": payload["stage"], "percent": payload["percent"]})
+                continue
+            model = await _snapshot(model_id)
+            if model is None:  # deleted or replaced by a re-upload
+                return
+            yield _event("status", model)
+            if _preview_settled(payload) or model["preview_ready"] or model["status"] != "done":
+                awaiting_preview = False
+            elif not awaiting_preview:
+                # The analysis just finished here; its preview is next in line
+                awaiting_preview = True
+                deadline = min(deadline, loop.time() + PREVIEW_WAIT_S)
+        if model["status"] not in PENDING_STATUSES:
+            # Tells the browser not to reconnect or fall back to polling
+            yield _event("end", {})
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
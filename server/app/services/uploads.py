@@ -0,0 +1,317 @@
+"""
+Streaming model uploads.
+
+The multipart request body is parsed as it arrives (python-multipart's
+streaming parser, not Starlette's form parsing, which spools the whole
+file before the endpoint runs) and the file part is copied chunk by chunk
+into a staging file under UPLOAD_DIR/incoming/ with aiofiles, hashed and
+size-checked as it goes. A declared Content-Length over the limit is
+refused before anything is read, and the copy stops at the first chunk
+past it; a request holds one chunk in memory whatever the file size and
+the event loop never blocks on disk I/O. Once the request is validated the
+staged file is moved into place with an atomic rename (same volume), so
+the worker never sees a partial file; on failure it is removed.
+
+Resumable uploads (see UploadSession) grow a file in the same directory,
+one checksummed chunk per request, and are handed to the same rename once
+complete. A request writing to a session holds a short Redis lock on it
+(SET NX with a TTL) rather than a row lock, so a slow client never pins a
+database connection; a chunk write is cut off before the lock can expire. Sessions idle past UPLOAD_SESSION_TTL_HOURS are garbage-collected
+together with any staging file that old.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import aiofiles
+import aiofiles.os
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.dependencies.redis import redis_client
+from app.models.base import async_session
+from app.models.upload_session import UploadSession
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+INCOMING_DIRNAME = "incoming"
+# Room for boundaries, part headers and small form fields on top of the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+UPLOAD_LOCK_KEY = "upload_lock:{upload_id}"
+# Outlives the longest chunk write (UPLOAD_CHUNK_TIMEOUT_S) by this much
+UPLOAD_LOCK_MARGIN_S = 30
+# Delete the lock only if it is still ours (it may have expired and been taken)
+_RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class UploadTooLarge(ValueError):
+    """The upload crossed the size limit; nothing was kept."""
+
+
+class ChecksumMismatch(ValueError):
+    """A chunk doesn't match its declared checksum; it was dropped."""
+
+
+class InvalidUpload(ValueError):
+    """The request body isn't a multipart form carrying the file field."""
+
+
+class SessionBusy(RuntimeError):
+    """Another request holds the upload session's lock."""
+
+
+@dataclass
+class StagedUpload:
+    path: str
+    size: int
+    file_hash: str
+    filename: str | None = None
+
+
+def incoming_dir() -> str:
+    return os.path.join(settings.UPLOAD_DIR, INCOMING_DIRNAME)
+
+
+class _FilePart:
+    """MultipartParser callbacks that collect the data of one file field, whatever its position."""
+
+    def __init__(self, field: str, check_filename: Callable[[str | None], object] | None):
+        self.field = field.encode()
+        self.check_filename = check_filename
+        self.found = False
+        self.filename: str | None = None
+        self.pending: list[bytes] = []  # file data parsed since the last drain
+        self._active = False
+        self._headers: dict[bytes, bytes] = {}
+        self._name = b""
+        self._value = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field,
+            "on_header_value": self._header_value,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+
+    def _header_field(self, data: bytes, start: int, end: int) -> None:
+        self._name += data[start:end]
+
+    def _header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _header_end(self) -> None:
+        self._headers[self._name.lower()] = self._value
+        self._name = self._value = b""
+
+    def _headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name") != self.field or self.found:
+            return
+        filename = options.get(b"filename")
+        self.filename = filename.decode("utf-8", "replace") if filename is not None else None
+        if self.check_filename is not None:
+            self.check_filename(self.filename)
+        self.found = self._active = True
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._active:
+            self.pending.append(data[start:end])
+
+    def _part_end(self) -> None:
+        self._active = False
+
+
+async def stage_upload(request: Request, max_bytes: int, field: str = "file",
+                       check_filename: Callable[[str | None], object] | None = None) -> StagedUpload:
+    """
+    Stream the `field` file of a multipart/form-data request into a staging
+    file, hashing as it goes. check_filename sees the part's filename before
+    any of its data and may raise to refuse it. Aborts with UploadTooLarge on
+    a declared Content-Length over max_bytes (plus form overhead), or at the
+    first chunk that takes the file or the whole body past its limit.
+    """
+    body_limit = max_bytes + MULTIPART_OVERHEAD
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > body_limit:
+        raise UploadTooLarge(int(content_length))
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise InvalidUpload("Expected a multipart/form-data upload")
+
+    part = _FilePart(field, check_filename)
+    parser = MultipartParser(options[b"boundary"], part.callbacks())
+    await aiofiles.os.makedirs(incoming_dir(), exist_ok=True)
+    path = os.path.join(incoming_dir(), f"{uuid.uuid4()}.part")
+    hasher = hashlib.sha256()
+    received = size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > body_limit:
+                    raise UploadTooLarge(received)
+                parser.write(chunk)
+                for data in part.pending:
+                    size += len(data)
+                    if size > max_bytes:
+                        raise UploadTooLarge(size)
+                    hasher.update(data)
+                    await out.write(data)
+                part.pending.clear()
+            parser.finalize()
+        if not part.found:
+            raise InvalidUpload(f"No {field} provided")
+    except FormParserError as exc:
+        await discard(path)
+        raise InvalidUpload(f"Malformed multipart upload: {exc}")
+    except BaseException:
+        await discard(path)
+        raise
+    return StagedUpload(path=path, size=size, file_hash=hasher.hexdigest(), filename=part.filename)
+
+
+async def move_into_place(staged: StagedUpload, file_path: str) -> None:
+    """Atomically publish the staged file at file_path, replacing whatever was there."""
+    await aiofiles.os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    await aiofiles.os.replace(staged.path, file_path)
+
+
+async def discard(path: str) -> None:
+    """Remove a staging file; a no-op once it has been moved into place."""
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# ---- resumable upload sessions ----
+
+def session_path(upload_id: uuid.UUID) -> str:
+    return os.path.join(incoming_dir(), f"{upload_id}.upload")
+
+
+@asynccontextmanager
+async def session_lock(upload_id: uuid.UUID):
+    """Exclusive use of an upload session across server processes; SessionBusy if taken."""
+    key = UPLOAD_LOCK_KEY.format(upload_id=upload_id)
+    token = uuid.uuid4().hex
+    ttl = settings.UPLOAD_CHUNK_TIMEOUT_S + UPLOAD_LOCK_MARGIN_S
+    if not await redis_client.set(key, token, nx=True, ex=ttl):
+        raise SessionBusy(upload_id)
+    try:
+        yield
+    finally:
+        await redis_client.eval(_RELEASE_LOCK, 1, key, token)
+
+
+async def create_session_file(upload_id: uuid.UUID) -> None:
+    await aiofiles.os.makedirs(incoming_dir(), exist_ok=True)
+    async with aiofiles.open(session_path(upload_id), "wb"):
+        pass
+
+
+async def write_chunk(path: str, offset: int, chunks: AsyncIterator[bytes], max_bytes: int,
+                      checksum: bytes | None = None) -> int:
+    """
+    Write one chunk at `offset` straight from the request stream; returns its
+    length. The file is cut back to `offset` first (bytes of an interrupted
+    request) and again when the chunk is rejected — longer than max_bytes,
+    SHA-256 not matching `checksum` — or the client goes away or takes longer
+    than UPLOAD_CHUNK_TIMEOUT_S (TimeoutError), so it always ends at the last
+    verified offset.
+    """
+    hasher = hashlib.sha256()
+    written = 0
+    async with aiofiles.open(path, "r+b") as out:
+        await out.truncate(offset)
+        await out.seek(offset)
+        try:
+            async with asyncio.timeout(settings.UPLOAD_CHUNK_TIMEOUT_S):
+                async for chunk in chunks:
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise UploadTooLarge(written)
+                    hasher.update(chunk)
+                    await out.write(chunk)
+            if checksum is not None and hasher.digest() != checksum:
+                raise ChecksumMismatch(offset)
+        except BaseException:
+            await out.truncate(offset)
+            raise
+    return written
+
+
+def file_sha256(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _remove_stale_files(cutoff: float) -> int:
+    removed = 0
+    try:
+        entries = list(os.scandir(incoming_dir()))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass  # finalized or discarded meanwhile
+    return removed
+
+
+async def collect_garbage(db: AsyncSession) -> int:
+    """
+    Drop expired sessions, and every staging file untouched for the session
+    TTL: those of expired (or deleted-project) sessions, and .part files of
+    requests that died mid-copy. Returns the number of files removed.
+    """
+    await db.execute(delete(UploadSession).where(UploadSession.expires_at < func.now()))
+    cutoff = time.time() - settings.UPLOAD_SESSION_TTL_HOURS * 3600
+    return await run_in_threadpool(_remove_stale_files, cutoff)
+
+
+async def collect_garbage_periodically() -> None:
+    """Run collect_garbage every UPLOAD_SESSION_GC_INTERVAL_S (started in the app lifespan)."""
+    while True:
+        try:
+            async with async_session() as db:
+                removed = await collect_garbage(db)
+                await db.commit()
+            if removed:
+                logger.info(f"Removed {removed} expired upload file(s)")
+        except Exception as e:
+            logger.error(f"Upload session garbage collection failed: {e}")
+        await asyncio.sleep(settings.UPLOAD_SESSION_GC_INTERVAL_S)
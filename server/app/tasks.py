@@ -3,8 +3,13 @@ Celery task producer — sends tasks to the Celery worker via Redis.
 The server doesn't run Celery itself, it just publishes messages.
 """
 
-from celery import Celery
+import time
+import uuid
+
+from celery import Celery, chord
+from celery.signals import before_task_publish
 from app.config import get_settings
+from app.dependencies.redis import redis_client
 
 settings = get_settings()
 
@@ -21,10 +26,75 @@ celery_app.conf.update(
 )
 
 
-def enqueue_process_model(model_id: str, file_path: str) -> str:
-    """Enqueue a model processing task. Returns the Celery task ID."""
+@before_task_publish.connect
+def _stamp_enqueued_at(headers=None, **kwargs):
+    """Publish time, for the worker's time-in-queue histogram (worker/tasks/metrics.py)."""
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+# Worker queues; each is consumed by its own worker pool (see worker/tasks/celery_app.py)
+QUEUE_SMALL = "small"
+QUEUE_LARGE = "large"
+
+
+def choose_queue(estimated_faces: int | None, size_bytes: int) -> str:
+    """Route by estimated face count, falling back to the upload size when the header can't tell."""
+    if estimated_faces is not None:
+        return QUEUE_LARGE if estimated_faces >= settings.LARGE_MESH_FACES else QUEUE_SMALL
+    return QUEUE_LARGE if size_bytes >= settings.LARGE_UPLOAD_MB * 1024 * 1024 else QUEUE_SMALL
+
+
+def enqueue_process_model(model_id: str, file_path: str, queue: str = QUEUE_SMALL,
+                          task_id: str | None = None) -> str:
+    """Enqueue a model processing task on `queue`, under `task_id` if given. Returns the Celery task ID."""
     result = celery_app.send_task(
         "tasks.process_model",
         args=[model_id, file_path],
+        queue=queue,
+        task_id=task_id,
     )
     return result.id
+
+
+def enqueue_preview(model_id: str, file_path: str, queue: str = QUEUE_SMALL) -> None:
+    """Queue the preview/thumbnail stage on its own, for a cache hit whose derived files are missing."""
+    celery_app.send_task("tasks.generate_preview", args=[model_id, file_path], queue=queue)
+
+
+def enqueue_batch(batch_id: str, jobs: list[tuple[str, str, str]]) -> tuple[str, list[str]]:
+    """
+    Fan (model_id, file_path, queue) jobs out as one chord whose callback
+    closes the batch. A revoked or crashed job fails the chord instead of
+    running the callback, so the errback closes the batch then. Returns the
+    callback's task ID and the job task IDs, in order.
+    """
+    task_ids = [str(uuid.uuid4()) for _ in jobs]
+    header = [
+        celery_app.signature(
+            "tasks.process_model", args=[model_id, file_path], queue=queue, task_id=task_id
+        )
+        for (model_id, file_path, queue), task_id in zip(jobs, task_ids)
+    ]
+    callback = celery_app.signature("tasks.finalize_batch", args=[batch_id], queue=QUEUE_SMALL)
+    callback.on_error(celery_app.signature("tasks.finalize_failed_batch", args=[batch_id], queue=QUEUE_SMALL))
+    result = chord(header, app=celery_app)(callback)
+    return result.id, task_ids
+
+
+# Checked by the worker at every stage boundary (worker/tasks/events.py)
+CANCEL_KEY = "model_cancel:{model_id}"
+CANCEL_TTL_S = 24 * 3600
+
+
+async def cancel_processing(model) -> None:
+    """
+    Stop the job of a model that is being replaced or deleted. Revoking drops
+    it if still queued; the Redis flag stops a running one at its next stage
+    (and covers workers that restarted and forgot the revoke).
+    """
+    if model.status not in ("queued", "processing"):
+        return
+    await redis_client.set(CANCEL_KEY.format(model_id=model.id), 1, ex=CANCEL_TTL_S)
+    if model.task_id:
+        celery_app.control.revoke(model.task_id)
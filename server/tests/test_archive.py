@@ -0,0 +1,68 @@
+import os
+import zipfile
+
+import pytest
+
+from app.services.archive import ArchiveError, extract_models
+
+ALLOWED = {"stl", "obj", "3mf"}
+MB = 1024 * 1024
+
+
+def _zip(path, files: dict[str, bytes]) -> str:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return str(path)
+
+
+def _extract(archive, upload_dir, max_files=10, max_bytes=MB, max_total_bytes=10 * MB):
+    return extract_models(archive, str(upload_dir), ALLOWED, max_files, max_bytes, max_total_bytes)
+
+
+def test_extracts_supported_members_and_skips_the_rest(tmp_path):
+    archive = _zip(tmp_path / "a.zip", {
+        "parts/bracket.STL": b"solid x\nendsolid x\n",
+        "lid.obj": b"v 0 0 0\n",
+        "readme.txt": b"hello",
+        "__MACOSX/._lid.obj": b"junk",
+        ".hidden.stl": b"junk",
+    })
+    members, skipped = _extract(archive, tmp_path / "uploads")
+
+    assert skipped == 1
+    assert sorted((m.name, m.ext) for m in members) == [("bracket", "stl"), ("lid", "obj")]
+    for member in members:
+        with open(member.file_path, "rb") as f:
+            assert len(f.read()) == member.size
+        assert len(member.file_hash) == 64
+
+
+def test_rejects_too_many_members(tmp_path):
+    archive = _zip(tmp_path / "a.zip", {f"p{i}.stl": b"x" for i in range(3)})
+    with pytest.raises(ArchiveError, match="Too many"):
+        _extract(archive, tmp_path / "uploads", max_files=2)
+
+
+def test_rejects_a_member_over_the_per_file_limit(tmp_path):
+    archive = _zip(tmp_path / "a.zip", {"big.stl": b"\0" * 2048})
+    with pytest.raises(ArchiveError, match="too large"):
+        _extract(archive, tmp_path / "uploads", max_bytes=1024)
+
+
+def test_total_inflated_limit_cleans_up_extracted_members(tmp_path):
+    upload_dir = tmp_path / "uploads"
+    # Each member fits, together they don't: highly compressible, like a zip bomb
+    archive = _zip(tmp_path / "a.zip", {f"p{i}.stl": b"\0" * 600 for i in range(3)})
+    with pytest.raises(ArchiveError, match="contents too large"):
+        _extract(archive, upload_dir, max_bytes=1024, max_total_bytes=1500)
+    assert not os.listdir(upload_dir)
+
+
+def test_rejects_archives_without_models_and_non_zip_files(tmp_path):
+    with pytest.raises(ArchiveError, match="No model files"):
+        _extract(_zip(tmp_path / "a.zip", {"notes.txt": b"x"}), tmp_path / "uploads")
+    not_zip = tmp_path / "b.zip"
+    not_zip.write_bytes(b"not a zip")
+    with pytest.raises(ArchiveError, match="Not a valid ZIP"):
+        _extract(str(not_zip), tmp_path / "uploads")
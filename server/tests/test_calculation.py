@@ -0,0 +1,71 @@
+import pytest
+
+from app.config import get_settings
+from app.services.calculation import CalcInput, calculate, shell_volume
+
+settings = get_settings()
+
+
+def make_input(**overrides) -> CalcInput:
+    fields = dict(
+        volume=1000.0,
+        material_density=1.0,
+        material_price=20.0,
+        waste_factor=1.0,
+        infill=20.0,
+        support_percent=0.0,
+        print_time_h=2.0,
+        post_process_time_h=0.0,
+        modeling_time_h=0.0,
+        quantity=1,
+        markup=1.0,
+        reject_rate=0.0,
+        tax_rate=0.0,
+        depreciation_rate=0.0,
+        energy_rate=0.0,
+        hourly_rate=0.0,
+    )
+    fields.update(overrides)
+    return CalcInput(**fields)
+
+
+def test_shell_volume_without_wall_area_is_zero():
+    assert shell_volume(make_input(skin_area=100.0)) == 0.0
+
+
+def test_shell_volume_sums_walls_and_skins():
+    inp = make_input(wall_area=100.0, skin_area=50.0, wall_count=2, wall_thickness=0.4, skin_layers=4)
+    expected = 100.0 * 2 * 0.4 + 50.0 * 4 * settings.SLICE_LAYER_HEIGHT_MM
+    assert shell_volume(inp) == pytest.approx(expected)
+
+
+def test_shell_volume_is_capped_at_part_volume():
+    assert shell_volume(make_input(volume=10.0, wall_area=1000.0, skin_area=1000.0)) == 10.0
+
+
+def test_calculate_prices_shell_solid_and_core_at_infill():
+    inp = make_input(wall_area=100.0, skin_area=50.0)
+    shell = shell_volume(inp)
+    out = calculate(inp)
+    weight = shell + (inp.volume - shell) * 0.2
+    assert out.shell_weight == pytest.approx(shell, abs=0.01)
+    assert out.weight == pytest.approx(weight, abs=0.01)
+    assert out.material_cost == pytest.approx(weight / 1000 * inp.material_price, abs=1e-4)
+
+
+def test_calculate_uses_measured_support_volume():
+    flat = calculate(make_input(support_percent=50.0))
+    measured = calculate(make_input(support_percent=50.0, support_volume=100.0))
+    assert flat.weight == pytest.approx(200.0 + 500.0)
+    assert measured.weight == pytest.approx(200.0 + 50.0)
+
+
+def test_calculate_applies_reject_markup_and_tax():
+    out = calculate(make_input(
+        hourly_rate=10.0, modeling_time_h=1.0, reject_rate=0.1, markup=1.5, tax_rate=0.2, quantity=3,
+    ))
+    base = out.material_cost + 10.0
+    assert out.unit_cost == pytest.approx(base * 1.1, abs=1e-3)
+    assert out.price_per_unit == pytest.approx(base * 1.1 * 1.5 * 1.2, abs=1e-3)
+    assert out.total_price == pytest.approx(out.price_per_unit * 3, abs=1e-3)
+
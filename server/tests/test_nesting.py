@@ -0,0 +1,77 @@
+import pytest
+
+from app.services.calculation import calculate
+from app.services.nesting import nest
+from tests.test_calculation import make_input
+
+
+def _footprints(result, part_x, part_y):
+    for plate in result.plates:
+        yield [
+            (p.x, p.y, p.x + (part_y if p.rotated else part_x), p.y + (part_x if p.rotated else part_y))
+            for p in plate.parts
+        ]
+
+
+def _assert_valid(result, part_x, part_y, bed_x, bed_y, spacing):
+    for rects in _footprints(result, part_x, part_y):
+        for x0, y0, x1, y1 in rects:
+            assert x0 >= 0 and y0 >= 0 and x1 <= bed_x + 1e-6 and y1 <= bed_y + 1e-6
+        for i, a in enumerate(rects):
+            for b in rects[i + 1:]:
+                apart_x = a[2] + spacing <= b[0] + 1e-6 or b[2] + spacing <= a[0] + 1e-6
+                apart_y = a[3] + spacing <= b[1] + 1e-6 or b[3] + spacing <= a[1] + 1e-6
+                assert apart_x or apart_y
+
+
+def test_grid_fills_plates_and_splits_remainder():
+    result = nest(50, 50, 20, 220, 220)
+    assert result.fits and result.per_plate == 16
+    assert result.plate_count == 2
+    assert [len(p.parts) for p in result.plates] == [16, 4]
+    _assert_valid(result, 50, 50, 220, 220, 0)
+
+
+def test_mixed_orientation_beats_plain_grid():
+    # A 40 x 30 part fits 6 to a 100 x 100 bed either way round; one column
+    # upright plus the strip turned fits 7
+    result = nest(40, 30, 7, 100, 100)
+    assert result.per_plate == 7 and result.plate_count == 1
+    assert {p.rotated for p in result.plates[0].parts} == {False, True}
+    _assert_valid(result, 40, 30, 100, 100, 0)
+
+
+def test_spacing_applies_between_parts_only():
+    assert nest(50, 50, 1, 105, 105, spacing=5).per_plate == 4
+    result = nest(50, 50, 4, 104, 104, spacing=5)
+    assert result.per_plate == 1 and result.plate_count == 4
+    _assert_valid(nest(30, 20, 50, 220, 180, spacing=5), 30, 20, 220, 180, 5)
+
+
+def test_part_turned_to_fit_bed():
+    result = nest(300, 100, 2, 220, 320)
+    assert result.fits and result.per_plate == 2 and result.plate_count == 1
+    assert all(p.rotated for p in result.plates[0].parts)
+    _assert_valid(result, 300, 100, 220, 320, 0)
+
+
+@pytest.mark.parametrize("part", [(300, 300), (0, 50)])
+def test_oversized_or_unknown_footprint_one_per_plate(part):
+    result = nest(*part, 3, 220, 220)
+    assert not result.fits
+    assert result.per_plate == 1 and result.plate_count == 3
+
+
+def test_zero_quantity_needs_no_plates():
+    assert nest(50, 50, 0, 220, 220).plate_count == 0
+
+
+def test_calculate_batch_shares_plate_time():
+    single = calculate(make_input(quantity=4, part_x=50.0, part_y=50.0))
+    batch = calculate(make_input(quantity=4, part_x=50.0, part_y=50.0, is_batch=True, technology="SLA"))
+    assert single.plate_count == 4
+    assert single.batch_print_time_h == pytest.approx(8.0)
+    # SLA pays a plate's time once, and four 50 mm parts fit one 220 mm bed
+    assert batch.plate_count == 1
+    assert batch.batch_print_time_h == pytest.approx(2.0)
+    assert batch.print_time_h == pytest.approx(0.5)
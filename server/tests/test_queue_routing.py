@@ -0,0 +1,17 @@
+from app.config import get_settings
+from app.tasks import QUEUE_LARGE, QUEUE_SMALL, choose_queue
+
+settings = get_settings()
+MB = 1024 * 1024
+
+
+def test_face_estimate_decides_when_known():
+    assert choose_queue(settings.LARGE_MESH_FACES, 1) == QUEUE_LARGE
+    assert choose_queue(settings.LARGE_MESH_FACES - 1, 1) == QUEUE_SMALL
+    # A small mesh in a bloated file (ASCII STL) still goes to the small queue
+    assert choose_queue(1_000, settings.LARGE_UPLOAD_MB * MB * 10) == QUEUE_SMALL
+
+
+def test_file_size_decides_without_face_estimate():
+    assert choose_queue(None, settings.LARGE_UPLOAD_MB * MB) == QUEUE_LARGE
+    assert choose_queue(None, settings.LARGE_UPLOAD_MB * MB - 1) == QUEUE_SMALL
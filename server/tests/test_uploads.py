@@ -0,0 +1,86 @@
+import asyncio
+import base64
+import hashlib
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers.models import _chunk_checksum
+from app.services import uploads
+
+
+class FakeRedis:
+    """SET NX and the compare-and-delete script, enough for session_lock."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_chunk_checksum_parses_sha256_header():
+    digest = hashlib.sha256(b"chunk").digest()
+    assert _chunk_checksum(None) is None
+    assert _chunk_checksum("sha256 " + base64.b64encode(digest).decode()) == digest
+    assert _chunk_checksum("SHA256 " + base64.b64encode(digest).decode()) == digest
+
+
+@pytest.mark.parametrize("header", [
+    "md5 " + base64.b64encode(hashlib.md5(b"chunk").digest()).decode(),
+    "sha256 not-base64!",
+    "sha256 " + base64.b64encode(b"too short").decode(),
+    "sha256",
+])
+def test_chunk_checksum_rejects_malformed_headers(header):
+    with pytest.raises(HTTPException) as exc:
+        _chunk_checksum(header)
+    assert exc.value.status_code == 400
+
+
+def test_write_chunk_keeps_verified_bytes_only(tmp_path):
+    path = tmp_path / "session.upload"
+    path.write_bytes(b"")
+
+    async def run():
+        assert await uploads.write_chunk(str(path), 0, _stream(b"abc", b"de"), 10) == 5
+        # Rejected chunks (too long, bad checksum) leave the file at their offset
+        with pytest.raises(uploads.UploadTooLarge):
+            await uploads.write_chunk(str(path), 5, _stream(b"x" * 4), 3)
+        with pytest.raises(uploads.ChecksumMismatch):
+            await uploads.write_chunk(str(path), 5, _stream(b"fgh"), 10, hashlib.sha256(b"xyz").digest())
+        # A retried chunk overwrites the tail of an interrupted one
+        await uploads.write_chunk(str(path), 5, _stream(b"fgh"), 10, hashlib.sha256(b"fgh").digest())
+
+    asyncio.run(run())
+    assert path.read_bytes() == b"abcdefgh"
+
+
+def test_session_lock_is_exclusive_and_released(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(uploads, "redis_client", redis)
+    upload_id = uuid.uuid4()
+
+    async def run():
+        async with uploads.session_lock(upload_id):
+            with pytest.raises(uploads.SessionBusy):
+                async with uploads.session_lock(upload_id):
+                    pass
+        assert not redis.values
+        async with uploads.session_lock(upload_id):
+            pass
+
+    asyncio.run(run())
@@ -0,0 +1,59 @@
+"""
+Parallel reduction check: chunked process-pool reduce vs one core on a UV sphere.
+
+    cd worker && python -m benchmarks.bench_parallel --faces 1000000 --max-seconds 5
+
+Each call reuses the process's long-lived pool (geometry.parallel), so after
+the first (cold) call a reduction costs the work plus a little IPC. Exits
+non-zero when a warm parallel call takes longer than --max-seconds or the
+results differ from the single-threaded reduction.
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_slicer import uv_sphere
+from geometry import parallel
+from geometry.source import TriangleSource
+from geometry.stats import reduce_source
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--faces", type=int, default=1_000_000)
+    parser.add_argument("--chunk-faces", type=int, default=250_000)
+    parser.add_argument("--processes", type=int, default=0, help="0 = cpu_count")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    vertices, faces = uv_sphere(args.faces)
+    with tempfile.TemporaryDirectory(prefix="bench-parallel-") as tmp:
+        source = TriangleSource.from_arrays(vertices, faces, tmp)
+
+        started = time.perf_counter()
+        expected = reduce_source(source)
+        single_s = time.perf_counter() - started
+
+        runs = []
+        for _ in range(args.repeat + 1):  # the first call also starts the pool
+            started = time.perf_counter()
+            stats, _ = parallel.parallel_reduce(
+                source, processes=args.processes or None, chunk_faces=args.chunk_faces
+            )
+            runs.append(time.perf_counter() - started)
+        parallel.shutdown()
+
+    cold_s, warm_s = runs[0], min(runs[1:])
+    print(f"faces {source.faces}: single {single_s:.3f} s, parallel cold {cold_s:.3f} s, warm {warm_s:.3f} s")
+    if not np.isclose(stats.volume, expected.volume, rtol=1e-9) or not np.isclose(stats.area, expected.area, rtol=1e-9):
+        raise SystemExit(f"parallel result differs: volume {stats.volume} vs {expected.volume}")
+    if warm_s > args.max_seconds:
+        raise SystemExit(f"parallel reduce took {warm_s:.1f} s > {args.max_seconds} s")
+
+
+if __name__ == "__main__":
+    main()
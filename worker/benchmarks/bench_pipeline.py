@@ -0,0 +1,355 @@
+"""
+Pipeline benchmark: process_model stage by stage on synthetic meshes, with the DB write stubbed out.
+
+    cd worker && python -m benchmarks.bench_pipeline --output before.json
+    cd worker && python -m benchmarks.bench_pipeline --output after.json --baseline before.json
+    cd worker && python -m benchmarks.bench_pipeline --faces 1000000,10000000 --formats stl
+
+Every case is a UV sphere (geometry is deterministic, the broken variant
+drops a seeded 1% of its faces) written as binary STL, ASCII STL, OBJ or
+3MF, then run cold through the worker's own code: ingest
+(mesh_io.write_canonical), analyze_file with its progress stages, the
+values process_model would write (nothing is written), and the preview /
+thumbnail stage. Derived files go to a throwaway UPLOAD_DIR per run, so
+no artifact or canonical STL carries over.
+
+Each stage records wall time, CPU time (this process plus reaped pool
+workers) and peak RSS. The peak is per stage where Linux allows resetting
+it (/proc/self/clear_refs), else the process peak so far. With --repeat,
+every stage keeps its fastest run and its highest peak.
+
+The JSON written by --output carries the environment next to the results;
+--baseline compares a run with an earlier file case by case. No network,
+Redis or database is needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.bench_slicer import uv_sphere
+from benchmarks.bench_text_parse import float_columns, int_columns, text_rows, write_ascii_stl, write_obj
+from geometry import preview, stl, thumbnail
+from geometry.stats import reduce_source
+from tasks import storage
+from tasks.events import Progress
+from tasks.mesh_io import open_source, write_canonical
+from tasks.preview import PREVIEW_FACE_BUDGET, THUMBNAIL_SIZE
+from tasks.process_model import BODY_FIELDS, _db_values, analyze_file
+
+FORMATS = ("stl", "stl-ascii", "obj", "3mf")
+VARIANTS = ("watertight", "broken")
+BROKEN_FRACTION = 0.01
+SEED = 20261017
+SCHEMA_VERSION = 1
+
+
+def write_3mf(path: str, vertices: np.ndarray, faces: np.ndarray) -> None:
+    """Single-object 3MF package (core spec, millimeters)."""
+    model = b"".join([
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<model unit="millimeter" xml:lang="en-US" '
+        b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+        b'<resources><object id="1" type="model"><mesh><vertices>\n',
+        text_rows(
+            b'<vertex x="', float_columns(vertices[:, 0]), b'" y="', float_columns(vertices[:, 1]),
+            b'" z="', float_columns(vertices[:, 2]), b'"/>\n',
+        ).tobytes(),
+        b"</vertices><triangles>\n",
+        text_rows(
+            b'<triangle v1="', int_columns(faces[:, 0], 9), b'" v2="', int_columns(faces[:, 1], 9),
+            b'" v3="', int_columns(faces[:, 2], 9), b'"/>\n',
+        ).tobytes(),
+        b'</triangles></mesh></object></resources>\n<build><item objectid="1"/></build>\n</model>\n',
+    ])
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+            "</Types>"
+        ))
+        package.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+            'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+            "</Relationships>"
+        ))
+        package.writestr("3D/3dmodel.model", model)
+
+
+WRITERS = {
+    "stl": ("stl", lambda path, vertices, faces: stl.write_binary_stl(path, vertices, faces)),
+    "stl-ascii": ("stl", write_ascii_stl),
+    "obj": ("obj", write_obj),
+    "3mf": ("3mf", write_3mf),
+}
+
+
+def synthetic_mesh(faces: int, variant: str) -> tuple[np.ndarray, np.ndarray]:
+    vertices, tris = uv_sphere(faces)
+    if variant == "broken":
+        # Holes for the repair / ray-volume path; same faces dropped on every run
+        keep = np.random.default_rng(SEED).random(len(tris)) >= BROKEN_FRACTION
+        tris = tris[keep]
+    return vertices, tris
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _cpu_s() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+class StageRecorder(Progress):
+    """
+    A Progress that measures stages instead of reporting them: every
+    stage() closes the previous measurement and opens the next, and
+    measure() wraps the steps analyze_file doesn't announce.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+        self.stages: dict[str, dict] = {}
+        self._open = None
+
+    def stage(self, name: str) -> None:
+        self.close()
+        super().stage(name)
+        self._start(name)
+
+    @contextmanager
+    def measure(self, name: str):
+        self.close()
+        self._start(name)
+        try:
+            yield
+        finally:
+            self.close()
+
+    def _start(self, name: str) -> None:
+        _reset_peak_rss()
+        self._open = (name, time.perf_counter(), _cpu_s())
+
+    def close(self) -> None:
+        if self._open is None:
+            return
+        name, wall, cpu = self._open
+        self._open = None
+        self.stages[name] = {
+            "wall_s": round(time.perf_counter() - wall, 6),
+            "cpu_s": round(_cpu_s() - cpu, 6),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        }
+
+
+def run_pipeline(path: str) -> tuple[dict, dict]:
+    """Stage timings and the stored analysis of one cold process_model + generate_preview run."""
+    recorder = StageRecorder()
+    with recorder.measure("hash"):
+        file_hash = storage.file_sha256(path)
+    with recorder.measure("ingest"):
+        write_canonical(path, file_hash)
+
+    analysis = analyze_file(path, recorder, file_hash)
+    recorder.close()
+
+    with recorder.measure("persist"):
+        # What process_model would write; the session itself is stubbed out
+        values = _db_values(analysis)
+        bodies = [_db_values(body, BODY_FIELDS) for body in analysis["bodies"]]
+
+    with recorder.measure("preview"):
+        source = open_source(path, file_hash)
+        stats = reduce_source(source)
+        vertices, faces = preview.decimate(source, stats.bounds_min, stats.bounds_max, stats.area, PREVIEW_FACE_BUDGET)
+        preview.encode(vertices, faces, stats.bounds_min, stats.bounds_max)
+    with recorder.measure("thumbnail"):
+        image = thumbnail.render([vertices[faces]], stats.bounds_min, stats.bounds_max, THUMBNAIL_SIZE)
+        thumbnail.encode_png(image)
+
+    summary = {
+        field: values[field]
+        for field in ("polygons", "volume", "surface_area", "mesh_quality", "body_count", "support_volume")
+    }
+    summary["stored_bodies"] = len(bodies)
+    return recorder.stages, summary
+
+
+def _merge_repeat(best: dict | None, stages: dict) -> dict:
+    if best is None:
+        return stages
+    return {
+        name: {
+            "wall_s": min(best[name]["wall_s"], sample["wall_s"]),
+            "cpu_s": min(best[name]["cpu_s"], sample["cpu_s"]),
+            "peak_rss_mb": max(best[name]["peak_rss_mb"], sample["peak_rss_mb"]),
+        }
+        for name, sample in stages.items()
+    }
+
+
+def run_case(workdir: str, fmt: str, variant: str, target_faces: int, repeat: int) -> dict:
+    ext, write = WRITERS[fmt]
+    vertices, faces = synthetic_mesh(target_faces, variant)
+    path = os.path.join(workdir, f"model.{ext}")
+    write(path, vertices, faces)
+    case = {
+        "case": f"{fmt}/{variant}/{target_faces}",
+        "format": fmt,
+        "variant": variant,
+        "target_faces": target_faces,
+        "faces": int(len(faces)),
+        "file_bytes": os.path.getsize(path),
+    }
+
+    best = None
+    try:
+        for _ in range(repeat):
+            storage.UPLOAD_DIR = os.path.join(workdir, "uploads")
+            shutil.rmtree(storage.UPLOAD_DIR, ignore_errors=True)
+            stages, case["analysis"] = run_pipeline(path)
+            best = _merge_repeat(best, stages)
+    except Exception as exc:
+        # A missing optional loader (e.g. lxml for 3MF) fails one case, not the run
+        case["error"] = f"{type(exc).__name__}: {exc}"
+        return case
+    finally:
+        os.remove(path)
+
+    case["stages"] = best
+    case["total"] = {
+        "wall_s": round(sum(s["wall_s"] for s in best.values()), 6),
+        "cpu_s": round(sum(s["cpu_s"] for s in best.values()), 6),
+        "peak_rss_mb": max(s["peak_rss_mb"] for s in best.values()),
+    }
+    return case
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    knobs = ("PARALLEL_FACE_THRESHOLD", "PARALLEL_PROCESSES", "ORIENT_ENABLED", "FAST_TEXT_PARSER", "CANONICAL_STL")
+    return {
+        "schema": SCHEMA_VERSION,
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "per_stage_peak_rss": _reset_peak_rss(),
+        "env": {name: os.environ[name] for name in knobs if name in os.environ},
+    }
+
+
+def print_table(cases: list[dict]) -> None:
+    print(f"{'case':<32} {'faces':>9} {'MB':>8} {'wall s':>9} {'cpu s':>9} {'peak MB':>8}  slowest stage")
+    for case in cases:
+        if "error" in case:
+            print(f"{case['case']:<32} {case['faces']:>9} {case['file_bytes'] / 1e6:>8.1f}  error: {case['error']}")
+            continue
+        total = case["total"]
+        slowest = max(case["stages"].items(), key=lambda item: item[1]["wall_s"])
+        print(
+            f"{case['case']:<32} {case['faces']:>9} {case['file_bytes'] / 1e6:>8.1f} "
+            f"{total['wall_s']:>9.3f} {total['cpu_s']:>9.3f} {total['peak_rss_mb']:>8.1f}  "
+            f"{slowest[0]} {slowest[1]['wall_s']:.3f} s"
+        )
+
+
+def print_comparison(cases: list[dict], baseline: dict) -> None:
+    """Wall-time ratio (this run / baseline) per case and stage; < 1 is faster."""
+    before = {case["case"]: case for case in baseline["cases"] if "stages" in case}
+    print(f"\ncompared with {baseline['environment'].get('git')} ({baseline['environment'].get('started_at')})")
+    for case in cases:
+        old = before.get(case["case"])
+        if old is None or "stages" not in case:
+            continue
+        ratios = [
+            f"{name} {sample['wall_s'] / old['stages'][name]['wall_s']:.2f}x"
+            for name, sample in case["stages"].items()
+            if old["stages"].get(name, {}).get("wall_s")
+        ]
+        total = case["total"]["wall_s"] / old["total"]["wall_s"] if old["total"]["wall_s"] else float("nan")
+        print(f"{case['case']:<32} total {total:.2f}x  " + "  ".join(ratios))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--faces", default="1000,10000,100000", help="comma-separated face counts (up to 10000000)")
+    parser.add_argument("--formats", default=",".join(FORMATS), help=f"comma-separated subset of {', '.join(FORMATS)}")
+    parser.add_argument("--variants", default=",".join(VARIANTS), help=f"comma-separated subset of {', '.join(VARIANTS)}")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    formats = args.formats.split(",")
+    variants = args.variants.split(",")
+    unknown = (set(formats) - set(FORMATS)) | (set(variants) - set(VARIANTS))
+    if unknown:
+        parser.error(f"unknown format or variant: {', '.join(sorted(unknown))}")
+
+    cases = []
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as workdir:
+        for target in (int(n) for n in args.faces.split(",")):
+            for fmt in formats:
+                for variant in variants:
+                    cases.append(run_case(workdir, fmt, variant, target, args.repeat))
+                    print(f"done {cases[-1]['case']}", file=sys.stderr)
+
+    print_table(cases)
+    result = {"environment": environment(), "repeat": args.repeat, "cases": cases}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            print_comparison(cases, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
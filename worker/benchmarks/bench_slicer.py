@@ -0,0 +1,68 @@
+"""
+Slicer benchmark: UV sphere of ~N faces sliced at 0.2 mm on one core.
+
+    cd worker && python -m benchmarks.bench_slicer --faces 1000000
+"""
+
+import argparse
+import math
+import tempfile
+import time
+
+import numpy as np
+
+from geometry import slicer
+from geometry.source import TriangleSource
+
+
+def uv_sphere(faces: int, radius: float = 50.0) -> tuple[np.ndarray, np.ndarray]:
+    """Closed UV sphere with roughly `faces` triangles (2 * rings * segments)."""
+    rings = max(3, int(math.sqrt(faces / 4)))
+    segments = 2 * rings
+    theta = np.linspace(0, np.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    body = np.stack([np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)], axis=-1).reshape(-1, 3)
+    vertices = np.vstack([[0, 0, 1], body, [0, 0, -1]]) * radius
+
+    top, bottom = 0, len(vertices) - 1
+    ring = lambda r: 1 + r * segments + np.arange(segments)  # noqa: E731
+    nxt = lambda idx: np.roll(idx, -1)  # noqa: E731
+    faces_out = [np.stack([np.full(segments, top), ring(0), nxt(ring(0))], axis=1)]
+    for r in range(rings - 2):
+        a, b = ring(r), ring(r + 1)
+        faces_out.append(np.stack([a, b, nxt(b)], axis=1))
+        faces_out.append(np.stack([a, nxt(b), nxt(a)], axis=1))
+    last = ring(rings - 2)
+    faces_out.append(np.stack([np.full(segments, bottom), nxt(last), last], axis=1))
+    return vertices, np.vstack(faces_out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--faces", type=int, default=1_000_000)
+    parser.add_argument("--layer-height", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    vertices, faces = uv_sphere(args.faces)
+    with tempfile.TemporaryDirectory(prefix="bench-slicer-") as tmp:
+        source = TriangleSource.from_arrays(vertices, faces, tmp)
+        z_min, z_max = float(vertices[:, 2].min()), float(vertices[:, 2].max())
+
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            layers = slicer.slice_source(source, z_min, z_max, args.layer_height)
+            timings.append(time.perf_counter() - started)
+
+    volume = float((layers.area * layers.layer_height).sum())
+    print(f"faces={source.faces} layers={layers.layers} layer_height={args.layer_height}")
+    print(f"slice best={min(timings):.3f}s mean={sum(timings) / len(timings):.3f}s")
+    print(f"sliced volume={volume:.1f} mm³ (sphere {4 / 3 * math.pi * 50.0 ** 3:.1f})")
+    for tech, hours in slicer.estimate_print_hours(layers).items():
+        print(f"  {tech:<5} {hours:.2f} h")
+
+
+if __name__ == "__main__":
+    main()
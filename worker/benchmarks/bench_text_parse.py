@@ -0,0 +1,127 @@
+"""
+Text-format benchmark: vectorized ASCII STL / OBJ parser vs trimesh on UV spheres.
+
+    cd worker && python -m benchmarks.bench_text_parse --faces 10000,100000,1000000,10000000
+
+Files are written with fixed-width numbers straight from NumPy, so even the
+10M-face ones take seconds to generate. trimesh is skipped above
+--trimesh-max faces, where it takes minutes and tens of GB.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import trimesh
+
+from benchmarks.bench_slicer import uv_sphere
+from geometry import ascii_mesh
+from tasks.mesh_io import load_bodies
+
+
+def text_rows(*columns) -> np.ndarray:
+    """Row-wise concatenation of byte-string literals and (n, w) uint8 columns."""
+    rows = max(len(c) for c in columns if isinstance(c, np.ndarray))
+    parts = [
+        c if isinstance(c, np.ndarray) else np.broadcast_to(np.frombuffer(c, dtype=np.uint8), (rows, len(c)))
+        for c in columns
+    ]
+    return np.concatenate(parts, axis=1)
+
+
+def int_columns(values: np.ndarray, width: int) -> np.ndarray:
+    """Non-negative integers as right-aligned, space-padded (n, width) ASCII."""
+    out = np.full((len(values), width), ord(" "), dtype=np.uint8)
+    rest = values.astype(np.int64)
+    for col in range(width - 1, -1, -1):
+        show = (rest > 0) | (col == width - 1)
+        out[show, col] = ord("0") + rest[show] % 10
+        rest //= 10
+    return out
+
+
+def float_columns(values: np.ndarray) -> np.ndarray:
+    """Floats as fixed-width, space-padded '-123.456789' (n, 12) ASCII."""
+    scaled = np.rint(np.abs(values) * 1e6).astype(np.int64)
+    whole = int_columns(scaled // 1_000_000, 5)
+    frac = int_columns(scaled % 1_000_000 + 1_000_000, 7)[:, 1:]  # zero-padded
+    negative = np.flatnonzero(values < 0)
+    sign_col = np.argmax(whole[negative] != ord(" "), axis=1) - 1
+    whole[negative, sign_col] = ord("-")
+    return text_rows(whole, b".", frac)
+
+
+def xyz_columns(points: np.ndarray) -> np.ndarray:
+    return text_rows(float_columns(points[:, 0]), b" ", float_columns(points[:, 1]), b" ", float_columns(points[:, 2]))
+
+
+def write_ascii_stl(path: str, vertices: np.ndarray, faces: np.ndarray) -> None:
+    tri = vertices[faces]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    body = text_rows(
+        b"  facet normal ", xyz_columns(normals), b"\n    outer loop\n",
+        b"      vertex ", xyz_columns(tri[:, 0]), b"\n",
+        b"      vertex ", xyz_columns(tri[:, 1]), b"\n",
+        b"      vertex ", xyz_columns(tri[:, 2]), b"\n",
+        b"    endloop\n  endfacet\n",
+    )
+    with open(path, "wb") as f:
+        f.write(b"solid sphere\n")
+        f.write(body.tobytes())
+        f.write(b"endsolid sphere\n")
+
+
+def write_obj(path: str, vertices: np.ndarray, faces: np.ndarray) -> None:
+    with open(path, "wb") as f:
+        f.write(text_rows(b"v ", xyz_columns(vertices), b"\n").tobytes())
+        one_based = faces + 1
+        f.write(text_rows(
+            b"f ", int_columns(one_based[:, 0], 9), b" ", int_columns(one_based[:, 1], 9), b" ",
+            int_columns(one_based[:, 2], 9), b"\n",
+        ).tobytes())
+
+
+def _time(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--faces", default="10000,100000,1000000", help="comma-separated face counts")
+    parser.add_argument("--trimesh-max", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'format':<6} {'faces':>10} {'MB':>8} {'numpy s':>9} {'trimesh s':>10} {'speedup':>8}")
+    for target in (int(n) for n in args.faces.split(",")):
+        vertices, faces = uv_sphere(target)
+        with tempfile.TemporaryDirectory(prefix="bench-text-") as tmp:
+            for ext, write in (("stl", write_ascii_stl), ("obj", write_obj)):
+                path = os.path.join(tmp, f"sphere.{ext}")
+                write(path, vertices, faces)
+                fast_s, bodies = _time(lambda: ascii_mesh.parse(path), args.repeat)
+                _, body_vertices, body_faces = bodies[0]
+                volume = trimesh.Trimesh(body_vertices, body_faces, process=False).volume
+
+                slow = "-"
+                speedup = "-"
+                if len(faces) <= args.trimesh_max:
+                    slow_s, meshes = _time(lambda: load_bodies(path), args.repeat)
+                    if not np.isclose(meshes[0][1].volume, volume, rtol=1e-6):
+                        raise SystemExit(f"volume mismatch on {path}: {meshes[0][1].volume} vs {volume}")
+                    slow, speedup = f"{slow_s:.3f}", f"{slow_s / fast_s:.1f}x"
+                size_mb = os.path.getsize(path) / 1e6
+                print(f"{ext:<6} {len(faces):>10} {size_mb:>8.1f} {fast_s:>9.3f} {slow:>10} {speedup:>8}")
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
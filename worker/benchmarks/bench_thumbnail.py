@@ -0,0 +1,42 @@
+"""
+Thumbnail benchmark: render and PNG-encode a UV sphere of ~N faces on one core.
+
+    cd worker && python -m benchmarks.bench_thumbnail --faces 1000000
+"""
+
+import argparse
+import time
+
+from benchmarks.bench_slicer import uv_sphere
+from geometry import thumbnail
+from geometry.stats import DEFAULT_CHUNK_FACES
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--faces", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="also write the PNG here")
+    args = parser.parse_args()
+
+    vertices, faces = uv_sphere(args.faces)
+    triangles = vertices[faces]
+    bounds_min, bounds_max = vertices.min(axis=0), vertices.max(axis=0)
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        chunks = (triangles[lo:lo + DEFAULT_CHUNK_FACES] for lo in range(0, len(triangles), DEFAULT_CHUNK_FACES))
+        png = thumbnail.encode_png(thumbnail.render(chunks, bounds_min, bounds_max, args.size))
+        timings.append(time.perf_counter() - started)
+
+    print(f"faces={len(faces)} size={args.size}px png={len(png)} bytes")
+    print(f"render+encode best={min(timings):.3f}s mean={sum(timings) / len(timings):.3f}s")
+    if args.out:
+        with open(args.out, "wb") as f:
+            f.write(png)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Vectorized ASCII STL and OBJ parsers.
+
+The file is read in large blocks cut at line boundaries. Each block is
+classified line by line with NumPy — the first non-blank byte of every line
+decides its record type — and the numeric fields of all records of one type
+are gathered into a single buffer that np.fromstring converts in one C call.
+There is no per-line Python, so a block costs a few array passes no matter
+how many records it holds.
+
+Supported records:
+- ASCII STL: `solid` (one body each) and `vertex`; everything else is
+  structure and skipped
+- OBJ: `v`, `f` (polygons are fan-triangulated; `v/vt/vn` tokens use their
+  position index; negative indices count back from the last vertex), and
+  `o` (one body each, like trimesh's split_object)
+
+Anything else that would change the geometry (line continuations,
+unreadable numbers) raises ValueError so the caller can fall back to
+trimesh.
+"""
+
+import os
+
+import numpy as np
+
+from geometry import stl
+
+# Bytes per read; blocks are cut at the last newline, so peak memory is a few times this
+DEFAULT_BLOCK_BYTES = 1 << 26
+
+_NEWLINE = ord("\n")
+_BLANK = np.zeros(256, dtype=bool)
+_BLANK[[ord(c) for c in " \t\r\n\v\f"]] = True
+
+
+def _blocks(path: str, block_bytes: int):
+    """Yield the file as uint8 arrays of whole lines, each ending in a newline."""
+    with open(path, "rb") as f:
+        rest = b""
+        while chunk := f.read(block_bytes):
+            chunk = rest + chunk
+            cut = chunk.rfind(b"\n") + 1
+            rest = chunk[cut:]
+            if cut:
+                yield np.frombuffer(chunk[:cut], dtype=np.uint8)
+        if rest.strip():
+            yield np.frombuffer(rest + b"\n", dtype=np.uint8)
+
+
+def _line_heads(buf: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First non-blank offset (the newline for empty lines), end and leading byte of every line."""
+    ends = np.flatnonzero(buf == _NEWLINE)
+    first = np.concatenate([[0], ends[:-1] + 1])
+    # Step the indented lines forward one byte at a time; indentation is short,
+    # so this touches a few bytes per line instead of the whole block
+    active = np.flatnonzero(_BLANK[buf[first]] & (first < ends))
+    while len(active):
+        first[active] += 1
+        active = active[_BLANK[buf[first[active]]] & (first[active] < ends[active])]
+    return first, ends, buf[first]
+
+
+def _is_keyword(buf: np.ndarray, first: np.ndarray, ends: np.ndarray, lead: np.ndarray, keyword: bytes) -> np.ndarray:
+    """Lines whose first token is exactly `keyword`; only lines with the right leading byte are inspected."""
+    n = len(keyword)
+    lines = np.flatnonzero(lead == keyword[0])
+    lines = lines[ends[lines] - first[lines] >= n]
+    head = first[lines]
+    ok = _BLANK[buf[head + n]]
+    for i in range(1, n):
+        ok &= buf[head + i] == keyword[i]
+    match = np.zeros(len(first), dtype=bool)
+    match[lines[ok]] = True
+    return match
+
+
+def _gather(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Bytes [start, end] of every segment, concatenated; the end newline separates them."""
+    delta = np.zeros(len(buf) + 1, dtype=np.int8)
+    delta[starts] += 1
+    delta[ends + 1] -= 1
+    return buf[np.cumsum(delta[:-1], dtype=np.int8) > 0]
+
+
+def _tokens_per_line(text: np.ndarray) -> np.ndarray:
+    """Whitespace-separated token count of every newline-terminated line in `text`."""
+    blank = _BLANK[text]
+    token_starts = np.flatnonzero(~blank[1:] & blank[:-1]) + 1
+    if len(text) and not blank[0]:
+        token_starts = np.concatenate([[0], token_starts])
+    return np.diff(np.searchsorted(token_starts, np.flatnonzero(text == _NEWLINE)), prepend=0)
+
+
+def _numbers(text: np.ndarray, dtype) -> np.ndarray:
+    """All whitespace-separated numbers in `text`, converted in one call (ValueError on anything else)."""
+    if not len(text):
+        return np.zeros(0, dtype=dtype)
+    return np.fromstring(text.tobytes(), dtype=dtype, sep=" ")
+
+
+def _line_text(buf: np.ndarray, start: int, end: int) -> str:
+    return buf[start:end].tobytes().decode("utf-8", "replace").strip()
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer; spreads the highly structured bits of float coordinates."""
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def merge_vertices(vertices: np.ndarray, faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Keep only referenced vertices, merging exact duplicates (what trimesh's processing does)."""
+    used = np.zeros(len(vertices), dtype=bool)
+    used[faces] = True
+    if not used.all():
+        remap = np.cumsum(used) - 1
+        vertices, faces = vertices[used], remap[faces]
+    # + 0.0 turns -0.0 into 0.0 so both spellings merge
+    points = np.ascontiguousarray(vertices + 0.0, dtype=np.float64)
+    # Sorting one 64-bit hash per row is several times faster than sorting the rows
+    bits = points.view(np.uint64)
+    key = _mix64(_mix64(_mix64(bits[:, 0]) ^ bits[:, 1]) ^ bits[:, 2])
+    _, inverse = np.unique(key, return_inverse=True)
+    first = np.empty(inverse.max() + 1 if len(inverse) else 0, dtype=np.int64)
+    first[inverse] = np.arange(len(inverse))
+    if not np.array_equal(points[first][inverse], points):
+        # Hash collision: merge on the full rows instead
+        _, first, inverse = np.unique(
+            points.view(np.dtype((np.void, points.dtype.itemsize * 3))).ravel(),
+            return_index=True, return_inverse=True,
+        )
+    return points[first], inverse.ravel()[faces]
+
+
+def parse_ascii_stl(path: str, block_bytes: int = DEFAULT_BLOCK_BYTES) -> list[tuple[str, np.ndarray, np.ndarray]]:
+    """(name, vertices, faces) per `solid` of an ASCII STL."""
+    if stl.binary_stl_face_count(path) is not None:
+        raise ValueError("Binary STL")
+
+    names, coords, body_of_vertex = [], [], []
+    for buf in _blocks(path, block_bytes):
+        first, ends, lead = _line_heads(buf)
+        solid = _is_keyword(buf, first, ends, lead, b"solid")
+        vertex = _is_keyword(buf, first, ends, lead, b"vertex")
+
+        solid_lines = np.flatnonzero(solid)
+        vertex_lines = np.flatnonzero(vertex)
+        # Body of each vertex = solids opened before it (a file without `solid` is one body)
+        body_of_vertex.append(len(names) + np.searchsorted(solid_lines, vertex_lines) - 1)
+        names.extend(_line_text(buf, first[i] + len(b"solid"), ends[i]) for i in solid_lines)
+
+        values = _numbers(_gather(buf, first[vertex] + len(b"vertex"), ends[vertex]), np.float64)
+        if len(values) != 3 * len(vertex_lines):
+            raise ValueError("Malformed vertex record")
+        coords.append(values.reshape(-1, 3))
+
+    points = np.concatenate(coords) if coords else np.zeros((0, 3))
+    body = np.maximum(np.concatenate(body_of_vertex), 0) if body_of_vertex else np.zeros(0, dtype=np.int64)
+    if len(points) % 3:
+        raise ValueError("Vertex count is not a multiple of 3")
+
+    triangles = np.arange(len(points)).reshape(-1, 3)
+    body = body[::3]
+    bodies = []
+    for index in np.unique(body):
+        vertices, faces = merge_vertices(points, triangles[body == index])
+        name = names[index] if index < len(names) and names[index] else f"solid_{index}"
+        bodies.append((name, vertices, faces))
+    return bodies
+
+
+def _strip_slashes(text: np.ndarray) -> np.ndarray:
+    """Blank out the `/vt/vn` part of every face token, leaving the position index."""
+    if not np.any(text == ord("/")):
+        return text
+    positions = np.arange(len(text))
+    slash = np.maximum.accumulate(np.where(text == ord("/"), positions, -1))
+    token_start = np.maximum.accumulate(np.where(_BLANK[text], positions, -1))
+    text = text.copy()
+    text[(slash > token_start) & (text != _NEWLINE)] = ord(" ")
+    return text
+
+
+def _triangulate(indices: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Fan-triangulate polygons given as flat indices + per-polygon counts; also the polygon of each triangle."""
+    if np.any(counts < 3):
+        raise ValueError("Face with fewer than 3 vertices")
+    offsets = np.cumsum(counts) - counts
+    per_polygon = counts - 2
+    polygon = np.repeat(np.arange(len(counts)), per_polygon)
+    corner = np.arange(len(polygon)) - np.repeat(np.cumsum(per_polygon) - per_polygon, per_polygon) + 1
+    start = offsets[polygon]
+    return indices[np.stack([start, start + corner, start + corner + 1], axis=1)], polygon
+
+
+def parse_obj(path: str, block_bytes: int = DEFAULT_BLOCK_BYTES) -> list[tuple[str, np.ndarray, np.ndarray]]:
+    """(name, vertices, faces) per `o` object of an OBJ (faces before the first `o` form their own body)."""
+    vertex_parts, face_parts, object_parts = [], [], []
+    names = [os.path.splitext(os.path.basename(path))[0]]
+    vertex_total = 0
+    for buf in _blocks(path, block_bytes):
+        backslash = np.flatnonzero(buf[:-1] == ord("\\"))
+        if np.any(buf[backslash + 1] == _NEWLINE):
+            raise ValueError("Line continuations are not supported")
+        first, ends, lead = _line_heads(buf)
+        v = _is_keyword(buf, first, ends, lead, b"v")
+        f = _is_keyword(buf, first, ends, lead, b"f")
+        o = _is_keyword(buf, first, ends, lead, b"o")
+
+        # Vertices: x y z, optionally followed by w or r g b
+        text = _gather(buf, first[v] + 1, ends[v])
+        counts = _tokens_per_line(text)
+        if np.any(counts < 3):
+            raise ValueError("Vertex with fewer than 3 coordinates")
+        values = _numbers(text, np.float64)
+        if len(values) != counts.sum():
+            raise ValueError("Unreadable vertex coordinate")
+        offsets = np.cumsum(counts) - counts
+        vertex_parts.append(values[offsets[:, None] + np.arange(3)])
+
+        # Faces: position indices only; negative ones count back from the vertices read so far
+        text = _strip_slashes(_gather(buf, first[f] + 1, ends[f]))
+        counts = _tokens_per_line(text)
+        indices = _numbers(text, np.int64)
+        if len(indices) != counts.sum():
+            raise ValueError("Unreadable face index")
+        v_lines, f_lines, o_lines = np.flatnonzero(v), np.flatnonzero(f), np.flatnonzero(o)
+        seen = np.repeat(vertex_total + np.searchsorted(v_lines, f_lines), counts)
+        if np.any(indices == 0):
+            raise ValueError("Face index 0")
+        indices = np.where(indices < 0, seen + indices, indices - 1)
+        triangles, polygon = _triangulate(indices, counts)
+        face_parts.append(triangles)
+        object_parts.append(len(names) - 1 + np.searchsorted(o_lines, f_lines)[polygon])
+
+        names.extend(_line_text(buf, first[i] + 1, ends[i]) for i in o_lines)
+        vertex_total += len(v_lines)
+
+    points = np.concatenate(vertex_parts) if vertex_parts else np.zeros((0, 3))
+    faces = np.concatenate(face_parts) if face_parts else np.zeros((0, 3), dtype=np.int64)
+    objects = np.concatenate(object_parts) if object_parts else np.zeros(0, dtype=np.int64)
+    if len(faces) and (faces.min() < 0 or faces.max() >= len(points)):
+        raise ValueError("Face index out of range")
+
+    bodies = []
+    for index in np.unique(objects):
+        vertices, body_faces = merge_vertices(points, faces[objects == index])
+        bodies.append((names[index] or f"object_{index}", vertices, body_faces))
+    return bodies
+
+
+def parse(path: str, block_bytes: int = DEFAULT_BLOCK_BYTES) -> list[tuple[str, np.ndarray, np.ndarray]]:
+    """Dispatch on extension; ValueError for anything these parsers don't handle."""
+    ext = path.rsplit(".", 1)[-1].lower()
+    if ext == "stl":
+        return parse_ascii_stl(path, block_bytes)
+    if ext == "obj":
+        return parse_obj(path, block_bytes)
+    raise ValueError(f"No fast parser for .{ext}")
@@ -0,0 +1,84 @@
+"""
+Compact shape descriptor for near-duplicate search across a user's models.
+
+Points are sampled uniformly over the surface (area-weighted, chunk by
+chunk from the TriangleSource), then summarized by:
+
+- a D2 shape distribution — the histogram of distances between random
+  point pairs, with distances divided by their mean so the histogram is
+  invariant to scale, rotation and translation;
+- the square roots of the two smaller principal moments of the samples
+  relative to the largest (elongation / flatness, also scale-free);
+- sphericity, π^(1/3) (6V)^(2/3) / A.
+
+The sampler is seeded, so the same mesh always yields the same
+descriptor. Descriptors compare with plain Euclidean distance; the server
+keeps them in a per-user NumPy index (server/app/services/similarity.py).
+"""
+
+import numpy as np
+
+from geometry.stats import DEFAULT_CHUNK_FACES, TriangleStats
+
+D2_BINS = 32
+D2_RANGE = 3.0  # in units of the mean pair distance; the tail past it lands in the last bin
+SAMPLE_POINTS = 4096
+SAMPLE_PAIRS = 200_000
+SHAPE_WEIGHT = 0.25  # moments + sphericity against the histogram, which sums to 1
+DESCRIPTOR_SIZE = D2_BINS + 3
+DESCRIPTOR_SEED = 0x5EED
+
+
+def _areas(tri: np.ndarray) -> np.ndarray:
+    tri = np.asarray(tri, dtype=np.float64)
+    return 0.5 * np.linalg.norm(np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]), axis=1)
+
+
+def surface_samples(source, count: int = SAMPLE_POINTS, rng: np.random.Generator | None = None,
+                    chunk_faces: int = DEFAULT_CHUNK_FACES) -> np.ndarray:
+    """(count, 3) points uniformly distributed over the surface; two passes over the source."""
+    rng = rng or np.random.default_rng(DESCRIPTOR_SEED)
+    ranges = [(lo, min(lo + chunk_faces, source.faces)) for lo in range(0, source.faces, chunk_faces)]
+    chunk_areas = np.array([_areas(source.load(lo, hi)).sum() for lo, hi in ranges])
+    if not len(ranges) or chunk_areas.sum() <= 0:
+        return np.zeros((0, 3))
+    per_chunk = rng.multinomial(count, chunk_areas / chunk_areas.sum())
+
+    points = []
+    for (lo, hi), n in zip(ranges, per_chunk):
+        if n == 0:
+            continue
+        tri = np.asarray(source.load(lo, hi), dtype=np.float64)
+        cumulative = np.cumsum(_areas(tri))
+        picked = np.minimum(np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side="right"), len(tri) - 1)
+        # Uniform barycentric coordinates: fold (u, v) back into the triangle
+        u, v = rng.random(n), rng.random(n)
+        outside = u + v > 1
+        u[outside], v[outside] = 1 - u[outside], 1 - v[outside]
+        a, b, c = tri[picked, 0], tri[picked, 1], tri[picked, 2]
+        points.append(a + u[:, None] * (b - a) + v[:, None] * (c - a))
+    return np.concatenate(points)
+
+
+def describe(source, stats: TriangleStats) -> np.ndarray:
+    """(DESCRIPTOR_SIZE,) float32 descriptor of a mesh; zeros for an empty or flat-degenerate one."""
+    rng = np.random.default_rng(DESCRIPTOR_SEED)
+    points = surface_samples(source, rng=rng)
+    if len(points) < 2:
+        return np.zeros(DESCRIPTOR_SIZE, dtype=np.float32)
+
+    pairs = rng.integers(len(points), size=(SAMPLE_PAIRS, 2))
+    distances = np.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1)
+    mean = distances.mean()
+    if mean <= 0:
+        return np.zeros(DESCRIPTOR_SIZE, dtype=np.float32)
+    scaled = np.minimum(distances / mean, np.nextafter(D2_RANGE, 0))
+    histogram = np.bincount((scaled * (D2_BINS / D2_RANGE)).astype(np.int64), minlength=D2_BINS) / len(scaled)
+
+    moments = np.sort(np.linalg.eigvalsh(np.cov(points.T)))[::-1]
+    elongation = np.sqrt(np.maximum(moments[1:], 0) / moments[0]) if moments[0] > 0 else np.zeros(2)
+    sphericity = np.pi ** (1 / 3) * (6 * stats.volume) ** (2 / 3) / stats.area if stats.area > 0 else 0.0
+
+    return np.concatenate([
+        histogram, SHAPE_WEIGHT * np.array([elongation[0], elongation[1], min(sphericity, 1.0)]),
+    ]).astype(np.float32)
@@ -0,0 +1,204 @@
+"""
+Build-orientation search over a batch of candidate rotations.
+
+A candidate is the rotation that turns one "down" direction to -Z; its rows
+are the rotated X, Y (plate axes) and Z (up) in mesh coordinates, so one
+(points @ rotations) product gives every candidate's coordinates at once.
+
+Candidates: the orientation as uploaded, the six axis-aligned ones, the
+normals of the largest flat regions (the faces a part can rest on — a
+convex hull stand-in that needs no hull) and a Fibonacci sphere.
+
+Scores, all candidates in one batched pass:
+
+- height and footprint (plate-axis bounding box) from the mesh vertices,
+  snapped to a grid and deduplicated (error <= half a grid cell);
+- support area: projected area of overhang faces past the overhang angle,
+  except those resting on the plate, estimated from an area-weighted
+  sample of faces (exact below the sample size).
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from geometry.source import TriangleSource
+from geometry.stats import DEFAULT_CHUNK_FACES, TriangleStats
+
+# Grid keys are packed into one int64, 21 bits per axis
+_KEY_BITS = 21
+# Normals are bucketed on this lattice to find large flat regions
+_NORMAL_BUCKETS = 64
+# Bytes per (rows x candidates) float64 block in the scoring loops; rows per
+# block shrink as the candidate count grows
+_BLOCK_BYTES = 16 << 20
+
+
+@dataclass
+class OrientationResult:
+    rotation: np.ndarray     # (3, 3), rows: plate X, plate Y, up
+    euler_deg: tuple[float, float, float]  # three.js "XYZ" order
+    height: float
+    support_area: float
+    footprint: float
+    candidates: int
+
+
+def rotations_to_down(down: np.ndarray) -> np.ndarray:
+    """(k, 3, 3) minimal rotations taking each unit `down` vector to -Z."""
+    down = down / np.linalg.norm(down, axis=1, keepdims=True)
+    target = np.array([0.0, 0.0, -1.0])
+    v = np.cross(down, target)
+    c = down @ target
+    vx = np.zeros((len(down), 3, 3))
+    vx[:, 0, 1], vx[:, 0, 2] = -v[:, 2], v[:, 1]
+    vx[:, 1, 0], vx[:, 1, 2] = v[:, 2], -v[:, 0]
+    vx[:, 2, 0], vx[:, 2, 1] = -v[:, 1], v[:, 0]
+    flipped = c < -1.0 + 1e-9
+    scale = np.where(flipped, 0.0, 1.0 / np.where(flipped, 1.0, 1.0 + c))
+    rot = np.eye(3) + vx + (vx @ vx) * scale[:, None, None]
+    # Already pointing up: half turn about X
+    rot[flipped] = np.diag([1.0, -1.0, -1.0])
+    return rot
+
+
+def euler_xyz_deg(rot: np.ndarray) -> tuple[float, float, float]:
+    """Euler angles of a rotation matrix, three.js "XYZ" order (R = Rx Ry Rz), degrees."""
+    m13 = float(np.clip(rot[0, 2], -1.0, 1.0))
+    ry = math.asin(m13)
+    if abs(m13) < 0.9999999:
+        rx = math.atan2(-rot[1, 2], rot[2, 2])
+        rz = math.atan2(-rot[0, 1], rot[0, 0])
+    else:
+        rx = math.atan2(rot[2, 1], rot[1, 1])
+        rz = 0.0
+    return math.degrees(rx), math.degrees(ry), math.degrees(rz)
+
+
+def fibonacci_sphere(count: int) -> np.ndarray:
+    i = np.arange(count) + 0.5
+    z = 1.0 - 2.0 * i / count
+    r = np.sqrt(1.0 - z * z)
+    theta = math.pi * (3.0 - math.sqrt(5.0)) * i
+    return np.stack([r * np.cos(theta), r * np.sin(theta), z], axis=1)
+
+
+def _face_data(tri: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(unit normals, areas, centroids) of a triangle chunk."""
+    n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    length = np.linalg.norm(n, axis=1)
+    unit = np.divide(n, length[:, None], out=np.zeros_like(n), where=length[:, None] > 0)
+    return unit, length / 2.0, tri.mean(axis=1)
+
+
+def _scan(source: TriangleSource, stats: TriangleStats, grid_cells: int, sample_faces: int,
+          chunk_faces: int, seed: int):
+    """One pass: snapped vertex cells, face sample (with weights) and flat-region normals."""
+    extent = float(np.max(stats.bounds_max - stats.bounds_min)) or 1.0
+    cell = extent / grid_cells
+    rng = np.random.default_rng(seed)
+    keys, samples, buckets = [], [], []
+    keep_all = source.faces <= sample_faces
+
+    for lo in range(0, source.faces, chunk_faces):
+        tri = np.asarray(source.load(lo, min(lo + chunk_faces, source.faces)), dtype=np.float64)
+        q = np.clip(np.floor((tri.reshape(-1, 3) - stats.bounds_min) / cell), 0, (1 << _KEY_BITS) - 1)
+        q = q.astype(np.int64)
+        keys.append(np.unique((q[:, 0] << (2 * _KEY_BITS)) | (q[:, 1] << _KEY_BITS) | q[:, 2]))
+
+        normal, area, centroid = _face_data(tri)
+        if keep_all:
+            samples.append((normal, area, centroid))
+        elif area.sum() > 0:
+            # Stratified by chunk: this chunk's share of the sample, drawn by area
+            m = max(1, round(sample_faces * len(tri) / source.faces))
+            pick = rng.choice(len(tri), size=m, p=area / area.sum())
+            samples.append((normal[pick], np.full(m, area.sum() / m), centroid[pick]))
+
+        b = np.rint(normal * _NORMAL_BUCKETS).astype(np.int64) + _NORMAL_BUCKETS
+        bkey = (b[:, 0] * (2 * _NORMAL_BUCKETS + 1) + b[:, 1]) * (2 * _NORMAL_BUCKETS + 1) + b[:, 2]
+        uk, inv = np.unique(bkey, return_inverse=True)
+        weighted = np.stack([np.bincount(inv, weights=normal[:, i] * area, minlength=len(uk)) for i in range(3)], axis=1)
+        buckets.append((uk, weighted, np.bincount(inv, weights=area, minlength=len(uk))))
+
+    key = np.unique(np.concatenate(keys))
+    mask = (1 << _KEY_BITS) - 1
+    cells = np.stack([key >> (2 * _KEY_BITS), (key >> _KEY_BITS) & mask, key & mask], axis=1)
+    points = stats.bounds_min + (cells + 0.5) * cell
+
+    normal = np.concatenate([s[0] for s in samples])
+    weight = np.concatenate([s[1] for s in samples])
+    centroid = np.concatenate([s[2] for s in samples])
+
+    uk, inv = np.unique(np.concatenate([b[0] for b in buckets]), return_inverse=True)
+    flat_normals = np.stack(
+        [np.bincount(inv, weights=np.concatenate([b[1] for b in buckets])[:, i], minlength=len(uk)) for i in range(3)],
+        axis=1,
+    )
+    flat_area = np.bincount(inv, weights=np.concatenate([b[2] for b in buckets]), minlength=len(uk))
+    return points, cell, (normal, weight, centroid), (flat_normals, flat_area)
+
+
+def candidate_downs(flat_normals: np.ndarray, flat_area: np.ndarray, flat_count: int,
+                    sphere_count: int) -> np.ndarray:
+    """As uploaded, axis-aligned, largest flat regions, Fibonacci sphere — deduplicated."""
+    top = np.argsort(flat_area)[::-1][:flat_count]
+    flats = flat_normals[top]
+    flats = flats[np.linalg.norm(flats, axis=1) > 0]
+    axes = np.vstack([np.eye(3), -np.eye(3)])
+    downs = np.vstack([[[0.0, 0.0, -1.0]], axes, flats, fibonacci_sphere(sphere_count)])
+    downs /= np.linalg.norm(downs, axis=1, keepdims=True)
+    _, first = np.unique(np.round(downs, 4), axis=0, return_index=True)
+    return downs[np.sort(first)]
+
+
+def optimize(source: TriangleSource, stats: TriangleStats, overhang_angle: float = 45.0,
+             flat_count: int = 64, sphere_count: int = 192, grid_cells: int = 256,
+             sample_faces: int = 100_000, weights: tuple[float, float, float] = (1.0, 1.0, 0.25),
+             chunk_faces: int = DEFAULT_CHUNK_FACES, seed: int = 0) -> OrientationResult:
+    """Score every candidate in one batch; lowest weighted (height, support area, footprint) wins."""
+    points, cell, (normal, weight, centroid), (flat_normals, flat_area) = _scan(
+        source, stats, grid_cells, sample_faces, chunk_faces, seed
+    )
+    downs = candidate_downs(flat_normals, flat_area, flat_count, sphere_count)
+    rot = rotations_to_down(downs)                  # (k, 3, 3)
+    axes = rot.reshape(-1, 3).T                     # (3, 3k): plate X, plate Y, up per candidate
+    k = len(rot)
+
+    lo = np.full(3 * k, np.inf)
+    hi = np.full(3 * k, -np.inf)
+    rows = max(1, _BLOCK_BYTES // (8 * 3 * k))
+    for start in range(0, len(points), rows):
+        proj = points[start:start + rows] @ axes
+        np.minimum(lo, proj.min(axis=0), out=lo)
+        np.maximum(hi, proj.max(axis=0), out=hi)
+    span = (hi - lo).reshape(k, 3)
+    height = span[:, 2]
+    footprint = span[:, 0] * span[:, 1]
+    plate = lo.reshape(k, 3)[:, 2]
+
+    up = rot[:, 2, :].T                             # (3, k)
+    min_nz = math.sin(math.radians(overhang_angle))
+    support_area = np.zeros(k)
+    rows = max(1, _BLOCK_BYTES // (8 * k))
+    for start in range(0, len(normal), rows):
+        nz = normal[start:start + rows] @ up
+        z = centroid[start:start + rows] @ up
+        overhang = (nz < -min_nz) & (z - plate > cell)
+        support_area += (weight[start:start + rows, None] * -nz * overhang).sum(axis=0)
+
+    def _norm(x):
+        top = x.max()
+        return x / top if top > 0 else x
+
+    score = weights[0] * _norm(height) + weights[1] * _norm(support_area) + weights[2] * _norm(footprint)
+    best = int(np.argmin(score))
+    return OrientationResult(
+        rotation=rot[best],
+        euler_deg=euler_xyz_deg(rot[best]),
+        height=float(height[best]),
+        support_area=float(support_area[best]),
+        footprint=float(footprint[best]),
+        candidates=k,
+    )
@@ -0,0 +1,113 @@
+"""
+Parallel chunked reduction for very large meshes.
+
+The face range is split into contiguous chunks; each pool process opens the
+TriangleSource itself (memory map — nothing but the handle and the range is
+pickled), reduces its chunk, and returns a tiny TriangleStats partial. The
+partials are merged in chunk order, so the result only differs from the
+single-threaded path by floating-point summation order.
+
+billiard (Celery's multiprocessing fork) is used because the stdlib
+multiprocessing refuses to start children from a daemonic prefork worker.
+The pool is started on first use and kept for the life of the process:
+tearing a billiard pool down with terminate() waits ~30 s for its queues
+to drain (_ensure_messages_consumed), far longer than the work itself.
+shutdown() closes it gracefully; the worker calls it when a child exits.
+"""
+
+import atexit
+import os
+import time
+from dataclasses import dataclass
+
+from billiard import Pool
+
+from geometry.source import TriangleSource
+from geometry.stats import TriangleStats, empty_stats, merge_stats, reduce_source
+
+
+@dataclass
+class ChunkTiming:
+    index: int
+    start: int
+    stop: int
+    seconds: float
+    pid: int
+
+
+_pool = None
+_pool_size = 0
+
+
+def get_pool(processes: int | None = None):
+    """
+    The process's pool with `processes` workers (default cpu_count), restarted
+    only when that changes — not per call, and not by how many tasks a call has.
+    """
+    global _pool, _pool_size
+    processes = max(1, processes or os.cpu_count() or 1)
+    if _pool is not None and _pool_size != processes:
+        shutdown()
+    if _pool is None:
+        _pool, _pool_size = Pool(processes), processes
+    return _pool
+
+
+def shutdown() -> None:
+    """Close the pool and wait for its workers (no terminate(), see the module docstring)."""
+    global _pool, _pool_size
+    if _pool is not None:
+        pool, _pool, _pool_size = _pool, None, 0
+        pool.close()
+        pool.join()
+
+
+atexit.register(shutdown)
+
+
+def chunk_ranges(faces: int, chunk_faces: int) -> list[tuple[int, int]]:
+    return [(lo, min(lo + chunk_faces, faces)) for lo in range(0, faces, chunk_faces)]
+
+
+def _reduce_chunk(args: tuple[TriangleSource, int, int]) -> tuple[TriangleStats, float, int]:
+    source, start, stop = args
+    started = time.perf_counter()
+    stats = reduce_source(source, start, stop)
+    return stats, time.perf_counter() - started, os.getpid()
+
+
+def _map_chunk(args):
+    fn, source, start, stop, extra = args
+    return fn(source, *extra, start=start, stop=stop)
+
+
+def map_chunks(fn, source: TriangleSource, *extra, processes: int | None = None,
+               chunk_faces: int = 1_000_000) -> list:
+    """Call fn(source, *extra, start=, stop=) for every chunk across a process pool, in chunk order."""
+    ranges = chunk_ranges(source.faces, chunk_faces)
+    pool = get_pool(processes)
+    return pool.map(_map_chunk, [(fn, source, lo, hi, extra) for lo, hi in ranges])
+
+
+def map_items(fn, items: list, processes: int | None = None) -> list:
+    """Call fn(item) for every item across a process pool, one item per task, in order."""
+    pool = get_pool(processes)
+    return pool.map(fn, items, chunksize=1)
+
+
+def parallel_reduce(
+    source: TriangleSource,
+    processes: int | None = None,
+    chunk_faces: int = 1_000_000,
+) -> tuple[TriangleStats, list[ChunkTiming]]:
+    """Reduce a TriangleSource across a process pool; returns stats and per-chunk timings."""
+    ranges = chunk_ranges(source.faces, chunk_faces)
+    pool = get_pool(processes)
+    results = pool.map(_reduce_chunk, [(source, lo, hi) for lo, hi in ranges])
+
+    stats = empty_stats()
+    timings = []
+    for index, ((lo, hi), (partial, seconds, pid)) in enumerate(zip(ranges, results)):
+        stats = merge_stats(stats, partial)
+        timings.append(ChunkTiming(index=index, start=lo, stop=hi, seconds=seconds, pid=pid))
+    return stats, timings
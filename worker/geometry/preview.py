@@ -0,0 +1,128 @@
+"""
+Decimated preview meshes for the browser viewer.
+
+Decimation is vertex clustering on a uniform grid: every vertex snaps to its
+grid cell, triangles that collapse are dropped and duplicates removed. It is
+fully vectorized, streams over TriangleSource chunks, and the cell size is
+chosen from the surface area so the output lands near the face budget.
+
+Binary layout (little-endian, every section 4-byte aligned):
+
+    magic     4s   b"PRV1"
+    vertices  u32
+    faces     u32
+    flags     u32  bit 0: indices are u16 (else u32)
+    bbox_min  3f32
+    bbox_max  3f32
+    positions u16[vertices * 3]  quantized over the bbox
+    normals   i8[vertices * 3]   unit normals * 127
+    indices   u16|u32[faces * 3]
+"""
+
+import struct
+
+import numpy as np
+
+from geometry.source import TriangleSource
+from geometry.stats import DEFAULT_CHUNK_FACES
+
+MAGIC = b"PRV1"
+FLAG_U16_INDICES = 1
+HEADER = struct.Struct("<4sIII3f3f")
+
+# Grid keys are packed into one int64, 21 bits per axis
+_MAX_CELLS_PER_AXIS = 1 << 21
+
+
+def _cluster(triangle_chunks, origin: np.ndarray, cell: float) -> tuple[np.ndarray, np.ndarray]:
+    """Snap vertices to a grid; return (cell-mean vertices, unique non-degenerate faces)."""
+    key_parts, sum_parts, count_parts, face_parts = [], [], [], []
+
+    for tri in triangle_chunks:
+        tri = np.asarray(tri, dtype=np.float64)
+        q = np.clip(np.floor((tri - origin) / cell), 0, _MAX_CELLS_PER_AXIS - 1).astype(np.int64)
+        keys = (q[..., 0] << 42) | (q[..., 1] << 21) | q[..., 2]  # (n, 3)
+
+        keep = (keys[:, 0] != keys[:, 1]) & (keys[:, 1] != keys[:, 2]) & (keys[:, 0] != keys[:, 2])
+        if keep.any():
+            face_parts.append(np.unique(keys[keep], axis=0))
+
+        uk, inv = np.unique(keys.ravel(), return_inverse=True)
+        flat = tri.reshape(-1, 3)
+        sums = np.stack([np.bincount(inv, weights=flat[:, i], minlength=len(uk)) for i in range(3)], axis=1)
+        key_parts.append(uk)
+        sum_parts.append(sums)
+        count_parts.append(np.bincount(inv, minlength=len(uk)))
+
+    if not face_parts:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    uk, inv = np.unique(np.concatenate(key_parts), return_inverse=True)
+    sums = np.concatenate(sum_parts)
+    vertices = np.stack([np.bincount(inv, weights=sums[:, i], minlength=len(uk)) for i in range(3)], axis=1)
+    vertices /= np.bincount(inv, weights=np.concatenate(count_parts), minlength=len(uk))[:, None]
+
+    face_keys = np.concatenate(face_parts)
+    # Same triangle from different chunks (or wound differently) collapses to one
+    _, first = np.unique(np.sort(face_keys, axis=1), axis=0, return_index=True)
+    faces = np.searchsorted(uk, face_keys[np.sort(first)])
+    return vertices, faces
+
+
+def decimate(source: TriangleSource, bounds_min: np.ndarray, bounds_max: np.ndarray,
+             area: float, face_budget: int) -> tuple[np.ndarray, np.ndarray]:
+    """Vertex-cluster a TriangleSource down to at most `face_budget` faces."""
+    extent = float(np.max(bounds_max - bounds_min)) or 1.0
+    min_cell = extent / (_MAX_CELLS_PER_AXIS - 2)
+    if source.faces <= face_budget:
+        # Under budget — only weld coincident vertices
+        cell = max(extent * 1e-6, min_cell)
+    else:
+        # Clustering leaves roughly two faces per occupied surface cell
+        cell = max(np.sqrt(2.0 * area / face_budget), min_cell)
+
+    chunks = (source.load(lo, min(lo + DEFAULT_CHUNK_FACES, source.faces))
+              for lo in range(0, source.faces, DEFAULT_CHUNK_FACES))
+    vertices, faces = _cluster(chunks, bounds_min, cell)
+
+    # Area-based estimate is rough on noisy meshes; re-cluster the (small) result
+    while len(faces) > face_budget:
+        cell *= 1.1 * np.sqrt(len(faces) / face_budget)
+        vertices, faces = _cluster([vertices[faces]], bounds_min, cell)
+    return vertices, faces
+
+
+def vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Area-weighted vertex normals."""
+    tri = vertices[faces]
+    face_n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    normals = np.zeros_like(vertices)
+    for corner in range(3):
+        np.add.at(normals, faces[:, corner], face_n)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    length[length == 0] = 1.0
+    return normals / length
+
+
+def _pad4(buf: bytes) -> bytes:
+    return buf + b"\0" * (-len(buf) % 4)
+
+
+def encode(vertices: np.ndarray, faces: np.ndarray, bounds_min: np.ndarray, bounds_max: np.ndarray) -> bytes:
+    """Serialize a preview mesh in the compact PRV1 layout."""
+    span = np.where(bounds_max > bounds_min, bounds_max - bounds_min, 1.0)
+    positions = np.clip(np.rint((vertices - bounds_min) / span * 65535), 0, 65535).astype("<u2")
+    normals = np.rint(vertex_normals(vertices, faces) * 127).astype(np.int8)
+
+    small = len(vertices) <= 0xFFFF
+    indices = faces.astype("<u2" if small else "<u4")
+    header = HEADER.pack(
+        MAGIC, len(vertices), len(faces), FLAG_U16_INDICES if small else 0,
+        *bounds_min.astype(np.float32), *bounds_max.astype(np.float32),
+    )
+    return b"".join([
+        header,
+        _pad4(positions.tobytes()),
+        _pad4(normals.tobytes()),
+        _pad4(indices.tobytes()),
+    ])
@@ -0,0 +1,81 @@
+"""
+Vectorized rasterization of triangles onto an XY grid of cell centres.
+
+Every (triangle, covered cell) pair is expanded with np.repeat; the
+point-in-triangle test and the surface height come from barycentric
+coordinates in one pass. Used by the height-field kernels (support volume,
+ray volume).
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Grid:
+    origin_x: float
+    origin_y: float
+    cell: float  # mm
+    nx: int
+    ny: int
+
+    @classmethod
+    def fit(cls, bounds_min, bounds_max, cell: float, max_cells: int, **extra):
+        """Grid over the XY footprint; cells grow past `cell` to stay under max_cells per axis."""
+        size_x = float(bounds_max[0] - bounds_min[0])
+        size_y = float(bounds_max[1] - bounds_min[1])
+        cell = max(cell, max(size_x, size_y) / max_cells) or 1.0
+        return cls(
+            origin_x=float(bounds_min[0]),
+            origin_y=float(bounds_min[1]),
+            cell=cell,
+            nx=max(1, math.ceil(size_x / cell)),
+            ny=max(1, math.ceil(size_y / cell)),
+            **extra,
+        )
+
+
+def face_normal_z(tri: np.ndarray) -> np.ndarray:
+    """Z component of the unit face normal (0 for degenerate faces)."""
+    n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    length = np.linalg.norm(n, axis=1)
+    return np.divide(n[:, 2], length, out=np.zeros_like(length), where=length > 0)
+
+
+def rasterize(tri: np.ndarray, grid: Grid) -> tuple[np.ndarray, np.ndarray]:
+    """(cell index, z) for every grid-cell centre inside each triangle's XY projection.
+
+    Faces must not be vertical (zero projected area); callers filter on the normal.
+    """
+    x, y = tri[:, :, 0], tri[:, :, 1]
+    ix0 = np.maximum(np.ceil((x.min(axis=1) - grid.origin_x) / grid.cell - 0.5), 0).astype(np.int64)
+    ix1 = np.minimum(np.floor((x.max(axis=1) - grid.origin_x) / grid.cell - 0.5), grid.nx - 1).astype(np.int64)
+    iy0 = np.maximum(np.ceil((y.min(axis=1) - grid.origin_y) / grid.cell - 0.5), 0).astype(np.int64)
+    iy1 = np.minimum(np.floor((y.max(axis=1) - grid.origin_y) / grid.cell - 0.5), grid.ny - 1).astype(np.int64)
+    span_x = np.maximum(ix1 - ix0 + 1, 0)
+    counts = span_x * np.maximum(iy1 - iy0 + 1, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    face = np.repeat(np.arange(len(tri)), counts)
+    local = np.arange(total) - (np.cumsum(counts) - counts)[face]
+    ix = ix0[face] + local % span_x[face]
+    iy = iy0[face] + local // span_x[face]
+    px = grid.origin_x + (ix + 0.5) * grid.cell
+    py = grid.origin_y + (iy + 0.5) * grid.cell
+
+    t = tri[face]
+    ax, ay = t[:, 0, 0], t[:, 0, 1]
+    e1x, e1y = t[:, 1, 0] - ax, t[:, 1, 1] - ay
+    e2x, e2y = t[:, 2, 0] - ax, t[:, 2, 1] - ay
+    den = e1x * e2y - e2x * e1y
+    wx, wy = px - ax, py - ay
+    u = (wx * e2y - e2x * wy) / den
+    v = (e1x * wy - wx * e1y) / den
+    inside = (u >= 0) & (v >= 0) & (u + v <= 1)
+
+    z = t[:, 0, 2] + u * (t[:, 1, 2] - t[:, 0, 2]) + v * (t[:, 2, 2] - t[:, 0, 2])
+    return (iy * grid.nx + ix)[inside], z[inside]
@@ -0,0 +1,195 @@
+"""
+Vectorized slicer for print-time estimation.
+
+Every (triangle, layer plane) pair is expanded with np.repeat and intersected
+in one pass: the plane cuts the two edges adjacent to the triangle's "lone"
+vertex, giving one contour segment per pair. Segments are oriented from the
+face normal (outside on the right, so outer contours run CCW and holes CW),
+which lets per-layer perimeter and net cross-section area fall out of two
+np.bincount calls (length sum and shoelace sum) without ever chaining
+segments into loops.
+
+Planes sit at layer mid-heights, so vertices exactly on a plane are rare and
+handled by treating zero as positive.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from geometry.source import TriangleSource
+from geometry.stats import DEFAULT_CHUNK_FACES
+
+
+@dataclass
+class LayerStats:
+    """Per-layer contour measurements, all arrays of length `layers`."""
+    layer_height: float
+    perimeter: np.ndarray  # contour length, mm
+    area: np.ndarray       # net cross-section area, mm²
+    bbox_min: np.ndarray   # (layers, 2) xy
+    bbox_max: np.ndarray   # (layers, 2) xy
+
+    @property
+    def layers(self) -> int:
+        return len(self.perimeter)
+
+
+@dataclass
+class FdmProfile:
+    layer_height: float = 0.2
+    line_width: float = 0.45
+    walls: int = 2
+    infill_density: float = 0.2
+    perimeter_speed: float = 45.0   # mm/s
+    infill_speed: float = 80.0      # mm/s
+    travel_speed: float = 150.0     # mm/s
+    layer_change_s: float = 0.6
+
+
+@dataclass
+class SlaProfile:
+    layer_height: float = 0.05
+    exposure_s: float = 2.5
+    lift_s: float = 5.0             # peel + retract per layer
+    bottom_layers: int = 6
+    bottom_exposure_s: float = 30.0
+
+
+@dataclass
+class MetalProfile:
+    layer_height: float = 0.04
+    hatch_spacing: float = 0.1      # mm
+    scan_speed: float = 1000.0      # mm/s
+    contour_speed: float = 500.0    # mm/s
+    recoat_s: float = 9.0
+
+
+def _slice_chunk(tri: np.ndarray, z0: float, h: float, layers: int):
+    """Intersect one chunk of triangles with all planes it spans."""
+    tri = np.asarray(tri, dtype=np.float64)
+    z = tri[:, :, 2]
+    k_lo = np.maximum(np.ceil((z.min(axis=1) - z0) / h - 0.5), 0).astype(np.int64)
+    k_hi = np.minimum(np.floor((z.max(axis=1) - z0) / h - 0.5), layers - 1).astype(np.int64)
+    counts = np.maximum(k_hi - k_lo + 1, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return None
+
+    face = np.repeat(np.arange(len(tri)), counts)
+    starts = np.cumsum(counts) - counts
+    k = k_lo[face] + (np.arange(total) - starts[face])
+    plane = z0 + (k + 0.5) * h
+
+    t = tri[face]                                   # (m, 3, 3)
+    d = t[:, :, 2] - plane[:, None]                 # signed height above the plane
+    s = d >= 0
+    # Faces lying exactly in a plane touch it without crossing
+    crossing = s.any(axis=1) & ~s.all(axis=1)
+    if not crossing.all():
+        k, t, d, s = k[crossing], t[crossing], d[crossing], s[crossing]
+        total = len(k)
+    # The vertex on its own side of the plane; both cut edges touch it
+    lone = np.where(s[:, 0] == s[:, 1], 2, np.where(s[:, 0] == s[:, 2], 1, 0))
+    rows = np.arange(total)
+    a = t[rows, lone]
+    b = t[rows, (lone + 1) % 3]
+    c = t[rows, (lone + 2) % 3]
+    da, db, dc = d[rows, lone], d[rows, (lone + 1) % 3], d[rows, (lone + 2) % 3]
+    p = a + (b - a) * (da / (da - db))[:, None]
+    q = a + (c - a) * (da / (da - dc))[:, None]
+
+    # Orient so the face normal (projected to xy) points to the segment's right
+    n = np.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0])
+    dx, dy = q[:, 0] - p[:, 0], q[:, 1] - p[:, 1]
+    flip = (dy * n[:, 0] - dx * n[:, 1]) < 0
+    p[flip], q[flip] = q[flip], p[flip].copy()
+
+    length = np.hypot(q[:, 0] - p[:, 0], q[:, 1] - p[:, 1])
+    shoelace = (p[:, 0] * q[:, 1] - q[:, 0] * p[:, 1]) / 2.0
+    return k, length, shoelace, p[:, :2], q[:, :2]
+
+
+def slice_source(source: TriangleSource, z_min: float, z_max: float, layer_height: float,
+                 chunk_faces: int = DEFAULT_CHUNK_FACES, on_progress=None) -> LayerStats:
+    """
+    Slice a TriangleSource into layers of `layer_height` between z_min and z_max.
+    `on_progress(fraction)` is called after every chunk.
+    """
+    layers = max(1, math.ceil((z_max - z_min) / layer_height))
+    perimeter = np.zeros(layers)
+    area = np.zeros(layers)
+    bbox_min = np.full((layers, 2), np.inf)
+    bbox_max = np.full((layers, 2), -np.inf)
+
+    for lo in range(0, source.faces, chunk_faces):
+        hi = min(lo + chunk_faces, source.faces)
+        cut = _slice_chunk(source.load(lo, hi), z_min, layer_height, layers)
+        if on_progress is not None:
+            on_progress(hi / source.faces)
+        if cut is None:
+            continue
+        k, length, shoelace, p, q = cut
+        perimeter += np.bincount(k, weights=length, minlength=layers)
+        area += np.bincount(k, weights=shoelace, minlength=layers)
+        np.minimum.at(bbox_min, k, np.minimum(p, q))
+        np.maximum.at(bbox_max, k, np.maximum(p, q))
+
+    return LayerStats(
+        layer_height=layer_height,
+        perimeter=perimeter,
+        area=np.maximum(area, 0.0),
+        bbox_min=bbox_min,
+        bbox_max=bbox_max,
+    )
+
+
+def _travel(stats: LayerStats) -> np.ndarray:
+    """Travel per layer: heuristic of two passes across the layer's xy bbox."""
+    span = np.where(np.isfinite(stats.bbox_max), stats.bbox_max - stats.bbox_min, 0.0)
+    return 2.0 * np.hypot(span[:, 0], span[:, 1])
+
+
+def estimate_fdm_hours(stats: LayerStats, profile: FdmProfile = FdmProfile()) -> float:
+    # Rescale per-layer measurements if the profile prints thinner/thicker layers than we sliced
+    scale = stats.layer_height / profile.layer_height
+    walls = stats.perimeter * profile.walls
+    infill_area = np.maximum(stats.area - walls * profile.line_width, 0.0)
+    infill = infill_area * profile.infill_density / profile.line_width
+    per_layer = (
+        walls / profile.perimeter_speed
+        + infill / profile.infill_speed
+        + _travel(stats) / profile.travel_speed
+        + profile.layer_change_s
+    )
+    return float(per_layer.sum() * scale / 3600.0)
+
+
+def estimate_sla_hours(stats: LayerStats, profile: SlaProfile = SlaProfile()) -> float:
+    # Layer-count bound: exposure is the same whatever the cross-section
+    layers = math.ceil(stats.layers * stats.layer_height / profile.layer_height)
+    bottom = min(profile.bottom_layers, layers)
+    seconds = (
+        bottom * profile.bottom_exposure_s
+        + (layers - bottom) * profile.exposure_s
+        + layers * profile.lift_s
+    )
+    return seconds / 3600.0
+
+
+def estimate_metal_hours(stats: LayerStats, profile: MetalProfile = MetalProfile()) -> float:
+    scale = stats.layer_height / profile.layer_height
+    hatch = stats.area / profile.hatch_spacing / profile.scan_speed
+    contour = stats.perimeter / profile.contour_speed
+    seconds = (hatch + contour + profile.recoat_s).sum() * scale
+    return float(seconds / 3600.0)
+
+
+def estimate_print_hours(stats: LayerStats) -> dict[str, float]:
+    """Print time per technology, keyed like CalcParams.technology."""
+    return {
+        "FDM": estimate_fdm_hours(stats),
+        "SLA": estimate_sla_hours(stats),
+        "Metal": estimate_metal_hours(stats),
+    }
@@ -0,0 +1,59 @@
+"""
+Memory-mappable triangle sources.
+
+A TriangleSource is a small, picklable handle (kind + path + face count)
+that any process can open and slice without the parent copying arrays to
+it. Two layouts are supported:
+
+- "stl":     a binary STL, sliced straight from its facet records
+- "indexed": a directory with vertices.npy (float) and faces.npy (int)
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from geometry import stl
+
+VERTICES_FILE = "vertices.npy"
+FACES_FILE = "faces.npy"
+
+
+@dataclass(frozen=True)
+class TriangleSource:
+    kind: str  # "stl" | "indexed"
+    path: str
+    faces: int
+
+    @classmethod
+    def from_binary_stl(cls, path: str) -> "TriangleSource":
+        count = stl.binary_stl_face_count(path)
+        if count is None:
+            raise ValueError("Not a binary STL file")
+        return cls(kind="stl", path=path, faces=count)
+
+    @classmethod
+    def from_arrays(cls, vertices: np.ndarray, faces: np.ndarray, directory: str) -> "TriangleSource":
+        """Write vertex/face arrays as .npy so other processes can memory-map them."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, VERTICES_FILE), np.ascontiguousarray(vertices))
+        np.save(os.path.join(directory, FACES_FILE), np.ascontiguousarray(faces))
+        return cls(kind="indexed", path=directory, faces=len(faces))
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Memory-mapped (vertices, faces) of an "indexed" source."""
+        if self.kind != "indexed":
+            raise ValueError("Only indexed sources have vertex/face arrays")
+        return (
+            np.load(os.path.join(self.path, VERTICES_FILE), mmap_mode="r"),
+            np.load(os.path.join(self.path, FACES_FILE), mmap_mode="r"),
+        )
+
+    def load(self, start: int, stop: int) -> np.ndarray:
+        """Return faces [start, stop) as an (n, 3, 3) triangle array."""
+        if self.kind == "stl":
+            return stl.open_binary_stl(self.path, self.faces)["vertices"][start:stop]
+        vertices = np.load(os.path.join(self.path, VERTICES_FILE), mmap_mode="r")
+        faces = np.load(os.path.join(self.path, FACES_FILE), mmap_mode="r")
+        return vertices[np.asarray(faces[start:stop])]
@@ -0,0 +1,111 @@
+"""
+Additive triangle reductions — bounds, signed volume, surface area,
+horizontal skin area and wall area.
+
+Every partial result can be merged with another, so the same kernel serves
+the single-threaded chunk loop and the parallel process-pool reduction.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Faces per vectorized pass: ~12 MB of float32 input, a few times that in temporaries
+DEFAULT_CHUNK_FACES = 1 << 18
+
+# Faces tilted at most this far from horizontal are printed as top/bottom skin
+SKIN_MAX_TILT_DEG = 45.0
+_SKIN_MIN_NZ = float(np.cos(np.radians(SKIN_MAX_TILT_DEG)))
+
+
+@dataclass
+class TriangleStats:
+    """Additive partial reduction over a set of triangles."""
+    faces: int
+    bounds_min: np.ndarray  # (3,)
+    bounds_max: np.ndarray  # (3,)
+    signed_volume: float
+    area: float
+    skin_area: float = 0.0  # XY-projected area of near-horizontal faces, top and bottom
+    wall_area: float = 0.0  # surface area of the other faces, printed as perimeters
+
+    @property
+    def dims(self) -> tuple[float, float, float]:
+        d = self.bounds_max - self.bounds_min
+        return float(d[0]), float(d[1]), float(d[2])
+
+    @property
+    def volume(self) -> float:
+        return abs(self.signed_volume)
+
+
+def empty_stats() -> TriangleStats:
+    return TriangleStats(
+        faces=0,
+        bounds_min=np.full(3, np.inf),
+        bounds_max=np.full(3, -np.inf),
+        signed_volume=0.0,
+        area=0.0,
+        skin_area=0.0,
+        wall_area=0.0,
+    )
+
+
+def merge_stats(a: TriangleStats, b: TriangleStats) -> TriangleStats:
+    return TriangleStats(
+        faces=a.faces + b.faces,
+        bounds_min=np.minimum(a.bounds_min, b.bounds_min),
+        bounds_max=np.maximum(a.bounds_max, b.bounds_max),
+        signed_volume=a.signed_volume + b.signed_volume,
+        area=a.area + b.area,
+        skin_area=a.skin_area + b.skin_area,
+        wall_area=a.wall_area + b.wall_area,
+    )
+
+
+def reduce_triangles(tri: np.ndarray) -> TriangleStats:
+    """Reduce an (n, 3, 3) triangle array to bounds, signed volume, area, skin and wall area."""
+    if len(tri) == 0:
+        return empty_stats()
+    tri = np.asarray(tri, dtype=np.float64)
+    flat = tri.reshape(-1, 3)
+    v0, v1, v2 = tri[:, 0], tri[:, 1], tri[:, 2]
+    # Signed tetrahedron volumes against the origin (divergence theorem)
+    signed = np.einsum("ij,ij->", v0, np.cross(v1, v2)) / 6.0
+    # Face normals (twice the area), written out per component — np.cross is several times slower
+    e1, e2 = v1 - v0, v2 - v0
+    nx = e1[:, 1] * e2[:, 2] - e1[:, 2] * e2[:, 1]
+    ny = e1[:, 2] * e2[:, 0] - e1[:, 0] * e2[:, 2]
+    nz = np.abs(e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0])
+    double_area = np.sqrt(nx * nx + ny * ny + nz * nz)
+    area = double_area.sum() / 2.0
+    # |nz| / 2 is the face's XY projection; faces near horizontal become skin,
+    # the rest are walls (their true area: perimeters follow the surface)
+    skin = nz >= _SKIN_MIN_NZ * double_area
+    skin_area = nz[skin].sum() / 2.0
+    wall_area = double_area[~skin].sum() / 2.0
+    return TriangleStats(
+        faces=len(tri),
+        bounds_min=flat.min(axis=0),
+        bounds_max=flat.max(axis=0),
+        signed_volume=float(signed),
+        area=float(area),
+        skin_area=float(skin_area),
+        wall_area=float(wall_area),
+    )
+
+
+def reduce_source(source, start: int = 0, stop: int | None = None,
+                  chunk_faces: int = DEFAULT_CHUNK_FACES, on_progress=None) -> TriangleStats:
+    """
+    Reduce faces [start, stop) of a TriangleSource in bounded-memory chunks.
+    `on_progress(fraction)` is called after every chunk.
+    """
+    stop = source.faces if stop is None else stop
+    stats = empty_stats()
+    for lo in range(start, stop, chunk_faces):
+        hi = min(lo + chunk_faces, stop)
+        stats = merge_stats(stats, reduce_triangles(source.load(lo, hi)))
+        if on_progress is not None:
+            on_progress((hi - start) / (stop - start))
+    return stats
@@ -0,0 +1,71 @@
+"""
+Binary STL fast path — memory-maps the file as a NumPy structured array so
+facet records can be reduced chunk by chunk (see geometry.stats) without a
+trimesh object; peak memory is bounded by the chunk size, not the file size.
+"""
+
+import os
+
+import numpy as np
+
+HEADER_SIZE = 80
+COUNT_SIZE = 4
+RECORD_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+def binary_stl_face_count(path: str) -> int | None:
+    """
+    Return the face count if `path` is a well-formed binary STL, else None.
+    The size check is authoritative — many binary exporters also start the
+    header with "solid", so the ASCII keyword alone proves nothing.
+    """
+    size = os.path.getsize(path)
+    if size < HEADER_SIZE + COUNT_SIZE:
+        return None
+    with open(path, "rb") as f:
+        f.seek(HEADER_SIZE)
+        count = int(np.frombuffer(f.read(COUNT_SIZE), dtype="<u4")[0])
+    if size != HEADER_SIZE + COUNT_SIZE + count * RECORD_DTYPE.itemsize:
+        return None
+    return count
+
+
+def open_binary_stl(path: str, count: int | None = None) -> np.ndarray:
+    """Memory-map the facet records of a binary STL (read-only)."""
+    if count is None:
+        count = binary_stl_face_count(path)
+        if count is None:
+            raise ValueError("Not a binary STL file")
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(
+        path, dtype=RECORD_DTYPE, mode="r",
+        offset=HEADER_SIZE + COUNT_SIZE, shape=(count,),
+    )
+
+
+def write_binary_stl(path: str, vertices: np.ndarray, faces: np.ndarray,
+                     header: bytes = b"", chunk_faces: int = 1_000_000) -> int:
+    """
+    Write an indexed mesh as binary STL (float32, unit normals, zero
+    attribute bytes), chunk by chunk so the record array never holds the
+    whole file. Returns the number of bytes written.
+    """
+    count = len(faces)
+    vertices = np.asarray(vertices, dtype=np.float64)
+    with open(path, "wb") as f:
+        f.write(header[:HEADER_SIZE].ljust(HEADER_SIZE, b"\0"))
+        f.write(np.uint32(count).tobytes())
+        for lo in range(0, count, chunk_faces):
+            tri = vertices[faces[lo:lo + chunk_faces]]
+            normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+            length = np.linalg.norm(normals, axis=1, keepdims=True)
+            records = np.zeros(len(tri), dtype=RECORD_DTYPE)
+            records["normal"] = np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+            records["vertices"] = tri
+            f.write(records.tobytes())
+    return HEADER_SIZE + COUNT_SIZE + count * RECORD_DTYPE.itemsize
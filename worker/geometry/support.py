@@ -0,0 +1,89 @@
+"""
+Support volume from overhangs, on an XY height field.
+
+Faces whose normal points down past the overhang angle need support; faces
+pointing up are what the support can stand on. Both are rasterized onto a
+grid of cell centres (see geometry.raster). Each overhang sample then drops
+a column to the nearest up-facing sample below it in the same cell — the
+part below — or to the build plate. One lexsort over all samples finds those
+neighbours, so the cost is linear in the covered cells rather than in
+faces × cells.
+
+Samples are produced per face range, so chunks can be rasterized in
+separate processes and merged by `support_volume`.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from geometry.raster import Grid, face_normal_z, rasterize
+from geometry.source import TriangleSource
+from geometry.stats import DEFAULT_CHUNK_FACES
+
+
+@dataclass(frozen=True)
+class SupportGrid(Grid):
+    z_min: float = 0.0      # build plate
+    min_nz: float = 0.0     # overhang faces have normal z below -min_nz
+    inverted: bool = False  # inside-out mesh: flip face normals
+
+    @classmethod
+    def for_bounds(cls, bounds_min, bounds_max, cell: float, max_cells: int,
+                   overhang_angle: float, inverted: bool = False) -> "SupportGrid":
+        return cls.fit(
+            bounds_min, bounds_max, cell, max_cells,
+            z_min=float(bounds_min[2]),
+            # Overhang angle is measured from vertical: 45° -> normals within 45° of straight down
+            min_nz=math.sin(math.radians(overhang_angle)),
+            inverted=inverted,
+        )
+
+
+def support_samples(source: TriangleSource, grid: SupportGrid, start: int = 0, stop: int | None = None,
+                    chunk_faces: int = DEFAULT_CHUNK_FACES) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rasterize faces [start, stop); returns (cell, z, is_overhang) samples."""
+    stop = source.faces if stop is None else stop
+    cells, heights, overhang = [], [], []
+
+    for lo in range(start, stop, chunk_faces):
+        tri = np.asarray(source.load(lo, min(lo + chunk_faces, stop)), dtype=np.float64)
+        nz = face_normal_z(tri)
+        if grid.inverted:
+            nz = -nz
+
+        for mask, is_overhang in ((nz > 0, False), (nz < -grid.min_nz, True)):
+            if mask.any():
+                cell, z = rasterize(tri[mask], grid)
+                cells.append(cell)
+                heights.append(z)
+                overhang.append(np.full(len(cell), is_overhang))
+
+    if not cells:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=bool)
+    return np.concatenate(cells), np.concatenate(heights), np.concatenate(overhang)
+
+
+def support_volume(samples: list[tuple[np.ndarray, np.ndarray, np.ndarray]], grid: SupportGrid) -> float:
+    """Sum the support columns under every overhang sample, mm³."""
+    cell = np.concatenate([s[0] for s in samples])
+    z = np.concatenate([s[1] for s in samples])
+    overhang = np.concatenate([s[2] for s in samples])
+    if not overhang.any():
+        return 0.0
+
+    # By cell, then height; on equal height the surface below sorts first
+    order = np.lexsort((overhang, z, cell))
+    cell, z, overhang = cell[order], z[order], overhang[order]
+
+    # Index of the latest up-facing sample at or before each position
+    positions = np.arange(len(cell))
+    below = np.maximum.accumulate(np.where(overhang, -1, positions))
+
+    src = positions[overhang]
+    prev = below[src]
+    grounded = (prev < 0) | (cell[np.maximum(prev, 0)] != cell[src])
+    floor = np.where(grounded, grid.z_min, z[np.maximum(prev, 0)])
+    columns = np.maximum(z[src] - floor, 0.0)
+    return float(columns.sum() * grid.cell * grid.cell)
@@ -0,0 +1,169 @@
+"""
+CPU-only thumbnail rendering: an orthographic, flat-shaded z-buffer
+rasterizer in NumPy, encoded straight to PNG (zlib + struct, no imaging
+library, no GPU or display).
+
+Every (triangle, covered pixel) pair is expanded with np.repeat over the
+triangle's pixel bbox and tested with edge functions at pixel centers, so a
+chunk rasterizes in a handful of array passes. Triangles no bigger than a
+pixel or two — nearly all of them on a dense mesh — skip that and are
+splatted at their centroid, as are slivers that miss every pixel center, so
+dense meshes render fast and without holes. The depth test is one
+np.minimum.at into the z-buffer followed by a comparison against it.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+# Camera: looking down at the front-right corner (azimuth 45°, elevation 30°)
+_AZIMUTH = np.radians(45.0)
+_ELEVATION = np.radians(30.0)
+_LIGHT = np.array([-0.3, 0.5, 0.8])  # in view space, roughly over the viewer's left shoulder
+
+BASE_COLOR = np.array([79, 110, 247], dtype=np.float64)  # matches the viewer's mesh color
+AMBIENT = 0.35
+
+
+def _view_rotation() -> np.ndarray:
+    """World -> view rotation; view x right, y up, z towards the camera."""
+    ca, sa = np.cos(_AZIMUTH), np.sin(_AZIMUTH)
+    ce, se = np.cos(_ELEVATION), np.sin(_ELEVATION)
+    spin = np.array([[ca, sa, 0.0], [-sa, ca, 0.0], [0.0, 0.0, 1.0]])  # about Z
+    # Z up -> y up, then tilt the camera down by the elevation
+    tilt = np.array([[1.0, 0.0, 0.0], [0.0, se, ce], [0.0, -ce, se]])
+    return tilt @ spin
+
+
+def _fit(bounds_min: np.ndarray, bounds_max: np.ndarray, rotation: np.ndarray, size: int, margin: float):
+    """Scale and offset mapping view xy of the bbox into the image with a margin."""
+    corners = np.array(np.meshgrid(*zip(bounds_min, bounds_max))).reshape(3, -1).T @ rotation.T
+    lo, hi = corners.min(axis=0), corners.max(axis=0)
+    span = max(float((hi - lo)[:2].max()), 1e-9)
+    scale = size * (1.0 - 2.0 * margin) / span
+    offset = size / 2.0 - scale * (lo[:2] + hi[:2]) / 2.0
+    return scale, offset
+
+
+def _splat(x: np.ndarray, y: np.ndarray, z: np.ndarray, size: int):
+    """Pixel index and depth of each triangle's centroid."""
+    px = np.clip((x.sum(axis=1) / 3).astype(np.int64), 0, size - 1)
+    py = np.clip((y.sum(axis=1) / 3).astype(np.int64), 0, size - 1)
+    return py * size + px, z.sum(axis=1) / 3
+
+
+def _raster_chunk(x: np.ndarray, y: np.ndarray, z: np.ndarray, shade: np.ndarray, size: int):
+    """
+    (pixel index, depth, shade) samples of one chunk of screen-space triangles,
+    given as (n, 3) per-vertex x, y (pixels) and z (depth) arrays.
+    """
+    # Range of pixel centers (i + 0.5) inside each triangle's bbox
+    x_lo = np.maximum(np.ceil(np.minimum(np.minimum(x[:, 0], x[:, 1]), x[:, 2]) - 0.5), 0).astype(np.int64)
+    x_hi = np.minimum(np.floor(np.maximum(np.maximum(x[:, 0], x[:, 1]), x[:, 2]) - 0.5), size - 1).astype(np.int64)
+    y_lo = np.maximum(np.ceil(np.minimum(np.minimum(y[:, 0], y[:, 1]), y[:, 2]) - 0.5), 0).astype(np.int64)
+    y_hi = np.minimum(np.floor(np.maximum(np.maximum(y[:, 0], y[:, 1]), y[:, 2]) - 0.5), size - 1).astype(np.int64)
+    w = np.maximum(x_hi - x_lo + 1, 0)
+    counts = w * np.maximum(y_hi - y_lo + 1, 0)
+
+    # Triangles whose bbox holds at most one pixel center are at most a pixel
+    # on screen: the centroid splat is indistinguishable from rasterizing
+    # them, and on dense meshes that is nearly every triangle
+    small = counts <= 1
+    small_pixel, small_depth = _splat(x[small], y[small], z[small], size)
+    small_shade = shade[small]
+    big = np.flatnonzero(~small)
+    if not len(big):
+        return small_pixel, small_depth, small_shade
+
+    x, y, z, shade = x[big], y[big], z[big], shade[big]
+    x_lo, y_lo, w, counts = x_lo[big], y_lo[big], w[big], counts[big]
+    tri = np.repeat(np.arange(len(big)), counts)
+    local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    px = x_lo[tri] + local % w[tri]
+    py = y_lo[tri] + local // w[tri]
+    cx, cy = px + 0.5, py + 0.5
+
+    ax, bx, cx_ = x[tri, 0], x[tri, 1], x[tri, 2]
+    ay, by, cy_ = y[tri, 0], y[tri, 1], y[tri, 2]
+    # Edge functions; a pixel is inside when all three share the triangle's winding sign
+    e0 = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    e1 = (cx_ - bx) * (cy - by) - (cy_ - by) * (cx - bx)
+    e2 = (ax - cx_) * (cy - cy_) - (ay - cy_) * (cx - cx_)
+    area = e0 + e1 + e2
+    inside = ((e0 >= 0) & (e1 >= 0) & (e2 >= 0)) | ((e0 <= 0) & (e1 <= 0) & (e2 <= 0))
+    inside &= area != 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # e1, e2, e0 weight the vertices opposite each edge: a, b, c
+        depth = (e1 * z[tri, 0] + e2 * z[tri, 1] + e0 * z[tri, 2]) / area
+
+    # Slivers that miss every pixel center: splat them too
+    missed = np.bincount(tri[inside], minlength=len(big)) == 0
+    missed_pixel, missed_depth = _splat(x[missed], y[missed], z[missed], size)
+
+    return (
+        np.concatenate([small_pixel, (py * size + px)[inside], missed_pixel]),
+        np.concatenate([small_depth, depth[inside], missed_depth]),
+        np.concatenate([small_shade, shade[tri[inside]], shade[missed]]),
+    )
+
+
+def render(triangle_chunks, bounds_min: np.ndarray, bounds_max: np.ndarray,
+           size: int = 256, margin: float = 0.06) -> np.ndarray:
+    """RGBA (size, size, 4) uint8 image of the triangles; transparent background."""
+    rotation = _view_rotation()
+    scale, offset = _fit(np.asarray(bounds_min), np.asarray(bounds_max), rotation, size, margin)
+    light = _LIGHT / np.linalg.norm(_LIGHT)
+
+    zbuffer = np.full(size * size, np.inf)
+    color = np.zeros(size * size)  # shade of the nearest sample per pixel
+    for tri in triangle_chunks:
+        tri = np.asarray(tri, dtype=np.float64)
+        if not len(tri):
+            continue
+        # (n, 3) view-space coordinate per vertex; one (3, 3n) product keeps every row contiguous
+        vx, vy, vz = (rotation @ tri.reshape(-1, 3).T).reshape(3, -1, 3)
+
+        # Face normals, written out per component (np.cross is several times slower)
+        ux, uy, uz = vx[:, 1] - vx[:, 0], vy[:, 1] - vy[:, 0], vz[:, 1] - vz[:, 0]
+        wx, wy, wz = vx[:, 2] - vx[:, 0], vy[:, 2] - vy[:, 0], vz[:, 2] - vz[:, 0]
+        nx, ny, nz = uy * wz - uz * wy, uz * wx - ux * wz, ux * wy - uy * wx
+        length = np.sqrt(nx * nx + ny * ny + nz * nz)
+        # Two-sided Lambert, so open or inverted meshes still read correctly;
+        # degenerate faces get the ambient term only
+        lit = np.abs(nx * light[0] + ny * light[1] + nz * light[2]) / np.where(length > 0, length, np.inf)
+        shade = AMBIENT + (1.0 - AMBIENT) * lit
+
+        x = vx * scale + offset[0]
+        y = size - (vy * scale + offset[1])  # image rows grow downwards
+        z = -vz  # smaller = closer to the camera
+        pixel, depth, sample_shade = _raster_chunk(x, y, z, shade, size)
+
+        # Depth test against everything drawn so far, chunk by chunk
+        np.minimum.at(zbuffer, pixel, depth)
+        front = depth <= zbuffer[pixel]
+        color[pixel[front]] = sample_shade[front]
+
+    image = np.zeros((size * size, 4), dtype=np.uint8)
+    covered = np.isfinite(zbuffer)
+    image[covered, :3] = np.clip(BASE_COLOR * color[covered, None], 0, 255).astype(np.uint8)
+    image[covered, 3] = 255
+    return image.reshape(size, size, 4)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """8-bit RGBA PNG of an (h, w, 4) uint8 array."""
+    height, width = image.shape[:2]
+    # Filter type 0 (none) in front of every row
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)], axis=1)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+        _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)),
+        _png_chunk(b"IEND", b""),
+    ])
@@ -0,0 +1,111 @@
+"""
+Watertightness check and a hole-tolerant volume for broken meshes.
+
+`is_watertight` welds exactly-coincident vertices and checks that every
+directed edge occurs once and is matched by its reverse — i.e. the surface
+is closed and consistently wound. It reads the source chunk by chunk, twice
+(welded vertex set, then edges), keeping an int64 key per edge and an int32
+index per corner rather than the whole triangle soup.
+
+`ray_samples` / `ray_volume` integrate the winding number along vertical
+rays through a grid of cell centres: walking up a column, a down-facing hit
+enters the solid (+1) and an up-facing hit leaves it (-1); length is
+counted wherever the running winding number is positive. A hole only
+disturbs the columns that pass through it, unlike the divergence-theorem
+integral, which is off by the missing surface's whole flux.
+"""
+
+import numpy as np
+
+from geometry.raster import Grid, face_normal_z, rasterize
+from geometry.source import TriangleSource
+from geometry.stats import DEFAULT_CHUNK_FACES
+
+
+def _vertex_rows(tri: np.ndarray) -> np.ndarray:
+    """One opaque row per corner, so exactly-equal vertices compare equal."""
+    flat = np.ascontiguousarray(tri.reshape(-1, 3))
+    return flat.view(np.dtype((np.void, flat.dtype.itemsize * 3))).ravel()
+
+
+def weld(tri: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(unique vertices, (n, 3) faces) from a triangle soup, merging exact duplicates."""
+    flat = np.ascontiguousarray(tri.reshape(-1, 3))
+    _, first, inverse = np.unique(_vertex_rows(flat), return_index=True, return_inverse=True)
+    return flat[first], inverse.reshape(-1, 3)
+
+
+def is_watertight(source: TriangleSource, chunk_faces: int = DEFAULT_CHUNK_FACES) -> bool:
+    """Closed, consistently wound surface (every edge shared by exactly two faces, opposite directions)."""
+    if source.faces == 0:
+        return False
+    ranges = [(lo, min(lo + chunk_faces, source.faces)) for lo in range(0, source.faces, chunk_faces)]
+
+    # Welded per chunk first; each vertex is shared by ~6 corners, so the chunk
+    # sets are small and only they are looked up in the global set
+    chunks = []
+    for lo, hi in ranges:
+        rows, inverse = np.unique(_vertex_rows(source.load(lo, hi)), return_inverse=True)
+        chunks.append((rows, inverse.astype(np.int32)))  # a chunk has far fewer than 2^31 corners
+    vertices = np.unique(np.concatenate([rows for rows, _ in chunks]))
+    n = len(vertices)
+
+    forward = np.empty(3 * source.faces, dtype=np.int64)
+    for (lo, hi), (rows, inverse) in zip(ranges, chunks):
+        faces = np.searchsorted(vertices, rows).astype(np.int64)[inverse].reshape(-1, 3)
+        a = faces.ravel()
+        b = faces[:, [1, 2, 0]].ravel()
+        if np.any(a == b):
+            return False  # degenerate faces after welding
+        forward[3 * lo:3 * hi] = a * n + b
+
+    forward.sort()
+    if np.any(forward[1:] == forward[:-1]):
+        return False  # an edge used twice in the same direction
+    reverse = np.sort((forward % n) * n + forward // n)
+    return np.array_equal(forward, reverse)
+
+
+def ray_samples(source: TriangleSource, grid: Grid, start: int = 0, stop: int | None = None,
+                chunk_faces: int = DEFAULT_CHUNK_FACES) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rasterize faces [start, stop); returns (cell, z, winding step) samples."""
+    stop = source.faces if stop is None else stop
+    cells, heights, steps = [], [], []
+
+    for lo in range(start, stop, chunk_faces):
+        tri = np.asarray(source.load(lo, min(lo + chunk_faces, stop)), dtype=np.float64)
+        nz = face_normal_z(tri)
+        for mask, step in ((nz < 0, 1), (nz > 0, -1)):
+            if mask.any():
+                cell, z = rasterize(tri[mask], grid)
+                cells.append(cell)
+                heights.append(z)
+                steps.append(np.full(len(cell), step, dtype=np.int64))
+
+    if not cells:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int64)
+    return np.concatenate(cells), np.concatenate(heights), np.concatenate(steps)
+
+
+def ray_volume(samples: list[tuple[np.ndarray, np.ndarray, np.ndarray]], grid: Grid,
+               inverted: bool = False) -> float:
+    """Length inside the solid summed over all columns, times the cell area."""
+    cell = np.concatenate([s[0] for s in samples])
+    z = np.concatenate([s[1] for s in samples])
+    step = np.concatenate([s[2] for s in samples])
+    if len(cell) < 2:
+        return 0.0
+    if inverted:
+        step = -step
+
+    order = np.lexsort((z, cell))
+    cell, z, step = cell[order], z[order], step[order]
+
+    # Running winding number, restarted at every column
+    winding = np.cumsum(step)
+    column_start = np.r_[True, cell[1:] != cell[:-1]]
+    offset = np.maximum.accumulate(np.where(column_start, np.arange(len(cell)), 0))
+    winding = winding - (winding[offset] - step[offset])
+
+    inside = (winding[:-1] > 0) & (cell[1:] == cell[:-1])
+    return float((z[1:] - z[:-1])[inside].sum() * grid.cell * grid.cell)
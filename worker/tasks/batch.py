@@ -0,0 +1,52 @@
+"""
+Chord callback of a bulk archive upload: runs once every process_model task
+of the batch has finished and closes the batch. The combined quote itself is
+priced by the server (GET /api/batches/{id}/quote) from the stored analyses.
+
+A member revoked before it ran (its model was replaced or deleted) or killed
+by the time limit makes the chord fail with ChordError instead of calling
+finalize_batch; its errback, finalize_failed_batch, closes the batch then.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+
+from tasks.celery_app import celery_app
+from tasks.db import SessionLocal, models_table, projects_table, upload_batches_table
+
+
+def _close_batch(session, batch_id: str, failed: int) -> None:
+    session.execute(
+        update(upload_batches_table)
+        .where(upload_batches_table.c.id == uuid.UUID(batch_id))
+        .values(status="done", failed_count=failed, finished_at=datetime.now(timezone.utc))
+    )
+    session.commit()
+
+
+@celery_app.task(name="tasks.finalize_batch")
+def finalize_batch(results: list[dict], batch_id: str):
+    """Mark the batch done and record how many of its files failed to process."""
+    failed = sum(1 for result in results if not result or result.get("status") != "done")
+
+    with SessionLocal() as session:
+        _close_batch(session, batch_id, failed)
+
+    print(f"Batch {batch_id} finished: {len(results)} files, {failed} failed")
+    return {"status": "done", "files": len(results), "failed": failed}
+
+
+@celery_app.task(name="tasks.finalize_failed_batch")
+def finalize_failed_batch(request, exc, traceback, batch_id: str):
+    """Errback of finalize_batch: the chord failed, so count failures from the models left in the batch."""
+    with SessionLocal() as session:
+        failed = session.execute(
+            select(func.count())
+            .select_from(models_table.join(projects_table, models_table.c.project_id == projects_table.c.id))
+            .where(projects_table.c.batch_id == uuid.UUID(batch_id), models_table.c.status == "error")
+        ).scalar_one()
+        _close_batch(session, batch_id, failed)
+
+    print(f"Batch {batch_id} finished after a chord error ({exc}): {failed} failed")
@@ -1,8 +1,38 @@
 import os
 from celery import Celery
+from kombu import Queue
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
+# Jobs are routed by mesh size (the server sniffs the upload header) so a
+# 100 MB mesh never sits in front of small quotes. Each queue is consumed by
+# its own worker pool, selected with WORKER_QUEUE, with its own limits.
+QUEUE_SMALL = "small"
+QUEUE_LARGE = "large"
+LARGE_MESH_FACES = int(os.getenv("LARGE_MESH_FACES", "300000"))
+
+QUEUE_LIMITS = {
+    QUEUE_SMALL: {
+        "concurrency": int(os.getenv("WORKER_SMALL_CONCURRENCY", "4")),
+        "max_memory_per_child_mb": int(os.getenv("WORKER_SMALL_MAX_MEMORY_MB", "512")),
+        "time_limit_s": int(os.getenv("WORKER_SMALL_TIME_LIMIT_S", "300")),
+    },
+    QUEUE_LARGE: {
+        "concurrency": int(os.getenv("WORKER_LARGE_CONCURRENCY", "1")),
+        "max_memory_per_child_mb": int(os.getenv("WORKER_LARGE_MAX_MEMORY_MB", "8192")),
+        "time_limit_s": int(os.getenv("WORKER_LARGE_TIME_LIMIT_S", "3600")),
+    },
+}
+
+# Empty = consume every queue (single-worker dev setups)
+WORKER_QUEUE = os.getenv("WORKER_QUEUE", "")
+
+
+def queue_for(faces: int) -> str:
+    """Queue for follow-up work on a mesh of `faces` triangles."""
+    return QUEUE_LARGE if faces >= LARGE_MESH_FACES else QUEUE_SMALL
+
+
 celery_app = Celery(
     "worker",
     broker=REDIS_URL,
@@ -19,5 +49,16 @@ celery_app.conf.update(
     task_acks_late=True,
     worker_prefetch_multiplier=1,
     broker_connection_retry_on_startup=True,
-    imports=["tasks.process_model"],
+    task_queues=[Queue(name) for name in (WORKER_QUEUE.split(",") if WORKER_QUEUE else QUEUE_LIMITS)],
+    task_default_queue=QUEUE_SMALL,
+    imports=["tasks.process_model", "tasks.preview", "tasks.batch"],
 )
+
+if WORKER_QUEUE in QUEUE_LIMITS:
+    limits = QUEUE_LIMITS[WORKER_QUEUE]
+    celery_app.conf.update(
+        worker_concurrency=limits["concurrency"],
+        # KiB; a child that grows past this is replaced after its current task
+        worker_max_memory_per_child=limits["max_memory_per_child_mb"] * 1024,
+        task_time_limit=limits["time_limit_s"],
+    )
@@ -0,0 +1,126 @@
+"""
+Sync DB access for the Celery worker (Celery doesn't support async).
+
+Tables are mirrored with raw SQLAlchemy Core to avoid depending on the
+server app; keep the columns in step with server/app/models.
+"""
+
+import os
+
+from sqlalchemy import (
+    Column, String, Float, Integer, Boolean, DateTime, JSON, LargeBinary, MetaData, Table, create_engine,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import sessionmaker
+
+DATABASE_URL_SYNC = os.getenv(
+    "DATABASE_URL_SYNC", "postgresql://postgres:postgres@db:5432/calculator"
+)
+engine = create_engine(DATABASE_URL_SYNC)
+SessionLocal = sessionmaker(bind=engine)
+
+metadata = MetaData()
+
+models_table = Table(
+    "models",
+    metadata,
+    Column("id", PG_UUID(as_uuid=True), primary_key=True),
+    Column("project_id", PG_UUID(as_uuid=True)),
+    Column("filename", String),
+    Column("original_name", String),
+    Column("format", String),
+    Column("status", String),
+    Column("task_id", String),
+    Column("file_hash", String),
+    Column("dim_x", Float),
+    Column("dim_y", Float),
+    Column("dim_z", Float),
+    Column("volume", Float),
+    Column("surface_area", Float),
+    Column("skin_area", Float),
+    Column("wall_area", Float),
+    Column("polygons", Integer),
+    Column("print_time_fdm_h", Float),
+    Column("print_time_sla_h", Float),
+    Column("print_time_metal_h", Float),
+    Column("support_volume", Float),
+    Column("mesh_quality", String),
+    Column("body_count", Integer),
+    Column("orientation_rx", Float),
+    Column("orientation_ry", Float),
+    Column("orientation_rz", Float),
+    Column("oriented_height", Float),
+    Column("oriented_support_area", Float),
+    Column("oriented_footprint", Float),
+    Column("error_message", String),
+    Column("preview_ready", Boolean),
+    Column("thumbnail_ready", Boolean),
+    Column("canonical_ready", Boolean),
+    Column("shape_descriptor", LargeBinary),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+projects_table = Table(
+    "projects",
+    metadata,
+    Column("id", PG_UUID(as_uuid=True), primary_key=True),
+    Column("user_id", PG_UUID(as_uuid=True)),
+    Column("batch_id", PG_UUID(as_uuid=True)),
+)
+
+model_bodies_table = Table(
+    "model_bodies",
+    metadata,
+    Column("id", PG_UUID(as_uuid=True), primary_key=True),
+    Column("model_id", PG_UUID(as_uuid=True)),
+    Column("index", Integer),
+    Column("name", String),
+    Column("dim_x", Float),
+    Column("dim_y", Float),
+    Column("dim_z", Float),
+    Column("volume", Float),
+    Column("polygons", Integer),
+    Column("mesh_quality", String),
+)
+
+upload_batches_table = Table(
+    "upload_batches",
+    metadata,
+    Column("id", PG_UUID(as_uuid=True), primary_key=True),
+    Column("status", String),
+    Column("file_count", Integer),
+    Column("failed_count", Integer),
+    Column("finished_at", DateTime(timezone=True)),
+)
+
+geometry_cache_table = Table(
+    "geometry_cache",
+    metadata,
+    Column("sha256", String, primary_key=True),
+    Column("analysis_version", Integer),
+    Column("dim_x", Float),
+    Column("dim_y", Float),
+    Column("dim_z", Float),
+    Column("volume", Float),
+    Column("surface_area", Float),
+    Column("skin_area", Float),
+    Column("wall_area", Float),
+    Column("polygons", Integer),
+    Column("print_time_fdm_h", Float),
+    Column("print_time_sla_h", Float),
+    Column("print_time_metal_h", Float),
+    Column("support_volume", Float),
+    Column("mesh_quality", String),
+    Column("body_count", Integer),
+    Column("orientation_rx", Float),
+    Column("orientation_ry", Float),
+    Column("orientation_rz", Float),
+    Column("oriented_height", Float),
+    Column("oriented_support_area", Float),
+    Column("oriented_footprint", Float),
+    Column("bodies", JSON),  # model_bodies rows, recreated on a cache hit
+    Column("shape_descriptor", LargeBinary),
+    Column("analysis_time_s", Float),
+    Column("hits", Integer),
+    Column("created_at", DateTime(timezone=True)),
+)
@@ -0,0 +1,150 @@
+"""
+Model status notifications over Redis pub/sub.
+
+The server's SSE endpoint (GET /api/projects/{id}/model/events) subscribes to
+a model's channel and re-reads the row on every status message, so the
+payload is only a hint; a lost message delays the browser until the next one
+instead of corrupting anything. Progress messages (type "progress") are
+forwarded as they are, without touching the database.
+"""
+
+import json
+import os
+import time
+
+import redis
+
+from tasks.celery_app import REDIS_URL
+
+# Keep in step with server/app/services/status_events.py
+MODEL_STATUS_CHANNEL = "model_status:{model_id}"
+
+_redis = redis.Redis.from_url(REDIS_URL)
+
+
+def publish_model_status(model_id: str, status: str, **extra) -> None:
+    """Tell subscribers the Model row changed; never fails the task."""
+    try:
+        _redis.publish(
+            MODEL_STATUS_CHANNEL.format(model_id=model_id),
+            json.dumps({"model_id": model_id, "status": status, **extra}),
+        )
+    except redis.RedisError as exc:
+        print(f"Could not publish status of model {model_id}: {exc}")
+
+
+# A project that gained a shape descriptor is pushed onto the user's "added"
+# list; the server appends it to its in-memory similarity index on the next
+# lookup, and rebuilds the index (version bump) once the list gets long
+# (server/app/services/similarity.py)
+SIMILARITY_VERSION_KEY = "similarity_version:{user_id}"
+SIMILARITY_ADDED_KEY = "similarity_added:{user_id}"
+SIMILARITY_MAX_ADDED = 10_000
+
+
+def announce_similarity_descriptor(user_id, project_id) -> None:
+    try:
+        length = _redis.rpush(SIMILARITY_ADDED_KEY.format(user_id=user_id), str(project_id))
+        if length >= SIMILARITY_MAX_ADDED:
+            pipe = _redis.pipeline(transaction=True)
+            pipe.incr(SIMILARITY_VERSION_KEY.format(user_id=user_id))
+            pipe.delete(SIMILARITY_ADDED_KEY.format(user_id=user_id))
+            pipe.execute()
+    except redis.RedisError as exc:
+        print(f"Could not update the similarity index of user {user_id}: {exc}")
+
+
+# Set by the server when a model is re-uploaded or deleted (server/app/tasks.py)
+CANCEL_KEY = "model_cancel:{model_id}"
+
+
+class Cancelled(Exception):
+    """The model was superseded; stop without writing results."""
+
+
+def is_cancelled(model_id: str) -> bool:
+    try:
+        return bool(_redis.exists(CANCEL_KEY.format(model_id=model_id)))
+    except redis.RedisError as exc:
+        print(f"Could not check cancellation of model {model_id}: {exc}")
+        return False
+
+
+# Stage -> (start, end) percent of the whole analysis
+PROGRESS_STAGES = {
+    "load": (0, 10),
+    "bounds": (10, 20),
+    "volume": (20, 40),  # includes mesh repair
+    "print_time": (40, 65),
+    "support": (65, 85),
+    "orientation": (85, 100),
+}
+PROGRESS_KEY = "model_progress:{model_id}"
+PROGRESS_TTL_S = 3600
+PROGRESS_MIN_INTERVAL_S = float(os.getenv("PROGRESS_MIN_INTERVAL_S", "0.5"))
+
+
+class Progress:
+    """
+    Stage and percent of one analysis in a Redis hash (read by the status
+    endpoint), mirrored as a pub/sub hint for the SSE stream. Stage changes
+    are always written; updates within a stage at most every
+    PROGRESS_MIN_INTERVAL_S. Stage boundaries double as cancellation
+    checkpoints: stage() raises Cancelled once the model is superseded.
+    Wall time per stage is kept in `durations` (for the worker metrics).
+    A Progress without a model_id reports nothing.
+    """
+
+    def __init__(self, model_id: str | None = None):
+        self.model_id = model_id
+        self.current = None
+        self.durations: dict[str, float] = {}
+        self._written_at = 0.0
+        self._stage_started = None
+
+    def stage(self, name: str) -> None:
+        self.end_stage()
+        if self.model_id is not None and is_cancelled(self.model_id):
+            raise Cancelled(f"model {self.model_id} cancelled before {name}")
+        self.current = name
+        self._stage_started = time.perf_counter()
+        self._write(PROGRESS_STAGES[name][0], force=True)
+
+    def end_stage(self) -> None:
+        """Stop the clock of the current stage; the next stage() or clear() also does."""
+        if self._stage_started is not None:
+            elapsed = time.perf_counter() - self._stage_started
+            self.durations[self.current] = self.durations.get(self.current, 0.0) + elapsed
+            self._stage_started = None
+
+    def update(self, fraction: float) -> None:
+        start, end = PROGRESS_STAGES[self.current]
+        self._write(start + (end - start) * min(max(fraction, 0.0), 1.0))
+
+    def clear(self) -> None:
+        self.end_stage()
+        if self.model_id is None:
+            return
+        try:
+            _redis.delete(PROGRESS_KEY.format(model_id=self.model_id))
+        except redis.RedisError as exc:
+            print(f"Could not clear progress of model {self.model_id}: {exc}")
+
+    def _write(self, percent: float, force: bool = False) -> None:
+        now = time.monotonic()
+        if self.model_id is None or (not force and now - self._written_at < PROGRESS_MIN_INTERVAL_S):
+            return
+        self._written_at = now
+        key = PROGRESS_KEY.format(model_id=self.model_id)
+        fields = {"stage": self.current, "percent": round(percent, 1)}
+        try:
+            pipe = _redis.pipeline(transaction=False)
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, PROGRESS_TTL_S)
+            pipe.publish(
+                MODEL_STATUS_CHANNEL.format(model_id=self.model_id),
+                json.dumps({"model_id": self.model_id, "type": "progress", **fields}),
+            )
+            pipe.execute()
+        except redis.RedisError as exc:
+            print(f"Could not report progress of model {self.model_id}: {exc}")
@@ -0,0 +1,27 @@
+"""
+Ingest counters: uploads normalized to canonical binary STL and the bytes
+that saved, per source format, in Redis hashes shared by every worker.
+Read by GET /api/stats/ingest (server/app/services/ingest_stats.py).
+"""
+
+import redis
+
+from tasks.celery_app import REDIS_URL
+
+# Keep in step with server/app/services/ingest_stats.py
+INGEST_STATS_KEY = "ingest:{format}"  # hash: files, original_bytes, canonical_bytes
+
+_redis = redis.Redis.from_url(REDIS_URL)
+
+
+def record_ingest(format: str, original_bytes: int, canonical_bytes: int) -> None:
+    """Count one normalized upload; never fails the task."""
+    key = INGEST_STATS_KEY.format(format=format)
+    try:
+        pipe = _redis.pipeline(transaction=False)
+        pipe.hincrby(key, "files", 1)
+        pipe.hincrby(key, "original_bytes", original_bytes)
+        pipe.hincrby(key, "canonical_bytes", canonical_bytes)
+        pipe.execute()
+    except redis.RedisError as exc:
+        print(f"Could not record ingest of a .{format} upload: {exc}")
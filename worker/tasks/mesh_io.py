@@ -0,0 +1,266 @@
+"""
+Open any supported upload as a memory-mappable TriangleSource.
+
+Binary STL is mapped in place. Single-body ASCII STL and OBJ uploads are
+normalized at ingest to a canonical binary STL (derived/<sha256>/canonical.stl,
+see write_canonical), which the viewer and every later stage read instead
+of the text. Everything else is parsed once — ASCII STL
+and OBJ with the vectorized parsers in geometry.ascii_mesh, 3MF and whatever
+those decline with trimesh — and persisted as a mesh artifact next to the
+other derived files:
+
+    derived/<sha256>/mesh-v<MESH_ARTIFACT_VERSION>/
+        manifest.json            version, source hash/size, bodies
+        vertices.npy, faces.npy  the whole scene (all bodies, transforms applied)
+        body-<i>/                per-body arrays, multi-body scenes only
+
+Later analyses, re-processing and the preview stage memory-map the artifact
+instead of re-parsing the upload. The directory is content-addressed, so a
+changed upload gets a new one; a manifest that doesn't match the version or
+the file on disk is rebuilt, and artifacts of older versions are removed.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import trimesh
+
+from geometry import ascii_mesh, stl, watertight
+from geometry.source import TriangleSource
+from tasks.storage import canonical_path, derived_dir, file_sha256
+
+# Bump when the loader or the layout changes; older artifacts are rebuilt
+MESH_ARTIFACT_VERSION = 2
+MESH_ARTIFACT_PREFIX = "mesh-v"
+MANIFEST_FILE = "manifest.json"
+
+# Vectorized ASCII STL / OBJ parsing; off = always trimesh
+FAST_TEXT_PARSER = os.getenv("FAST_TEXT_PARSER", "true").lower() == "true"
+# Convert single-body ASCII STL / OBJ uploads to a canonical binary STL at ingest
+CANONICAL_STL = os.getenv("CANONICAL_STL", "true").lower() == "true"
+CANONICAL_FORMATS = ("stl", "obj")
+
+
+def load_bodies(file_path: str) -> list[tuple[str, trimesh.Trimesh]]:
+    """
+    Load every body of an upload as its own mesh, scene transforms applied.
+
+    3MF build items and OBJ `o` objects become separate bodies; single-mesh
+    files come back as one body. (The OBJ flag was renamed from
+    split_object to split_objects across trimesh versions; unknown keyword
+    arguments are ignored, so both are passed.)
+    """
+    scene = trimesh.load(
+        file_path, force="scene", group_material=False, split_object=True, split_objects=True
+    )
+    bodies = []
+    for node in scene.graph.nodes_geometry:
+        transform, geometry = scene.graph[node]
+        mesh = scene.geometry[geometry]
+        if not isinstance(mesh, trimesh.Trimesh) or len(mesh.faces) == 0:
+            continue
+        mesh = mesh.copy()
+        mesh.apply_transform(transform)
+        bodies.append((str(node), mesh))
+    return bodies
+
+
+def parse_bodies(file_path: str) -> list[tuple[str, np.ndarray, np.ndarray]]:
+    """(name, vertices, faces) per body; the fast text parsers first, trimesh for the rest."""
+    ext = file_path.rsplit(".", 1)[-1].lower()
+    if FAST_TEXT_PARSER and ext in ("stl", "obj"):
+        try:
+            return ascii_mesh.parse(file_path)
+        except ValueError as exc:
+            print(f"Fast parser declined {os.path.basename(file_path)} ({exc}); falling back to trimesh")
+    return [(name, mesh.vertices, mesh.faces) for name, mesh in load_bodies(file_path)]
+
+
+def is_binary_stl(file_path: str) -> bool:
+    return file_path.rsplit(".", 1)[-1].lower() == "stl" and stl.binary_stl_face_count(file_path) is not None
+
+
+def to_trimesh(source: TriangleSource) -> trimesh.Trimesh:
+    """In-memory copy of a source for the trimesh-based repair step; binary STL is welded into an indexed mesh."""
+    if source.kind != "indexed":
+        vertices, faces = watertight.weld(source.load(0, source.faces))
+        return trimesh.Trimesh(vertices=vertices.astype(np.float64), faces=faces, process=False)
+    vertices, faces = source.arrays()
+    return trimesh.Trimesh(vertices=vertices.copy(), faces=faces.copy(), process=False)
+
+
+class MeshArtifact:
+    """The persisted scene of one upload: a combined source plus one source per body."""
+
+    def __init__(self, directory: str, manifest: dict):
+        self.directory = directory
+        self.manifest = manifest
+
+    @property
+    def scene(self) -> TriangleSource:
+        return TriangleSource(kind="indexed", path=self.directory, faces=self.manifest["faces"])
+
+    @property
+    def bodies(self) -> list[tuple[str, TriangleSource]]:
+        """(name, source) per body; a single-body scene is its own body."""
+        if len(self.manifest["bodies"]) == 1:
+            return [(self.manifest["bodies"][0]["name"], self.scene)]
+        return [
+            (body["name"], TriangleSource(kind="indexed", path=os.path.join(self.directory, f"body-{index}"), faces=body["faces"]))
+            for index, body in enumerate(self.manifest["bodies"])
+        ]
+
+
+def _artifact_dir(file_hash: str) -> str:
+    return os.path.join(derived_dir(file_hash), f"{MESH_ARTIFACT_PREFIX}{MESH_ARTIFACT_VERSION}")
+
+
+def _read_manifest(directory: str) -> dict | None:
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_stale(file_hash: str) -> None:
+    """Drop artifacts written by older loader versions."""
+    parent = derived_dir(file_hash)
+    current = os.path.basename(_artifact_dir(file_hash))
+    for name in os.listdir(parent):
+        if name.startswith(MESH_ARTIFACT_PREFIX) and name != current and not name.endswith(".tmp"):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+
+def _nonempty_bodies(file_path: str) -> list[tuple[str, np.ndarray, np.ndarray]]:
+    return [body for body in parse_bodies(file_path) if len(body[2])]
+
+
+def _build(file_path: str, file_hash: str, directory: str,
+           bodies: list[tuple[str, np.ndarray, np.ndarray]] | None = None) -> dict:
+    """Parse the upload (unless already parsed) and write the artifact via a temp dir + rename."""
+    if bodies is None:
+        bodies = _nonempty_bodies(file_path)
+    if not bodies:
+        raise ValueError("Failed to load mesh or mesh is empty")
+
+    tmp = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    if len(bodies) == 1:
+        _, vertices, faces = bodies[0]
+    else:
+        # All bodies as one plate — what gets sliced, supported and previewed
+        offsets = np.cumsum([0] + [len(body_vertices) for _, body_vertices, _ in bodies[:-1]])
+        vertices = np.vstack([body_vertices for _, body_vertices, _ in bodies])
+        faces = np.vstack([body_faces + offset for (_, _, body_faces), offset in zip(bodies, offsets)])
+        for index, (_, body_vertices, body_faces) in enumerate(bodies):
+            TriangleSource.from_arrays(body_vertices, body_faces, os.path.join(tmp, f"body-{index}"))
+    TriangleSource.from_arrays(vertices, faces, tmp)
+
+    manifest = {
+        "version": MESH_ARTIFACT_VERSION,
+        "sha256": file_hash,
+        "source_size": os.path.getsize(file_path),
+        "faces": len(faces),
+        "bodies": [{"name": name, "faces": len(body_faces)} for name, _, body_faces in bodies],
+    }
+    with open(os.path.join(tmp, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f)
+
+    try:
+        os.replace(tmp, directory)
+    except OSError:
+        # Another worker published the same artifact first; keep theirs
+        shutil.rmtree(tmp, ignore_errors=True)
+        manifest = _read_manifest(directory) or manifest
+    _remove_stale(file_hash)
+    return manifest
+
+
+def open_artifact(file_path: str, file_hash: str | None = None,
+                  bodies: list[tuple[str, np.ndarray, np.ndarray]] | None = None) -> MeshArtifact:
+    """
+    Memory-map the upload's mesh artifact, building it on first use.
+
+    `file_hash` is the SHA-256 recorded at upload; it is recomputed when
+    missing or when the file on disk no longer matches the manifest.
+    `bodies` saves the parse when the caller already has them.
+    """
+    file_hash = file_hash or file_sha256(file_path)
+    directory = _artifact_dir(file_hash)
+    manifest = _read_manifest(directory)
+
+    if manifest is not None and manifest.get("source_size") != os.path.getsize(file_path):
+        # The file changed after it was hashed; address it by its actual content
+        file_hash = file_sha256(file_path)
+        directory = _artifact_dir(file_hash)
+        manifest = _read_manifest(directory)
+
+    if (
+        manifest is None
+        or manifest.get("version") != MESH_ARTIFACT_VERSION
+        or manifest.get("sha256") != file_hash
+    ):
+        shutil.rmtree(directory, ignore_errors=True)
+        manifest = _build(file_path, file_hash, directory, bodies)
+    return MeshArtifact(directory, manifest)
+
+
+def _has_canonical_form(file_path: str) -> bool:
+    return (
+        CANONICAL_STL
+        and file_path.rsplit(".", 1)[-1].lower() in CANONICAL_FORMATS
+        and not is_binary_stl(file_path)
+    )
+
+
+def write_canonical(file_path: str, file_hash: str | None = None) -> dict | None:
+    """
+    Normalize a text upload to the canonical binary STL, once per content hash.
+
+    Returns {"format", "original_bytes", "canonical_bytes"} when a file was
+    written, None otherwise: binary STL already is canonical, 3MF and
+    multi-body OBJ would lose their bodies (those get the mesh artifact,
+    built from the same parse), and an identical upload may have been
+    normalized before.
+    """
+    if not _has_canonical_form(file_path):
+        return None
+    file_hash = file_hash or file_sha256(file_path)
+    path = canonical_path(file_hash)
+    if os.path.exists(path):
+        return None
+
+    bodies = _nonempty_bodies(file_path)
+    if len(bodies) != 1:
+        open_artifact(file_path, file_hash, bodies)
+        return None
+
+    _, vertices, faces = bodies[0]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    size = stl.write_binary_stl(tmp, vertices, faces, header=b"canonical " + file_hash.encode())
+    os.replace(tmp, path)
+    return {
+        "format": file_path.rsplit(".", 1)[-1].lower(),
+        "original_bytes": os.path.getsize(file_path),
+        "canonical_bytes": size,
+    }
+
+
+def resolve_upload(file_path: str, file_hash: str | None = None) -> str:
+    """The file later stages read: the upload's canonical binary STL when it has one, else the upload."""
+    if not _has_canonical_form(file_path):
+        return file_path
+    path = canonical_path(file_hash or file_sha256(file_path))
+    return path if os.path.exists(path) else file_path
+
+
+def open_source(file_path: str, file_hash: str | None = None) -> TriangleSource:
+    """The whole scene of an upload: the (canonical) binary STL, or its mesh artifact."""
+    file_path = resolve_upload(file_path, file_hash)
+    if is_binary_stl(file_path):
+        return TriangleSource.from_binary_stl(file_path)
+    return open_artifact(file_path, file_hash).scene
@@ -0,0 +1,176 @@
+"""
+Prometheus metrics for the worker pipeline.
+
+Celery runs tasks in prefork children, so every metric lives in
+prometheus_client's multiprocess mode: each process writes its samples to
+memory-mapped files under PROMETHEUS_MULTIPROC_DIR, and the main worker
+process serves the merged view on WORKER_METRICS_PORT (0 = off). The
+directory is emptied when the worker starts, so a restart resets the
+counters like any other process restart would.
+
+Time spent queued is measured from the "enqueued_at" header stamped at
+publish time (here and in server/app/tasks.py). Peak memory is per task
+where Linux allows resetting the high-water mark (/proc/self/clear_refs),
+else the child's peak so far.
+"""
+
+import os
+import resource
+import shutil
+import time
+from contextlib import contextmanager
+
+# Multiprocess mode is chosen when prometheus_client is imported
+METRICS_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/worker-metrics")
+os.makedirs(METRICS_DIR, exist_ok=True)
+
+from celery import signals  # noqa: E402
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess, start_http_server  # noqa: E402
+
+from tasks.mesh_io import is_binary_stl  # noqa: E402
+
+METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "9808"))
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+FACES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 3e5, 1e6, 3e6, 1e7, 3e7, 1e8)
+BYTES_BUCKETS = (1e5, 1e6, 5e6, 1e7, 5e7, 1e8, 5e8, 1e9, 5e9)
+RSS_BUCKETS = (128e6, 256e6, 512e6, 1e9, 2e9, 4e9, 8e9, 16e9, 32e9)
+
+QUEUE_SECONDS = Histogram(
+    "worker_task_queue_seconds", "Time from publish to task start",
+    ["task", "queue"], buckets=SECONDS_BUCKETS,
+)
+TASK_SECONDS = Histogram(
+    "worker_task_seconds", "Task run time by final Celery state",
+    ["task", "state"], buckets=SECONDS_BUCKETS,
+)
+TASKS_RUNNING = Gauge(
+    "worker_tasks_running", "Tasks currently executing", ["task"], multiprocess_mode="livesum",
+)
+STAGE_SECONDS = Histogram(
+    "worker_model_stage_seconds", "process_model time per stage (ingest, analysis stages, db_write)",
+    ["stage"], buckets=SECONDS_BUCKETS,
+)
+MODEL_FACES = Histogram(
+    "worker_model_faces", "Face count of analyzed meshes", ["format"], buckets=FACES_BUCKETS,
+)
+MODEL_FILE_BYTES = Histogram(
+    "worker_model_file_bytes", "Upload size of processed models", ["format"], buckets=BYTES_BUCKETS,
+)
+MODEL_OUTCOMES = Counter(
+    "worker_model_outcomes", "process_model results (done, error, cancelled)", ["format", "outcome"],
+)
+MODEL_PEAK_RSS = Histogram(
+    "worker_model_peak_rss_bytes", "Peak resident memory of a process_model run", ["format"],
+    buckets=RSS_BUCKETS,
+)
+
+_task_started: dict[str, float] = {}
+
+
+def upload_format(file_path: str) -> str:
+    """Metric label for an upload: its extension, with ASCII STL told apart from binary."""
+    ext = file_path.rsplit(".", 1)[-1].lower()
+    try:
+        if ext == "stl" and not is_binary_stl(file_path):
+            return "stl-ascii"
+    except OSError:
+        pass
+    return ext
+
+
+def reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass  # not Linux, or not allowed; the process peak has to do
+
+
+def peak_rss_bytes() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+
+
+@contextmanager
+def timed(durations: dict, stage: str):
+    """Add the block's wall time to durations[stage]."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        durations[stage] = durations.get(stage, 0.0) + time.perf_counter() - started
+
+
+def record_model(fmt: str, outcome: str, file_path: str,
+                 faces: int | None = None, durations: dict | None = None) -> None:
+    """Observe one finished process_model run."""
+    MODEL_OUTCOMES.labels(fmt, outcome).inc()
+    try:
+        MODEL_FILE_BYTES.labels(fmt).observe(os.path.getsize(file_path))
+    except OSError:
+        pass  # deleted along with its model
+    if faces is not None:
+        MODEL_FACES.labels(fmt).observe(faces)
+    for stage, seconds in (durations or {}).items():
+        STAGE_SECONDS.labels(stage).observe(seconds)
+    MODEL_PEAK_RSS.labels(fmt).observe(peak_rss_bytes())
+
+
+@signals.before_task_publish.connect
+def _stamp_enqueued_at(headers=None, **kwargs):
+    # Follow-up tasks published by the worker (previews, chord callbacks)
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+@signals.task_prerun.connect
+def _task_prerun(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    TASKS_RUNNING.labels(task.name).inc()
+    # Message headers become request attributes; eager calls keep them in request.headers
+    enqueued_at = (
+        getattr(task.request, ENQUEUED_AT_HEADER, None)
+        or (task.request.headers or {}).get(ENQUEUED_AT_HEADER)
+    )
+    if enqueued_at is not None:
+        queue = (task.request.delivery_info or {}).get("routing_key") or "unknown"
+        QUEUE_SECONDS.labels(task.name, queue).observe(max(time.time() - float(enqueued_at), 0.0))
+
+
+@signals.task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    TASKS_RUNNING.labels(task.name).dec()
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@signals.worker_init.connect
+def _serve_metrics(**kwargs):
+    """Main worker process: drop the previous run's files and serve the merged registry."""
+    for name in os.listdir(METRICS_DIR):
+        path = os.path.join(METRICS_DIR, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+    if not METRICS_PORT:
+        return
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(METRICS_PORT, registry=registry)
+    print(f"Serving worker metrics on :{METRICS_PORT}/metrics")
+
+
+@signals.worker_process_shutdown.connect
+def _mark_dead(pid=None, **kwargs):
+    # Drops the child's live gauge files; its counters and histograms stay merged
+    multiprocess.mark_process_dead(pid or os.getpid())
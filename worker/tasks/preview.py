@@ -0,0 +1,85 @@
+"""
+Preview generation task — runs after process_model and writes a decimated,
+quantized mesh (see geometry.preview) that the browser viewer loads instead
+of the original upload, plus a software-rendered PNG thumbnail (see
+geometry.thumbnail) for the project list.
+"""
+
+import os
+import uuid
+import traceback
+
+from sqlalchemy import select, update
+
+from geometry import preview, thumbnail
+from geometry.stats import DEFAULT_CHUNK_FACES, reduce_source
+from tasks.celery_app import celery_app
+from tasks.db import SessionLocal, models_table
+from tasks.events import publish_model_status
+from tasks.mesh_io import open_source
+from tasks.storage import PREVIEW_FILENAME, THUMBNAIL_FILENAME, derived_dir, file_sha256, write_atomic
+
+PREVIEW_FACE_BUDGET = int(os.getenv("PREVIEW_FACE_BUDGET", "200000"))
+THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", "256"))
+
+
+def _source_chunks(source):
+    for lo in range(0, source.faces, DEFAULT_CHUNK_FACES):
+        yield source.load(lo, min(lo + DEFAULT_CHUNK_FACES, source.faces))
+
+
+@celery_app.task(name="tasks.generate_preview", bind=True, max_retries=1)
+def generate_preview(self, model_id: str, file_path: str):
+    """Decimate the model to PREVIEW_FACE_BUDGET faces, render its thumbnail and flag both on the Model row."""
+    model_uuid = uuid.UUID(model_id)
+
+    with SessionLocal() as session:
+        file_hash = session.execute(
+            select(models_table.c.file_hash).where(models_table.c.id == model_uuid)
+        ).scalar_one_or_none()
+
+    try:
+        if not file_hash:
+            # Rows created before uploads were hashed
+            file_hash = file_sha256(file_path)
+
+        out_path = os.path.join(derived_dir(file_hash), PREVIEW_FILENAME)
+        thumb_path = os.path.join(derived_dir(file_hash), THUMBNAIL_FILENAME)
+        if not os.path.exists(out_path) or not os.path.exists(thumb_path):
+            # Memory-mapped; ASCII/OBJ/3MF come from the artifact process_model left behind
+            source = open_source(file_path, file_hash)
+            stats = reduce_source(source)
+            if os.path.exists(out_path):
+                # Preview shared from an earlier upload; render the full mesh
+                triangle_chunks = _source_chunks(source)
+            else:
+                vertices, faces = preview.decimate(
+                    source, stats.bounds_min, stats.bounds_max, stats.area, PREVIEW_FACE_BUDGET
+                )
+                write_atomic(
+                    out_path,
+                    preview.encode(vertices, faces, stats.bounds_min, stats.bounds_max),
+                )
+                # At thumbnail size the decimated mesh is indistinguishable from the source
+                triangle_chunks = [vertices[faces]]
+            image = thumbnail.render(triangle_chunks, stats.bounds_min, stats.bounds_max, THUMBNAIL_SIZE)
+            write_atomic(thumb_path, thumbnail.encode_png(image))
+
+        with SessionLocal() as session:
+            session.execute(
+                update(models_table)
+                .where(models_table.c.id == model_uuid)
+                .values(file_hash=file_hash, preview_ready=True, thumbnail_ready=True)
+            )
+            session.commit()
+        publish_model_status(model_id, "done", preview_ready=True, thumbnail_ready=True)
+
+        return {"status": "done", "preview": out_path, "thumbnail": thumb_path}
+
+    except Exception as exc:
+        # The viewer falls back to the original file and the list to a placeholder; don't touch the model status
+        error_msg = f"{type(exc).__name__}: {str(exc)}"
+        print(f"Error generating preview for model {model_id}: {error_msg}\n{traceback.format_exc()}")
+        # Still the preview's last word: status streams waiting for it can end
+        publish_model_status(model_id, "done", preview_failed=True)
+        return {"status": "error", "error": error_msg}
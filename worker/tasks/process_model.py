@@ -1,62 +1,342 @@
 """
-3D Model processing task — parses STL/OBJ/3MF using trimesh,
-extracts bounding box, volume, and face count, saves results to DB.
+3D Model processing task — parses STL/OBJ/3MF, extracts bounding box,
+volume, and face count, saves results to DB.
+
+Binary STL is analyzed straight from a memory map (see geometry.stl).
+Single-body ASCII STL and OBJ uploads are first normalized to a canonical
+binary STL and take the same path; multi-body OBJ and 3MF are parsed once
+and memory-mapped from a persisted mesh artifact afterwards (see
+tasks.mesh_io). Meshes above
+PARALLEL_FACE_THRESHOLD faces are reduced across a process pool
+(see geometry.parallel). Open meshes are repaired within a time budget
+before the volume step (see tasks.repair). Multi-body 3MF/OBJ scenes are
+analyzed body by body and aggregated. Single bodies also get a suggested
+build orientation (see geometry.orientation). Print time per technology is estimated by
+slicing the mesh (see geometry.slicer), support volume from overhangs on
+a height field (see geometry.support). Stage and percent complete are
+reported to Redis as the analysis runs (see tasks.events.Progress). A
+D2 shape descriptor is stored for near-duplicate search (see
+geometry.descriptor). Stage durations, sizes, outcomes and peak memory
+go to the Prometheus metrics (see tasks.metrics).
 """
 
 import os
+import time
 import uuid
 import traceback
 
 import trimesh
-from sqlalchemy import create_engine, update
-from sqlalchemy.orm import Session, sessionmaker
+from celery import signals
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 
-from tasks.celery_app import celery_app
+from geometry import descriptor, orientation, parallel, slicer, support, watertight
+from geometry.parallel import map_chunks, map_items, parallel_reduce
+from geometry.raster import Grid
+from geometry.source import TriangleSource
+from geometry.stats import TriangleStats, reduce_source
+from tasks import metrics, repair
+from tasks.celery_app import celery_app, queue_for
+from tasks.db import SessionLocal, models_table, model_bodies_table, geometry_cache_table, projects_table
+from tasks.events import Cancelled, Progress, announce_similarity_descriptor, is_cancelled, publish_model_status
+from tasks.ingest_stats import record_ingest
+from tasks.mesh_io import is_binary_stl, open_artifact, resolve_upload, to_trimesh, write_canonical
+from tasks.storage import canonical_path
 
-# Sync DB connection for Celery worker (Celery doesn't support async)
-DATABASE_URL_SYNC = os.getenv(
-    "DATABASE_URL_SYNC", "postgresql://postgres:postgres@db:5432/calculator"
-)
-engine = create_engine(DATABASE_URL_SYNC)
-SessionLocal = sessionmaker(bind=engine)
+# Face count at which bounds/volume/area switch to the parallel reduction
+PARALLEL_FACE_THRESHOLD = int(os.getenv("PARALLEL_FACE_THRESHOLD", "5000000"))
+PARALLEL_CHUNK_FACES = int(os.getenv("PARALLEL_CHUNK_FACES", "1000000"))
+PARALLEL_PROCESSES = int(os.getenv("PARALLEL_PROCESSES", "0"))  # 0 = cpu_count
+# Scenes with at least this many bodies and faces analyze the bodies across a process pool
+PARALLEL_MIN_BODIES = int(os.getenv("PARALLEL_MIN_BODIES", "4"))
+PARALLEL_MIN_SCENE_FACES = int(os.getenv("PARALLEL_MIN_SCENE_FACES", "500000"))
 
-# We need the Model table — import via raw SQLAlchemy to avoid app dependency issues
-from sqlalchemy import (
-    Column, String, Float, Integer, DateTime, MetaData, Table,
-)
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-
-metadata = MetaData()
-
-models_table = Table(
-    "models",
-    metadata,
-    Column("id", PG_UUID(as_uuid=True), primary_key=True),
-    Column("project_id", PG_UUID(as_uuid=True)),
-    Column("filename", String),
-    Column("original_name", String),
-    Column("format", String),
-    Column("status", String),
-    Column("dim_x", Float),
-    Column("dim_y", Float),
-    Column("dim_z", Float),
-    Column("volume", Float),
-    Column("polygons", Integer),
-    Column("error_message", String),
-    Column("created_at", DateTime(timezone=True)),
+
+@signals.worker_process_shutdown.connect
+def _close_pool(**kwargs):
+    # The chunk pool lives as long as this worker child (see geometry.parallel)
+    parallel.shutdown()
+
+
+# Bump whenever a change alters stored analysis results: geometry_cache rows
+# from older versions are ignored by the server and overwritten here. Must
+# match ANALYSIS_VERSION in server/app/services/analysis_cache.py
+ANALYSIS_VERSION = 2
+
+# Layer height the print-time slicer cuts at (per-technology layer heights are rescaled)
+SLICE_LAYER_HEIGHT_MM = float(os.getenv("SLICE_LAYER_HEIGHT_MM", "0.2"))
+
+# Height-field kernels (support, ray volume): overhang angle from vertical, cell size, resolution cap
+SUPPORT_OVERHANG_ANGLE = float(os.getenv("SUPPORT_OVERHANG_ANGLE", "45"))
+SUPPORT_CELL_MM = float(os.getenv("SUPPORT_CELL_MM", "0.5"))
+SUPPORT_MAX_CELLS = int(os.getenv("SUPPORT_MAX_CELLS", "1024"))  # per axis
+
+# Optional build-orientation search (single-body models): candidate counts and score weights
+ORIENT_ENABLED = os.getenv("ORIENT_ENABLED", "true").lower() == "true"
+ORIENT_FLAT_CANDIDATES = int(os.getenv("ORIENT_FLAT_CANDIDATES", "64"))
+ORIENT_SPHERE_CANDIDATES = int(os.getenv("ORIENT_SPHERE_CANDIDATES", "192"))
+ORIENT_WEIGHTS = tuple(float(w) for w in os.getenv("ORIENT_WEIGHTS", "1,1,0.25").split(","))  # height, support, footprint
+
+# Analysis keys stored on the Model row and in the geometry cache -> rounding digits
+PERSISTED_FIELDS = {
+    "dim_x": 4,
+    "dim_y": 4,
+    "dim_z": 4,
+    "volume": 6,
+    "surface_area": 4,
+    "skin_area": 4,
+    "wall_area": 4,
+    "polygons": None,
+    "print_time_fdm_h": 4,
+    "print_time_sla_h": 4,
+    "print_time_metal_h": 4,
+    "support_volume": 6,
+    "mesh_quality": None,
+    "body_count": None,
+    "orientation_rx": 4,
+    "orientation_ry": 4,
+    "orientation_rz": 4,
+    "oriented_height": 4,
+    "oriented_support_area": 4,
+    "oriented_footprint": 4,
+    "shape_descriptor": None,  # float32 bytes
+}
+
+ORIENTATION_FIELDS = (
+    "orientation_rx", "orientation_ry", "orientation_rz",
+    "oriented_height", "oriented_support_area", "oriented_footprint",
 )
 
+# Per-body columns of model_bodies (and entries of geometry_cache.bodies)
+BODY_FIELDS = {
+    "index": None,
+    "name": None,
+    "dim_x": 4,
+    "dim_y": 4,
+    "dim_z": 4,
+    "volume": 6,
+    "polygons": None,
+    "mesh_quality": None,
+}
+
+
+def _reduce(source: TriangleSource, on_progress=None) -> TriangleStats:
+    """Single-threaded chunk loop, or the process pool above the face threshold."""
+    if source.faces < PARALLEL_FACE_THRESHOLD:
+        return reduce_source(source, on_progress=on_progress)
+
+    stats, timings = parallel_reduce(
+        source, processes=PARALLEL_PROCESSES or None, chunk_faces=PARALLEL_CHUNK_FACES
+    )
+    for t in timings:
+        print(
+            f"parallel reduce chunk {t.index} [{t.start}:{t.stop}] "
+            f"{t.seconds * 1000:.1f} ms (pid {t.pid})"
+        )
+    return stats
+
+
+def _stats_to_analysis(stats: TriangleStats) -> dict:
+    dim_x, dim_y, dim_z = stats.dims
+    return {
+        "dim_x": dim_x,
+        "dim_y": dim_y,
+        "dim_z": dim_z,
+        "volume": stats.volume,
+        "surface_area": stats.area,
+        "skin_area": stats.skin_area,
+        "wall_area": stats.wall_area,
+        "polygons": stats.faces,
+    }
+
+
+def _ray_volume(source: TriangleSource, stats: TriangleStats, parallel: bool = True) -> float:
+    grid = Grid.fit(stats.bounds_min, stats.bounds_max, SUPPORT_CELL_MM, SUPPORT_MAX_CELLS)
+    if not parallel or source.faces < PARALLEL_FACE_THRESHOLD:
+        samples = [watertight.ray_samples(source, grid)]
+    else:
+        samples = map_chunks(
+            watertight.ray_samples, source, grid,
+            processes=PARALLEL_PROCESSES or None, chunk_faces=PARALLEL_CHUNK_FACES,
+        )
+    return watertight.ray_volume(samples, grid, inverted=stats.signed_volume < 0)
+
+
+def _resolve_volume(source: TriangleSource, stats: TriangleStats,
+                    mesh: trimesh.Trimesh | None, parallel: bool = True) -> tuple[float, str]:
+    """Volume and mesh quality flag, repairing open meshes within the step budget."""
+    if mesh is None:
+        # Binary STL: checked straight off the memory map, welded for repair only when open
+        completed, closed = repair.run_step("check", watertight.is_watertight, source)
+        if not completed:
+            return stats.volume, repair.QUALITY_UNVERIFIED
+        if closed:
+            return stats.volume, repair.QUALITY_OK
+        if source.faces <= repair.REPAIR_MAX_FACES:
+            _, mesh = repair.run_step("weld", to_trimesh, source)
+
+    if mesh is not None:
+        quality = repair.repair_mesh(mesh)
+        if quality == repair.QUALITY_REPAIRED:
+            return float(abs(mesh.volume)), quality
+        if quality == repair.QUALITY_OK:
+            return stats.volume, quality
+
+    completed, volume = repair.run_step("ray volume", _ray_volume, source, stats, parallel)
+    if completed:
+        return volume, repair.QUALITY_APPROXIMATE
+    return stats.volume, repair.QUALITY_UNVERIFIED
+
+
+def _estimate_print_times(source: TriangleSource, stats: TriangleStats, on_progress=None) -> dict:
+    """Slice at SLICE_LAYER_HEIGHT_MM and estimate print time per technology."""
+    layers = slicer.slice_source(
+        source, float(stats.bounds_min[2]), float(stats.bounds_max[2]), SLICE_LAYER_HEIGHT_MM,
+        on_progress=on_progress,
+    )
+    hours = slicer.estimate_print_hours(layers)
+    return {
+        "print_time_fdm_h": hours["FDM"],
+        "print_time_sla_h": hours["SLA"],
+        "print_time_metal_h": hours["Metal"],
+    }
+
+
+def _estimate_support(source: TriangleSource, stats: TriangleStats) -> dict:
+    """Support volume under overhangs past SUPPORT_OVERHANG_ANGLE, in the units of `volume`."""
+    grid = support.SupportGrid.for_bounds(
+        stats.bounds_min, stats.bounds_max, SUPPORT_CELL_MM, SUPPORT_MAX_CELLS,
+        SUPPORT_OVERHANG_ANGLE, inverted=stats.signed_volume < 0,
+    )
+    if source.faces < PARALLEL_FACE_THRESHOLD:
+        samples = [support.support_samples(source, grid)]
+    else:
+        samples = map_chunks(
+            support.support_samples, source, grid,
+            processes=PARALLEL_PROCESSES or None, chunk_faces=PARALLEL_CHUNK_FACES,
+        )
+    return {"support_volume": support.support_volume(samples, grid)}
+
+
+def _optimize_orientation(source: TriangleSource, stats: TriangleStats) -> dict:
+    """Best of a batch of candidate rotations by height, support area and footprint."""
+    result = orientation.optimize(
+        source, stats,
+        overhang_angle=SUPPORT_OVERHANG_ANGLE,
+        flat_count=ORIENT_FLAT_CANDIDATES,
+        sphere_count=ORIENT_SPHERE_CANDIDATES,
+        weights=ORIENT_WEIGHTS,
+    )
+    rx, ry, rz = result.euler_deg
+    return {
+        "orientation_rx": rx,
+        "orientation_ry": ry,
+        "orientation_rz": rz,
+        "oriented_height": result.height,
+        "oriented_support_area": result.support_area,
+        "oriented_footprint": result.footprint,
+    }
+
+
+def _analyze_body(body: tuple[int, str, TriangleSource]) -> dict:
+    """Dims, volume, face count and quality of one scene body (runs in a pool process for big scenes)."""
+    index, name, source = body
+    stats = reduce_source(source)
+    analysis = _stats_to_analysis(stats)
+    analysis["volume"], analysis["mesh_quality"] = _resolve_volume(source, stats, to_trimesh(source), parallel=False)
+    analysis.update(index=index, name=name)
+    return analysis
+
+
+def _analyze_bodies(sources: list[tuple[str, TriangleSource]]) -> list[dict]:
+    """Analyze every body on its own; across a process pool for big scenes."""
+    bodies = [(index, name, source) for index, (name, source) in enumerate(sources)]
+    # Largest first, so the biggest body is never the one left starting last
+    bodies.sort(key=lambda body: body[2].faces, reverse=True)
+    total_faces = sum(body[2].faces for body in bodies)
+    if len(bodies) >= PARALLEL_MIN_BODIES and total_faces >= PARALLEL_MIN_SCENE_FACES:
+        results = map_items(_analyze_body, bodies, processes=PARALLEL_PROCESSES or None)
+    else:
+        results = [_analyze_body(body) for body in bodies]
+    return sorted(results, key=lambda body: body["index"])
+
+
+def analyze_file(file_path: str, progress: Progress | None = None, file_hash: str | None = None) -> dict:
+    """Extract dimensions, volume, polygon count, print-time and support estimates from a model file."""
+    progress = progress or Progress()
+    progress.stage("load")
+
+    file_path = resolve_upload(file_path, file_hash)
+    if is_binary_stl(file_path):
+        # Fast path: chunked reduction over the memory-mapped facet records
+        source = TriangleSource.from_binary_stl(file_path)
+        bodies = []
+    else:
+        # Parsed on first use, memory-mapped from the artifact after that
+        artifact = open_artifact(file_path, file_hash)
+        source = artifact.scene
+        bodies = artifact.bodies
+
+    progress.stage("bounds")
+    stats = _reduce(source, progress.update)
+    if stats.faces == 0:
+        raise ValueError("Failed to load mesh or mesh is empty")
+
+    analysis = _stats_to_analysis(stats)
+    analysis["shape_descriptor"] = descriptor.describe(source, stats).tobytes()
+    progress.stage("volume")
+    if len(bodies) > 1:
+        # Per body, so overlapping bodies aren't merged into one broken solid
+        body_results = _analyze_bodies(bodies)
+        analysis["volume"] = sum(body["volume"] for body in body_results)
+        analysis["mesh_quality"] = repair.worst_quality(body["mesh_quality"] for body in body_results)
+    else:
+        body_results = []
+        mesh = to_trimesh(source) if bodies else None
+        analysis["volume"], analysis["mesh_quality"] = _resolve_volume(source, stats, mesh)
+    analysis["body_count"] = max(len(bodies), 1)
+    analysis["bodies"] = body_results
+
+    progress.stage("print_time")
+    analysis.update(_estimate_print_times(source, stats, progress.update))
+    progress.stage("support")
+    analysis.update(_estimate_support(source, stats))
+    if ORIENT_ENABLED and len(bodies) <= 1:
+        # A plate of several bodies has no single orientation
+        progress.stage("orientation")
+        analysis.update(_optimize_orientation(source, stats))
+    else:
+        analysis.update(dict.fromkeys(ORIENTATION_FIELDS))
+    return analysis
+
+
+def _db_values(analysis: dict, fields: dict = PERSISTED_FIELDS) -> dict:
+    """Persisted analysis columns, rounded for storage."""
+    return {
+        field: round(analysis[field], digits) if digits is not None and analysis[field] is not None else analysis[field]
+        for field, digits in fields.items()
+    }
+
 
 @celery_app.task(name="tasks.process_model", bind=True, max_retries=2)
 def process_model(self, model_id: str, file_path: str):
     """
     Process a 3D model file:
     1. Set status to 'processing'
-    2. Load with trimesh
-    3. Extract dimensions, volume, polygon count
-    4. Update DB with results (status='done') or error (status='error')
+    2. Normalize text uploads to a canonical binary STL
+    3. Analyze (memory-mapped fast path for binary STL, mesh artifact otherwise)
+    4. Extract dimensions, volume, polygon count, print-time estimates
+       (per body for multi-body scenes)
+    5. Update DB with results (status='done') or error (status='error')
+    6. Store the results in the geometry cache under the file's SHA-256
     """
     model_uuid = uuid.UUID(model_id)
+    fmt = metrics.upload_format(file_path)
+    metrics.reset_peak_rss()
+    if is_cancelled(model_id):
+        # Superseded while queued (and the revoke didn't reach this worker)
+        metrics.record_model(fmt, "cancelled", file_path)
+        return {"status": "cancelled"}
 
     with SessionLocal() as session:
         # Mark as processing
@@ -65,56 +345,87 @@ def process_model(self, model_id: str, file_path: str):
             .where(models_table.c.id == model_uuid)
             .values(status="processing", error_message=None)
         )
+        file_hash = session.execute(
+            select(models_table.c.file_hash).where(models_table.c.id == model_uuid)
+        ).scalar_one_or_none()
         session.commit()
+    publish_model_status(model_id, "processing")
+    progress = Progress(model_id)
+    durations = {}
 
     try:
-        # Load mesh with trimesh
-        mesh = trimesh.load(file_path, force="mesh")
-
-        if mesh is None or not hasattr(mesh, "vertices") or len(mesh.vertices) == 0:
-            raise ValueError("Failed to load mesh or mesh is empty")
-
-        # Calculate bounding box dimensions
-        bounds = mesh.bounds  # [[min_x, min_y, min_z], [max_x, max_y, max_z]]
-        dim_x = float(bounds[1][0] - bounds[0][0])
-        dim_y = float(bounds[1][1] - bounds[0][1])
-        dim_z = float(bounds[1][2] - bounds[0][2])
-
-        # Volume (only meaningful for watertight meshes, but we compute it anyway)
-        try:
-            volume = float(abs(mesh.volume))
-        except Exception:
-            # Fallback: estimate from bounding box if mesh isn't watertight
-            volume = float(mesh.convex_hull.volume) if mesh.convex_hull else 0.0
-
-        # Polygon/face count
-        polygons = int(len(mesh.faces))
+        started = time.perf_counter()
+        with metrics.timed(durations, "ingest"):
+            ingested = write_canonical(file_path, file_hash)
+        if ingested:
+            record_ingest(**ingested)
+            print(
+                f"Normalized model {model_id} .{ingested['format']} to binary STL: "
+                f"{ingested['original_bytes']} -> {ingested['canonical_bytes']} bytes"
+            )
+        analysis = analyze_file(file_path, progress, file_hash)
+        progress.end_stage()
+        analysis_time_s = time.perf_counter() - started
+        values = _db_values(analysis)
+        bodies = [_db_values(body, BODY_FIELDS) for body in analysis["bodies"]]
 
         # Update DB with results
-        with SessionLocal() as session:
+        with metrics.timed(durations, "db_write"), SessionLocal() as session:
             session.execute(
                 update(models_table)
                 .where(models_table.c.id == model_uuid)
                 .values(
-                    status="done",
-                    dim_x=round(dim_x, 4),
-                    dim_y=round(dim_y, 4),
-                    dim_z=round(dim_z, 4),
-                    volume=round(volume, 6),
-                    polygons=polygons,
-                    error_message=None,
+                    status="done", error_message=None,
+                    canonical_ready=bool(file_hash) and os.path.exists(canonical_path(file_hash)),
+                    **values,
                 )
             )
+            session.execute(delete(model_bodies_table).where(model_bodies_table.c.model_id == model_uuid))
+            if bodies:
+                session.execute(
+                    insert(model_bodies_table),
+                    [{"id": uuid.uuid4(), "model_id": model_uuid, **body} for body in bodies],
+                )
+            if file_hash:
+                # Identical uploads later skip the worker entirely; a stale entry is replaced
+                entry = {
+                    "analysis_version": ANALYSIS_VERSION, "analysis_time_s": analysis_time_s,
+                    "hits": 0, "bodies": bodies, **values,
+                }
+                session.execute(
+                    insert(geometry_cache_table)
+                    .values(sha256=file_hash, **entry)
+                    .on_conflict_do_update(
+                        index_elements=["sha256"], set_=entry,
+                        where=geometry_cache_table.c.analysis_version != ANALYSIS_VERSION,
+                    )
+                )
+            owner = session.execute(
+                select(projects_table.c.user_id, projects_table.c.id)
+                .join(models_table, models_table.c.project_id == projects_table.c.id)
+                .where(models_table.c.id == model_uuid)
+            ).one_or_none()
             session.commit()
+        progress.clear()
+        publish_model_status(model_id, "done")
+        metrics.record_model(fmt, "done", file_path, analysis["polygons"], {**durations, **progress.durations})
+        if owner:
+            announce_similarity_descriptor(*owner)
+
+        # Follow-up stage: decimated preview for the viewer, routed by the actual face count
+        celery_app.send_task(
+            "tasks.generate_preview", args=[model_id, file_path], queue=queue_for(analysis["polygons"])
+        )
+
+        analysis.pop("shape_descriptor")  # raw bytes; not JSON-serializable as a task result
+        return {"status": "done", **analysis}
 
-        return {
-            "status": "done",
-            "dim_x": dim_x,
-            "dim_y": dim_y,
-            "dim_z": dim_z,
-            "volume": volume,
-            "polygons": polygons,
-        }
+    except Cancelled as exc:
+        # The row is gone or replaced; nothing to write
+        print(f"Stopped processing model {model_id}: {exc}")
+        progress.clear()
+        metrics.record_model(fmt, "cancelled", file_path, durations={**durations, **progress.durations})
+        return {"status": "cancelled"}
 
     except Exception as exc:
         error_msg = f"{type(exc).__name__}: {str(exc)}"
@@ -128,5 +439,8 @@ def process_model(self, model_id: str, file_path: str):
                 .values(status="error", error_message=error_msg[:1000])
             )
             session.commit()
+        progress.clear()
+        publish_model_status(model_id, "error")
+        metrics.record_model(fmt, "error", file_path, durations={**durations, **progress.durations})
 
         return {"status": "error", "error": error_msg}
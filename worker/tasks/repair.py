@@ -0,0 +1,110 @@
+"""
+Time-bounded mesh repair ahead of the volume step.
+
+Steps run in order until the mesh is closed: merge duplicate vertices, fix
+winding/normals, fill small holes. Every step gets REPAIR_STEP_BUDGET_S of
+wall-clock time, enforced with SIGALRM (prefork workers run tasks on the
+main thread), so a pathological file costs a few budgets instead of hanging
+the worker. The alarm is only seen between Python bytecodes — a single long
+NumPy call overruns until it returns.
+
+Quality flags stored on the model:
+    ok           closed and consistently wound as uploaded
+    repaired     closed after repair; volume from the repaired mesh
+    approximate  still open; volume from the vertical-ray winding number
+    unverified   checks ran out of budget; volume is the raw surface integral
+"""
+
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+import trimesh
+
+REPAIR_STEP_BUDGET_S = float(os.getenv("REPAIR_STEP_BUDGET_S", "10"))
+# Open binary STL up to this many faces is welded into an in-memory mesh for the
+# repair steps; larger ones go straight to the ray volume
+REPAIR_MAX_FACES = int(os.getenv("REPAIR_MAX_FACES", "1000000"))
+
+QUALITY_OK = "ok"
+QUALITY_REPAIRED = "repaired"
+QUALITY_APPROXIMATE = "approximate"
+QUALITY_UNVERIFIED = "unverified"
+
+# Best to worst
+QUALITY_ORDER = (QUALITY_OK, QUALITY_REPAIRED, QUALITY_APPROXIMATE, QUALITY_UNVERIFIED)
+
+
+class StepTimeout(Exception):
+    pass
+
+
+@contextmanager
+def time_budget(seconds: float):
+    """Raise StepTimeout in the block after `seconds` (no-op off the main thread)."""
+    if seconds <= 0 or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _expire(signum, frame):
+        raise StepTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_step(name: str, fn, *args) -> tuple[bool, object]:
+    """Run one step under the budget; returns (completed, result)."""
+    started = time.perf_counter()
+    try:
+        with time_budget(REPAIR_STEP_BUDGET_S):
+            result = fn(*args)
+    except StepTimeout:
+        print(f"repair {name}: timed out after {REPAIR_STEP_BUDGET_S:.1f}s")
+        return False, None
+    except Exception as exc:
+        print(f"repair {name}: failed ({exc})")
+        return False, None
+    print(f"repair {name}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return True, result
+
+
+def worst_quality(flags) -> str:
+    return max(flags, key=QUALITY_ORDER.index, default=QUALITY_OK)
+
+
+def _is_closed(mesh: trimesh.Trimesh) -> bool:
+    return bool(mesh.is_watertight and mesh.is_winding_consistent)
+
+
+REPAIR_STEPS = (
+    ("merge vertices", lambda mesh: mesh.merge_vertices()),
+    ("fix normals", trimesh.repair.fix_normals),
+    ("fill holes", trimesh.repair.fill_holes),
+)
+
+
+def repair_mesh(mesh: trimesh.Trimesh) -> str | None:
+    """Repair in place; QUALITY_OK / QUALITY_REPAIRED, or None if still open (or out of budget)."""
+    completed, closed = run_step("check", _is_closed, mesh)
+    if not completed:
+        return None
+    if closed:
+        return QUALITY_OK
+
+    for name, step in REPAIR_STEPS:
+        completed, _ = run_step(name, step, mesh)
+        if not completed:
+            # An interrupted step can leave the mesh half-updated; stop touching it
+            return None
+        completed, closed = run_step("check", _is_closed, mesh)
+        if completed and closed:
+            return QUALITY_REPAIRED
+    return None
@@ -0,0 +1,42 @@
+"""
+Shared-volume layout for files derived from an upload.
+
+Derived files (canonical STL, previews, thumbnails, ...) are content-addressed by the SHA-256 of the
+uploaded file, so identical uploads — including analysis-cache hits that
+never reach the worker — share them. Mirror of server/app/services/derived_files.py.
+"""
+
+import hashlib
+import os
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/uploads")
+
+PREVIEW_FILENAME = "preview.bin"
+THUMBNAIL_FILENAME = "thumbnail.png"
+CANONICAL_FILENAME = "canonical.stl"
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def derived_dir(file_hash: str) -> str:
+    return os.path.join(UPLOAD_DIR, "derived", file_hash)
+
+
+def canonical_path(file_hash: str) -> str:
+    """Binary STL normalized from a text upload (see tasks.mesh_io.write_canonical)."""
+    return os.path.join(derived_dir(file_hash), CANONICAL_FILENAME)
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write via a temp file + rename so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+import trimesh
+
+from geometry import ascii_mesh
+
+CUBE_VERTICES = """\
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+v 0 0 1
+v 1 0 1
+v 1 1 1
+v 0 1 1
+"""
+
+# Unit cube as outward-facing quads
+CUBE_QUADS = """\
+f 1 4 3 2
+f 5 6 7 8
+f 1 2 6 5
+f 2 3 7 6
+f 3 4 8 7
+f 4 1 5 8
+"""
+
+
+def _triangles(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Triangles as sorted rows of coordinates, each rotated to start at its smallest corner (winding kept)."""
+    tri = np.round(np.asarray(vertices, dtype=np.float64)[faces], 9) + 0.0
+    keys = [tuple(map(tuple, t)) for t in tri]
+    canonical = []
+    for t in keys:
+        k = t.index(min(t))
+        canonical.append(t[k:] + t[:k])
+    return np.array(sorted(canonical))
+
+
+def _reference(path) -> np.ndarray:
+    loaded = trimesh.load(str(path))
+    meshes = list(loaded.geometry.values()) if isinstance(loaded, trimesh.Scene) else [loaded]
+    return _triangles(*ascii_mesh.merge_vertices(
+        np.concatenate([m.vertices for m in meshes]),
+        np.concatenate([m.faces + offset for m, offset in zip(meshes, np.cumsum([0] + [len(m.vertices) for m in meshes]))]),
+    ))
+
+
+def _parsed(path, block_bytes=ascii_mesh.DEFAULT_BLOCK_BYTES) -> np.ndarray:
+    bodies = ascii_mesh.parse(str(path), block_bytes)
+    return np.concatenate([_triangles(v, f) for _, v, f in bodies])
+
+
+def _write(tmp_path, name, text, newline="\n"):
+    path = tmp_path / name
+    path.write_bytes(text.replace("\n", newline).encode())
+    return path
+
+
+def _assert_matches_trimesh(path, block_bytes=ascii_mesh.DEFAULT_BLOCK_BYTES):
+    parsed = _parsed(path, block_bytes)
+    reference = _reference(path)
+    assert parsed.shape == reference.shape
+    assert np.allclose(parsed, reference)
+
+
+def test_obj_quads_are_fan_triangulated(tmp_path):
+    path = _write(tmp_path, "cube.obj", CUBE_VERTICES + CUBE_QUADS)
+    _, vertices, faces = ascii_mesh.parse(str(path))[0]
+    assert len(vertices) == 8 and len(faces) == 12
+    assert trimesh.Trimesh(vertices, faces, process=False).volume == pytest.approx(1.0)
+    _assert_matches_trimesh(path)
+
+
+def test_obj_negative_indices(tmp_path):
+    negative = "".join(
+        "f " + " ".join(str(int(i) - 9) for i in line.split()[1:]) + "\n" for line in CUBE_QUADS.splitlines()
+    )
+    path = _write(tmp_path, "cube.obj", CUBE_VERTICES + negative)
+    assert np.array_equal(_parsed(path), _parsed(_write(tmp_path, "plain.obj", CUBE_VERTICES + CUBE_QUADS)))
+    _assert_matches_trimesh(path)
+
+
+@pytest.mark.parametrize("template", ["{}//{}", "{}/{}", "{}/{}/{}"])
+def test_obj_slash_tokens_use_position_index(tmp_path, template):
+    header = CUBE_VERTICES + "vt 0 0\n" * 8 + "vn 0 0 1\n" * 8
+    faces = "".join(
+        "f " + " ".join(template.format(*[i] * template.count("{}")) for i in line.split()[1:]) + "\n"
+        for line in CUBE_QUADS.splitlines()
+    )
+    path = _write(tmp_path, "cube.obj", header + faces)
+    assert np.array_equal(_parsed(path), _parsed(_write(tmp_path, "plain.obj", CUBE_VERTICES + CUBE_QUADS)))
+    _assert_matches_trimesh(path)
+
+
+def test_obj_crlf_and_scientific_notation(tmp_path):
+    vertices = "".join(
+        "v " + " ".join(f"{float(c) * 12.5:.3e}" for c in line.split()[1:]) + "\n"
+        for line in CUBE_VERTICES.splitlines()
+    )
+    path = _write(tmp_path, "cube.obj", "# exported\n" + vertices + "\n" + CUBE_QUADS, newline="\r\n")
+    _, v, f = ascii_mesh.parse(str(path))[0]
+    assert trimesh.Trimesh(v, f, process=False).volume == pytest.approx(12.5 ** 3)
+    _assert_matches_trimesh(path)
+
+
+def test_obj_objects_become_bodies(tmp_path):
+    shifted = "".join(
+        "v " + " ".join(str(float(c) + (3 if k == 0 else 0)) for k, c in enumerate(line.split()[1:])) + "\n"
+        for line in CUBE_VERTICES.splitlines()
+    )
+    negative = "".join(
+        "f " + " ".join(str(int(i) - 9) for i in line.split()[1:]) + "\n" for line in CUBE_QUADS.splitlines()
+    )
+    path = _write(tmp_path, "two.obj", "o left\n" + CUBE_VERTICES + CUBE_QUADS + "o right\n" + shifted + negative)
+    bodies = ascii_mesh.parse(str(path))
+    assert [name for name, _, _ in bodies] == ["left", "right"]
+    assert all(len(v) == 8 and len(f) == 12 for _, v, f in bodies)
+    assert bodies[1][1][:, 0].min() == 3.0
+
+
+def test_obj_blocks_split_mid_file(tmp_path):
+    path = _write(tmp_path, "cube.obj", CUBE_VERTICES + CUBE_QUADS)
+    assert np.array_equal(_parsed(path, block_bytes=17), _parsed(path))
+
+
+def _stl(faces_by_solid, newline="\n", fmt="{:.6f}"):
+    lines = []
+    for name, triangles in faces_by_solid:
+        lines.append(f"solid {name}")
+        for tri in triangles:
+            lines += ["  facet normal 0 0 0", "    outer loop"]
+            lines += ["      vertex " + " ".join(fmt.format(c) for c in corner) for corner in tri]
+            lines += ["    endloop", "  endfacet"]
+        lines.append(f"endsolid {name}")
+    return newline.join(lines) + newline
+
+
+def test_ascii_stl_crlf_and_scientific_notation(tmp_path):
+    box = trimesh.creation.box(extents=(20, 10, 5))
+    path = tmp_path / "box.stl"
+    path.write_bytes(_stl([("box", box.triangles)], newline="\r\n", fmt="{:.6e}").encode())
+    bodies = ascii_mesh.parse(str(path))
+    assert [name for name, _, _ in bodies] == ["box"]
+    _, vertices, faces = bodies[0]
+    assert len(vertices) == 8
+    assert trimesh.Trimesh(vertices, faces, process=False).volume == pytest.approx(1000.0)
+    _assert_matches_trimesh(path)
+    assert np.array_equal(_parsed(path, block_bytes=64), _parsed(path))
+
+
+def test_ascii_stl_solids_become_bodies(tmp_path):
+    box = trimesh.creation.box(extents=(1, 1, 1))
+    path = tmp_path / "two.stl"
+    path.write_bytes(_stl([("a", box.triangles), ("b", box.triangles + 5)]).encode())
+    bodies = ascii_mesh.parse(str(path))
+    assert [name for name, _, _ in bodies] == ["a", "b"]
+    assert all(len(f) == 12 for _, _, f in bodies)
+
+
+@pytest.mark.parametrize("name, text", [
+    ("cut.obj", "v 0 0 0\nv 1 0 0 \\\n 1\nf 1 2 1\n"),
+    ("bad.obj", "v 0 0 zero\nv 1 0 0\nv 0 1 0\nf 1 2 3\n"),
+    ("range.obj", "v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 4\n"),
+    ("zero.obj", "v 0 0 0\nv 1 0 0\nv 0 1 0\nf 0 1 2\n"),
+    ("short.stl", "solid s\nvertex 0 0 0\nvertex 1 0 0\nendsolid s\n"),
+    ("model.ply", "ply\n"),
+])
+def test_unsupported_input_raises_value_error(tmp_path, name, text):
+    with pytest.raises(ValueError):
+        ascii_mesh.parse(str(_write(tmp_path, name, text)))